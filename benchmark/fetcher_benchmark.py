@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Extraction + transformation time of one fetch result (no network): HTML page (`FroggitWh2600Job`, BeautifulSoup)
+vs. JSON document (`EcowittJsonJob`, `get_livedata_info`) vs. binary packet (`EcowittGw1000Job`).
+
+Run from the project directory: `python -m benchmark.fetcher_benchmark`
+"""
+import argparse
+import os
+import struct
+import time
+
+from src.fetcher.ecowitt_gw1000_job import EcowittGw1000Job
+from src.fetcher.ecowitt_json_job import EcowittJsonJob
+from src.fetcher.froggit_wh2600_job import FroggitWh2600Job
+from src.utils.time_utils import TimeUtils
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_DIR = os.path.join(PROJECT_DIR, "test", "fetcher")
+CONFIG = {"url": "dummy", "altitude": 255}
+
+
+def load_sample(file_name: str) -> bytes:
+    with open(os.path.join(SAMPLE_DIR, file_name), "rb") as file:
+        return file.read()
+
+
+def build_binary_sample() -> bytes:
+    data = b"".join(bytes([item_id]) + struct.pack(fmt, 1) for item_id, fmt in [
+        (0x01, ">h"), (0x06, ">B"), (0x08, ">H"), (0x09, ">H"), (0x02, ">h"), (0x07, ">B"), (0x0A, ">H"), (0x0B, ">H"),
+        (0x0C, ">H"), (0x15, ">I"), (0x16, ">H"), (0x17, ">B"), (0x0E, ">H"), (0x13, ">I"),
+    ])
+    body = bytes([EcowittGw1000Job.CMD_GW1000_LIVEDATA]) + struct.pack(">H", len(data) + 4) + data
+    return EcowittGw1000Job.HEADER + body + bytes([sum(body) & 0xFF])
+
+
+def measure(name: str, fetcher, page, runs: int):
+    fetcher.extract_values(page)  # warm up (deferred imports)
+    started = time.perf_counter()
+    for _ in range(runs):
+        fetcher.extract_values(page)
+    elapsed = (time.perf_counter() - started) / runs
+    print(f"{name:>8}: {elapsed * 1e6:>9.1f} us/page ({len(page):>6} bytes)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="fetcher extraction benchmark")
+    parser.add_argument("--runs", type=int, default=200, help="count of runs per format")
+    args = parser.parse_args()
+
+    with TimeUtils.frozen(TimeUtils.now().replace(year=2019, month=8, day=25, hour=14, minute=4)):  # time of the HTML sample
+        html = measure("html", FroggitWh2600Job(CONFIG, None), load_sample("froggit_livedata_firmware_4.6.2.html"), args.runs)
+        json = measure("json", EcowittJsonJob(CONFIG, None), load_sample("ecowitt_livedata_info.json"), args.runs)
+        binary = measure("binary", EcowittGw1000Job(CONFIG, None), build_binary_sample(), args.runs)
+
+    print(f"json is {html / json:.0f}x, binary {html / binary:.0f}x faster than html")
+
+
+if __name__ == "__main__":
+    main()
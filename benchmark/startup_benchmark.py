@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark of the service entry point:
+1. import time report (`python -X importtime`), sorted by cumulative time
+2. deferred imports: heavy or mode specific modules must not be loaded by the entry point import
+3. time-to-first-publish: a fresh process runs the `Runner` against a local fake station (HTTP) and a recording MQTT client
+
+Run from the project directory: `python -m benchmark.startup_benchmark`
+"""
+import time
+
+_CHILD_STARTED = time.monotonic()  # noqa: E402 - taken before all other imports (child mode)
+
+import argparse  # noqa: E402
+import http.server  # noqa: E402
+import os  # noqa: E402
+import re  # noqa: E402
+import subprocess  # noqa: E402
+import sys  # noqa: E402
+import threading  # noqa: E402
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_MODULE = "src.weather_mqtt_bridge"
+SAMPLE_PAGE = os.path.join(PROJECT_DIR, "test", "fetcher", "froggit_livedata_firmware_4.6.2.html")
+
+# imported on demand only (`concurrent.futures` itself is loaded by `asyncio`)
+DEFERRED_MODULES = [
+    "bs4", "click", "concurrent.futures.process", "concurrent.futures.thread", "cProfile", "gzip", "http.client",
+    "jsonschema", "multiprocessing", "paho", "pstats", "sqlite3", "tracemalloc", "tzlocal", "yaml", "zstandard",
+]
+
+IMPORT_TIME_PATTERN = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def report_import_times(top: int):
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {ENTRY_MODULE}"],
+        cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+    )
+
+    entries = []
+    for line in completed.stderr.splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if match:
+            entries.append((int(match.group(2)), int(match.group(1)), match.group(4)))
+
+    total = next((cumulative for cumulative, _, name in entries if name == ENTRY_MODULE), 0)
+    print(f"import time {ENTRY_MODULE}: {total / 1000:.1f} ms (cumulative)")
+    print(f"{'cumulative':>12} {'self':>10}  module")
+    for cumulative, self_time, name in sorted(entries, reverse=True)[:top]:
+        print(f"{cumulative / 1000:>10.1f}ms {self_time / 1000:>8.1f}ms  {name}")
+
+
+def get_loaded_deferred_modules() -> list:
+    """The `DEFERRED_MODULES` which are loaded by importing the entry point (fresh interpreter)."""
+    code = f"import sys, {ENTRY_MODULE}; print(' '.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+    completed = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_DIR, capture_output=True, text=True, check=True)
+    return completed.stdout.split()
+
+
+def report_deferred_imports():
+    loaded = get_loaded_deferred_modules()
+    print(f"deferred imports: {'ok' if not loaded else 'loaded at startup: ' + ', '.join(loaded)}")
+
+
+def measure_first_publish(runs: int):
+    results = []
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, "-m", "benchmark.startup_benchmark", "--child"],
+            cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+        )
+        results.append(float(completed.stdout.strip().splitlines()[-1]))
+
+    results.sort()
+    print(f"time-to-first-publish ({runs} runs): min={results[0] * 1000:.1f}ms "
+          f"median={results[len(results) // 2] * 1000:.1f}ms max={results[-1] * 1000:.1f}ms")
+
+
+class _StationHandler(http.server.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        with open(SAMPLE_PAGE, "rb") as file:
+            page = file.read()
+        current_time = time.strftime("%H:%M %m/%d/%Y").encode()
+        page = page.replace(b"14:04 8/25/2019", current_time)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(page)))
+        self.end_headers()
+        self.wfile.write(page)
+
+    def log_message(self, *args):
+        pass
+
+
+class _RecordingMqttClient:
+    """Stands in for the broker connection, stops the runner with the first publish."""
+
+    def __init__(self):
+        self.runner = None
+
+    def set_last_will(self, topic, last_will):
+        pass
+
+    def connect(self):
+        pass
+
+    def is_connected(self):
+        return True
+
+    def ensure_connection(self):
+        pass
+
+    def publish(self, topic, payload):
+        if self.runner is not None:
+            print(time.monotonic() - _CHILD_STARTED)
+            self.runner._periodic_task.cancel()
+            self.runner = None
+
+
+def run_child():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _StationHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    import importlib
+    importlib.import_module(ENTRY_MODULE)  # the imports as done by the entry point
+
+    from src.fetcher.fetcher_factory import FetcherFactory
+    from src.runner import Runner
+    from src.runner_config import RunnerConfKey
+
+    mqtt_client = _RecordingMqttClient()
+    fetcher_factory = FetcherFactory({"url": f"http://127.0.0.1:{server.server_port}/livedata.htm", "altitude": 255})
+    runner = Runner({RunnerConfKey.MQTT_OUTSIDE_TOPIC: "benchmark/outside"}, fetcher_factory, mqtt_client)
+    mqtt_client.runner = runner
+    runner.run()
+
+    server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="startup benchmark")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--runs", type=int, default=5, help="count of time-to-first-publish runs")
+    parser.add_argument("--top", type=int, default=20, help="count of listed modules")
+    args = parser.parse_args()
+
+    if args.child:
+        run_child()
+    else:
+        report_import_times(args.top)
+        report_deferred_imports()
+        measure_first_publish(args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark of the time series implementations: a 24h window at 5s resolution (17280 samples) per series,
+measured with `tracemalloc` (allocated bytes per series and per sample) plus the time of `collect_and_deliver`.
+
+Run from the project directory: `python -m benchmark.time_series_benchmark`
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from src.fetcher.time_series import MaxTimeSeries, RingMaxTimeSeries
+from src.utils.time_utils import TimeUtils
+
+WINDOW = timedelta(hours=24)
+RESOLUTION = timedelta(seconds=5)
+
+
+def fill(time_series_class, series_count: int, sample_count: int):
+    start = datetime(2019, 1, 1).astimezone()
+    time_series_list = [time_series_class(f"series{i}", WINDOW) for i in range(series_count)]
+
+    elapsed = 0.0
+    for sample in range(sample_count):
+        value = float(sample % 97)
+        with TimeUtils.frozen(start + sample * RESOLUTION):
+            started = time.perf_counter()
+            for time_series in time_series_list:
+                time_series.collect_and_deliver(value)
+            elapsed += time.perf_counter() - started
+
+    return time_series_list, elapsed
+
+
+def measure(time_series_class, series_count: int, sample_count: int):
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    time_series_list, elapsed = fill(time_series_class, series_count, sample_count)
+    allocated = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    per_series = allocated / series_count
+    print(f"{time_series_class.__name__:>18}: {per_series / 1024:>9.1f} KiB/series {per_series / sample_count:>6.1f} B/sample "
+          f"{elapsed / (series_count * sample_count) * 1e6:>6.2f} us/collect (traced)")
+    return time_series_list
+
+
+def main():
+    parser = argparse.ArgumentParser(description="time series memory benchmark")
+    parser.add_argument("--series", type=int, default=4, help="count of time series (e.g. stations)")
+    args = parser.parse_args()
+
+    sample_count = int(WINDOW / RESOLUTION)
+    print(f"window {WINDOW}, resolution {RESOLUTION.total_seconds():.0f}s => {sample_count} samples per series")
+    for time_series_class in [MaxTimeSeries, RingMaxTimeSeries]:
+        measure(time_series_class, args.series, sample_count)
+
+
+if __name__ == "__main__":
+    main()
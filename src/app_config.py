@@ -1,13 +1,15 @@
+import hashlib
 import json
+import logging
 import os
-
-import yaml
-from jsonschema import validate
+import time
+from typing import Optional
 
 from src.app_logging import LOGGING_JSONSCHEMA
 from src.fetcher.fetcher_config import FETCHER_JSONSCHEMA
 from src.mqtt_config import MQTT_JSONSCHEMA
 from src.runner_config import RUNNER_JSONSCHEMA
+from src.sink.sink_config import SINK_JSONSCHEMA
 
 
 CONFIG_JSONSCHEMA = {
@@ -17,28 +19,89 @@ CONFIG_JSONSCHEMA = {
         "mqtt": MQTT_JSONSCHEMA,
         "fetcher": FETCHER_JSONSCHEMA,
         "runner": RUNNER_JSONSCHEMA,
+        "sinks": SINK_JSONSCHEMA,
     },
     "additionalProperties": False,
     "required": ["fetcher", "mqtt", "runner"],
 }
 
+_logger = logging.getLogger(__name__)
+
+
+def load_yaml(stream):
+    """Imports `yaml` on demand (not needed e.g. for `--json-schema`); the libyaml based loader is much faster (if available)."""
+    import yaml
+
+    return yaml.load(stream, Loader=getattr(yaml, "CUnsafeLoader", yaml.UnsafeLoader))
+
 
 class AppConfig:
 
-    def __init__(self, config_file):
+    _validator = None  # compiled once per process
+
+    def __init__(self, config_file, schema_cache_dir: Optional[str] = None):
         self._config_data = {}
 
         self.check_config_file_access(config_file)
 
+        time_start = time.perf_counter()
         with open(config_file, 'r') as stream:
-            file_data = yaml.unsafe_load(stream)
+            file_data = load_yaml(stream)
+        self.load_time = time.perf_counter() - time_start
 
         self._config_data = {
-            **{"database": {}, "logging": {}, "mqtt": {}},  # default
+            **{"database": {}, "logging": {}, "mqtt": {}, "sinks": {}},  # default
             **file_data
         }
 
-        validate(file_data, CONFIG_JSONSCHEMA)
+        time_start = time.perf_counter()
+        self.validate(file_data, schema_cache_dir)
+        self.validation_time = time.perf_counter() - time_start
+
+    @classmethod
+    def validate(cls, file_data, schema_cache_dir: Optional[str] = None):
+        import jsonschema  # deferred, takes a considerable part of the startup time
+
+        error = jsonschema.exceptions.best_match(cls.get_validator(schema_cache_dir).iter_errors(file_data))
+        if error is not None:
+            raise error
+
+    @classmethod
+    def get_validator(cls, schema_cache_dir: Optional[str] = None):
+        """
+        The validator is built once per process. The expensive check of the schema itself (against the meta schema) is skipped,
+        if it was already done for this schema (hash) and recorded in `schema_cache_dir`.
+        """
+        if cls._validator is None:
+            from jsonschema.validators import validator_for
+
+            validator_class = validator_for(CONFIG_JSONSCHEMA)
+
+            marker_file = None
+            if schema_cache_dir:
+                marker_file = os.path.join(schema_cache_dir, f"config-schema-{cls.get_schema_hash()}.checked")
+
+            if marker_file is None or not os.path.isfile(marker_file):
+                validator_class.check_schema(CONFIG_JSONSCHEMA)
+                if marker_file is not None:
+                    try:
+                        os.makedirs(schema_cache_dir, exist_ok=True)
+                        with open(marker_file, "w"):
+                            pass
+                    except OSError as ex:
+                        _logger.warning("cannot write schema cache (%s): %s", marker_file, ex)
+
+            cls._validator = validator_class(CONFIG_JSONSCHEMA)
+
+        return cls._validator
+
+    @classmethod
+    def get_schema_hash(cls) -> str:
+        schema_text = json.dumps(CONFIG_JSONSCHEMA, sort_keys=True)
+        return hashlib.sha256(schema_text.encode("utf-8")).hexdigest()[:16]
+
+    def get_section(self, section: str):
+        return self._config_data.get(section) or {}
 
     def get_fetcher_config(self):
         return self._config_data["fetcher"]
@@ -52,6 +115,9 @@ class AppConfig:
     def get_runner_config(self):
         return self._config_data["runner"]
 
+    def get_sinks_config(self):
+        return self._config_data["sinks"]
+
     @classmethod
     def check_config_file_access(cls, config_file):
         if not os.path.isfile(config_file):
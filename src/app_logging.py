@@ -1,11 +1,16 @@
+import atexit
 import logging
 import os
+import queue
 import sys
+import threading
 import logging.handlers
+from typing import Dict, Optional
 
 
 LOGGING_DEFAULT_LOG_LEVEL = "info"
 LOGGING_CHOICES = ["debug", "info", "warning", "error"]
+LOGGING_DEFAULT_QUEUE_SIZE = 10000
 
 
 LOGGING_JSONSCHEMA = {
@@ -15,14 +20,77 @@ LOGGING_JSONSCHEMA = {
         "log_level": {"type": "string", "enum": LOGGING_CHOICES, "description": "Log level"},
         "max_bytes": {"type": "integer", "minimum": 102400, "description": "Max bytes per log files."},
         "max_count": {"type": "integer", "minimum": 1, "description": "Max count of rolled log files."},
+        "queue_size": {
+            "type": "integer", "minimum": 0,
+            "description": "Log records are written by a background thread; records beyond the queue size are dropped "
+                           "(and counted). 0 == synchronous logging."
+        },
     },
 }
 
 
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Never blocks the caller: if the (bounded) queue is full, the record is dropped and counted."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self._lock_counter = threading.Lock()
+        self._dropped = 0
+        self._reported = 0
+
+    @property
+    def dropped(self) -> int:
+        with self._lock_counter:
+            return self._dropped
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock_counter:
+                self._dropped += 1
+
+    def take_unreported(self) -> int:
+        """Count of dropped records since the last call."""
+        with self._lock_counter:
+            unreported = self._dropped - self._reported
+            self._reported = self._dropped
+            return unreported
+
+
+class _ReportingQueueListener(logging.handlers.QueueListener):
+    """Reports dropped records (with the next record which could be queued)."""
+
+    def __init__(self, log_queue, queue_handler: DroppingQueueHandler, *handlers):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self._queue_handler = queue_handler
+
+    def handle(self, record):
+        dropped = self._queue_handler.take_unreported()
+        if dropped:
+            warning = logging.makeLogRecord({
+                "name": __name__, "levelno": logging.WARNING, "levelname": logging.getLevelName(logging.WARNING),
+                "msg": "%d log records dropped (log queue full)!", "args": (dropped,),
+            })
+            super().handle(warning)
+        super().handle(record)
+
+    def enqueue_sentinel(self):
+        try:
+            self.queue.put(self._sentinel, timeout=1)  # blocks only if the queue is full (and the thread is gone)
+        except queue.Full:
+            pass
+
+
 class AppLogging:
 
+    _queue_handler = None  # type: Optional[DroppingQueueHandler]
+    _queue_listener = None  # type: Optional[_ReportingQueueListener]
+
     @classmethod
     def configure(cls, config_data, log_file, log_level, print_logs, systemd_mode):
+        cls.shutdown()  # a repeated configuration replaces the listener thread (spawned shards configure their own)
+
         handlers = []
 
         if not log_file:
@@ -64,15 +132,47 @@ class AppLogging:
         if print_logs or systemd_mode:
             handlers.append(logging.StreamHandler(sys.stdout))
 
+        for handler in handlers:
+            if handler.formatter is None:
+                handler.setFormatter(logging.Formatter(log_format))
+
+        queue_size = config_data.get("queue_size", LOGGING_DEFAULT_QUEUE_SIZE)
+        if queue_size and handlers:
+            # the file/stream handlers (I/O, rollover) run in the listener thread, never in the fetch/publish loop
+            log_queue = queue.Queue(maxsize=queue_size)
+            cls._queue_handler = DroppingQueueHandler(log_queue)
+            cls._queue_handler.setFormatter(logging.Formatter("%(message)s"))  # the real format is applied by the listener
+            cls._queue_listener = _ReportingQueueListener(log_queue, cls._queue_handler, *handlers)
+            cls._queue_listener.start()
+            atexit.register(cls.shutdown)
+            handlers = [cls._queue_handler]
+
         logging.basicConfig(
             format=log_format,
             level=log_level,
-            handlers=handlers
+            handlers=handlers,
+            force=True
         )
 
         if log_level < logging.WARNING:
             logging.getLogger("asyncio").setLevel(logging.WARNING)
 
+    @classmethod
+    def shutdown(cls):
+        """Flushes the queued records (stops the listener thread)."""
+        listener, cls._queue_listener = cls._queue_listener, None
+        cls._queue_handler = None
+        if listener is not None:
+            listener.stop()
+            atexit.unregister(cls.shutdown)
+
+    @classmethod
+    def get_statistics(cls) -> Dict[str, int]:
+        queue_handler = cls._queue_handler
+        if queue_handler is None:
+            return {}
+        return {"queued": queue_handler.queue.qsize(), "dropped": queue_handler.dropped}
+
     @classmethod
     def parse_log_level(cls, value):
         value = value or LOGGING_DEFAULT_LOG_LEVEL
@@ -0,0 +1,74 @@
+import logging
+import os
+import time
+from collections import namedtuple
+from typing import Optional
+
+from src.app_config import AppConfig, CONFIG_JSONSCHEMA
+
+_logger = logging.getLogger(__name__)
+
+
+ConfigChange = namedtuple('ConfigChange', ['app_config', 'changed_sections'])
+
+
+class ConfigReloader:
+    """
+    Reloads the config file when signaled (SIGHUP) or - if `watch_interval` is set - when the file was modified.
+    An invalid config file is reported and ignored, the current config stays active.
+    """
+
+    def __init__(self, config_file: str, app_config: AppConfig, schema_cache_dir: Optional[str] = None, watch_interval: float = 0):
+        self._config_file = config_file
+        self._app_config = app_config
+        self._schema_cache_dir = schema_cache_dir
+        self._watch_interval = watch_interval
+
+        self._reload_requested = False
+        self._next_watch = time.monotonic() + watch_interval
+        self._last_mtime = self._get_mtime()
+
+    @property
+    def app_config(self) -> AppConfig:
+        return self._app_config
+
+    def set_watch_interval(self, watch_interval: float):
+        self._watch_interval = watch_interval
+        self._next_watch = time.monotonic() + watch_interval
+
+    def request_reload(self):
+        """May be called from a signal handler."""
+        self._reload_requested = True
+
+    def poll(self) -> Optional[ConfigChange]:
+        """Returns the new config and the names of the changed (top level) sections, if the config was reloaded."""
+        if not self._reload_requested:
+            if not self._watch_interval or time.monotonic() < self._next_watch:
+                return None
+            self._next_watch = time.monotonic() + self._watch_interval
+            if self._get_mtime() == self._last_mtime:
+                return None
+
+        self._reload_requested = False
+        self._last_mtime = self._get_mtime()
+
+        try:
+            app_config = AppConfig(self._config_file, self._schema_cache_dir)
+        except Exception as ex:
+            _logger.error("config reload failed, the current config stays active! %s", ex)
+            return None
+
+        changed_sections = {
+            section for section in CONFIG_JSONSCHEMA["properties"]
+            if app_config.get_section(section) != self._app_config.get_section(section)
+        }
+        self._app_config = app_config
+        _logger.info("config reloaded (changed: %s)", ", ".join(sorted(changed_sections)) or "-")
+
+        return ConfigChange(app_config, changed_sections)
+
+    def _get_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self._config_file).st_mtime
+        except OSError:
+            return None
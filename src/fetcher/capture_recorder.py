@@ -0,0 +1,159 @@
+import base64
+import datetime
+import glob
+import importlib.util
+import logging
+import os
+import queue
+import re
+import threading
+from typing import Optional, Union
+
+from src.utils.json_utils import JsonUtils
+
+_logger = logging.getLogger(__name__)
+
+
+class CaptureCompression:
+    NONE = "none"
+    GZIP = "gzip"
+    ZSTD = "zstd"
+
+
+class CaptureRecorder:
+    """
+    Keeps what the station actually sent: appends each raw response (with fetch time and latency) as JSONL record
+    to size rotated, compressed segment files. Writing is done by a background thread, so the fetch cycle is never delayed.
+    The segment files can be replayed (see `src.replay`). Segment names contain the station `name`, so recorders sharing
+    a directory only rotate their own segments.
+    """
+
+    DEFAULT_MAX_BYTES = 10 * 1024 * 1024  # uncompressed bytes per segment
+    DEFAULT_MAX_SEGMENTS = 20
+    QUEUE_SIZE = 100
+
+    FILE_PREFIX = "capture-"
+
+    SUFFIXES = {
+        CaptureCompression.NONE: ".jsonl",
+        CaptureCompression.GZIP: ".jsonl.gz",
+        CaptureCompression.ZSTD: ".jsonl.zst",
+    }
+
+    def __init__(self, record_dir: str, max_bytes: int = DEFAULT_MAX_BYTES, max_segments: int = DEFAULT_MAX_SEGMENTS,
+                 compression: str = CaptureCompression.GZIP, name: Optional[str] = None):
+        self._record_dir = record_dir
+        self._file_prefix = self.get_file_prefix(name)
+        self._segment_pattern = re.compile(re.escape(self._file_prefix) + r"\d{8}-\d{6}-\d{6}\.jsonl")
+        self._max_bytes = max_bytes
+        self._max_segments = max_segments
+
+        if compression == CaptureCompression.ZSTD and importlib.util.find_spec("zstandard") is None:  # optional dependency
+            _logger.warning("zstandard is not installed => gzip is used for captures")
+            compression = CaptureCompression.GZIP
+        self._compression = compression
+
+        self._queue = queue.Queue(maxsize=self.QUEUE_SIZE)
+        self._dropped = 0
+        self._lock = threading.Lock()
+
+        self._segment = None
+        self._segment_bytes = 0
+
+        os.makedirs(self._record_dir, exist_ok=True)
+
+        self._thread = threading.Thread(target=self._run, name=self.__class__.__name__, daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def get_file_prefix(cls, name: Optional[str] = None) -> str:
+        """"capture-<name>-" (name: file name safe); "capture-" without name."""
+        if not name:
+            return cls.FILE_PREFIX
+        return cls.FILE_PREFIX + re.sub(r"[^A-Za-z0-9_.]+", "_", name) + "-"
+
+    @property
+    def dropped(self) -> int:
+        """Count of records which were dropped because the writer could not keep up."""
+        with self._lock:
+            return self._dropped
+
+    def record(self, fetched: datetime.datetime, latency: float, page: Union[bytes, str]):
+        try:
+            self._queue.put_nowait((fetched, latency, page))
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+
+    def close(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                try:
+                    self._write(*item)
+                except Exception as ex:
+                    _logger.error("cannot record capture: %s", ex)
+        finally:
+            self._close_segment()
+
+    def _write(self, fetched: datetime.datetime, latency: float, page: Union[bytes, str]):
+        record = {"fetched": fetched, "latency": round(latency, 4)}
+        if isinstance(page, bytes):
+            try:
+                record["page"] = page.decode("utf-8")
+            except UnicodeDecodeError:
+                record["pageBase64"] = base64.b64encode(page).decode("ascii")  # binary protocols
+        else:
+            record["page"] = page
+
+        line = JsonUtils.dumps(record) + "\n"
+        data = line.encode("utf-8")
+
+        if self._segment is None or self._segment_bytes >= self._max_bytes:
+            self._rotate(fetched)
+
+        self._segment.write(data)
+        self._segment.flush()  # a partial segment stays readable
+        self._segment_bytes += len(data)
+
+    def _rotate(self, fetched: datetime.datetime):
+        self._close_segment()
+
+        segment_name = self._file_prefix + fetched.strftime("%Y%m%d-%H%M%S-%f") + self.SUFFIXES[self._compression]
+        segment_path = os.path.join(self._record_dir, segment_name)
+
+        if self._compression == CaptureCompression.GZIP:
+            import gzip
+            self._segment = gzip.open(segment_path, "wb")
+        elif self._compression == CaptureCompression.ZSTD:
+            import zstandard
+            self._segment = zstandard.ZstdCompressor().stream_writer(open(segment_path, "wb"), closefd=True)
+        else:
+            self._segment = open(segment_path, "wb")
+        self._segment_bytes = 0
+
+        self._remove_old_segments()
+
+    def _close_segment(self):
+        segment = self._segment
+        self._segment = None
+        if segment is not None:
+            segment.close()
+
+    def _remove_old_segments(self):
+        pattern = os.path.join(self._record_dir, self._file_prefix + "*")
+        # the glob of a recorder without name ("capture-*") matches the segments of named recorders too
+        segment_paths = sorted(path for path in glob.glob(pattern) if self._segment_pattern.match(os.path.basename(path)))
+        for segment_path in segment_paths[:-self._max_segments]:
+            try:
+                os.remove(segment_path)
+            except OSError as ex:
+                _logger.warning("cannot remove capture segment (%s): %s", segment_path, ex)
@@ -0,0 +1,88 @@
+import datetime
+import logging
+import threading
+from typing import Dict, Optional
+
+from src.utils.time_utils import TimeUtils
+
+_logger = logging.getLogger(__name__)
+
+
+class CircuitState:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Skips the fetches of a dead station: after `failure_threshold` consecutive failures the circuit opens and fetches
+    fail fast. After the open time a (cheap) probe is allowed (half open); success closes the circuit, failure opens it
+    again with a doubled open time (up to `max_open_time`). Owned by the `FetcherFactory` (kept across fetch jobs).
+    """
+
+    DEFAULT_FAILURE_THRESHOLD = 3
+    DEFAULT_OPEN_TIME = 30  # seconds
+    DEFAULT_MAX_OPEN_TIME = 600  # seconds
+
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD, open_time: float = DEFAULT_OPEN_TIME,
+                 max_open_time: float = DEFAULT_MAX_OPEN_TIME):
+        self._lock = threading.Lock()
+        self._failure_threshold = failure_threshold
+        self._base_open_time = open_time
+        self._max_open_time = max(open_time, max_open_time)
+
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._open_time = open_time
+        self._open_until = None  # type: Optional[datetime.datetime]
+        self._opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._get_state()
+
+    def _get_state(self) -> str:
+        if self._state == CircuitState.OPEN and TimeUtils.now() >= self._open_until:
+            self._state = CircuitState.HALF_OPEN
+        return self._state
+
+    def allow_request(self) -> bool:
+        """False: fail fast. In the half open state the request should be a probe first."""
+        with self._lock:
+            return self._get_state() != CircuitState.OPEN
+
+    def record_success(self):
+        with self._lock:
+            if self._state != CircuitState.CLOSED:
+                _logger.info("circuit closed (station reachable again)")
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+            self._open_time = self._base_open_time
+
+    def record_failure(self):
+        with self._lock:
+            state = self._get_state()
+            if state == CircuitState.HALF_OPEN:
+                self._open_time = min(self._open_time * 2, self._max_open_time)
+                self._open(f"probe failed => next probe in {self._open_time:.0f}s")
+            elif state == CircuitState.CLOSED:
+                self._failures += 1
+                if self._failures >= self._failure_threshold:
+                    self._open(f"{self._failures} consecutive failures => next probe in {self._open_time:.0f}s")
+
+    def _open(self, reason: str):
+        self._state = CircuitState.OPEN
+        self._open_until = TimeUtils.now() + datetime.timedelta(seconds=self._open_time)
+        self._opened += 1
+        _logger.warning("circuit opened: %s", reason)
+
+    def get_statistics(self) -> Dict[str, any]:
+        with self._lock:
+            return {
+                "state": self._get_state(),
+                "failures": self._failures,
+                "opened": self._opened,
+                "openUntil": self._open_until if self._state == CircuitState.OPEN else None,
+            }
@@ -0,0 +1,169 @@
+import logging
+import socket
+import struct
+import time
+import urllib.parse
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from src.fetcher import transformation
+from src.fetcher.fetcher_config import FetcherConfKey
+from src.fetcher.fetcher_item import FetcherItem
+from src.fetcher.fetcher_job import FetcherException, FetcherJob
+from src.fetcher.fetcher_key import FetcherKey
+from src.fetcher.time_series import RingMaxTimeSeries
+
+_logger = logging.getLogger(__name__)
+
+
+class EcowittGw1000Job(FetcherJob):
+    """
+    Ecowitt GW1000/GW1100/GW2000 gateways (and rebrands like Froggit DP1500): binary LAN API (TCP, port 45000),
+    command `CMD_GW1000_LIVEDATA`. The response is decoded directly into `FetcherKey` values (no HTML parsing).
+    Expects the URL "tcp://<host>[:<port>]".
+    """
+
+    DEFAULT_PORT = 45000
+
+    CMD_GW1000_LIVEDATA = 0x27
+    HEADER = b"\xff\xff"
+
+    # data item id => (struct format, result key or None (skipped), factor)
+    ITEMS = {
+        0x01: (">h", FetcherKey.TEMP_INSIDE, 0.1),
+        0x02: (">h", FetcherKey.TEMP_OUTSIDE, 0.1),
+        0x03: (">h", None, 0.1),  # dew point
+        0x04: (">h", None, 0.1),  # wind chill
+        0x05: (">h", None, 0.1),  # heat index
+        0x06: (">B", FetcherKey.HUMI_INSIDE, 1),
+        0x07: (">B", FetcherKey.HUMI_OUTSIDE, 1),
+        0x08: (">H", FetcherKey.PRESSURE_ABS, 0.1),
+        0x09: (">H", FetcherKey.PRESSURE_REL, 0.1),
+        0x0A: (">H", FetcherKey.WIND_DIRECTION, 1),
+        0x0B: (">H", FetcherKey.WIND_SPEED, 0.36),  # 1/10 m/s => km/h
+        0x0C: (">H", FetcherKey.WIND_GUST, 0.36),  # 1/10 m/s => km/h
+        0x0D: (">H", None, 0.1),  # rain event
+        0x0E: (">H", FetcherKey.RAIN_HOURLY, 0.1),  # rain rate (mm/h)
+        0x0F: (">H", None, 0.1),  # rain gain
+        0x10: (">H", None, 0.1),  # rain day
+        0x11: (">H", None, 0.1),  # rain week
+        0x12: (">I", None, 0.1),  # rain month
+        0x13: (">I", FetcherKey.RAIN_COUNTER, 0.1),  # rain year
+        0x14: (">I", None, 0.1),  # rain totals
+        0x15: (">I", FetcherKey.SOLAR_RADIATION, 0.1 / 126.7),  # 1/10 lux => W/m² (approximation used by Ecowitt)
+        0x16: (">H", None, 0.1),  # UV (µW/cm²)
+        0x17: (">B", FetcherKey.UVI, 1),
+        0x18: ("6s", None, 1),  # date and time
+        0x19: (">H", None, 0.1),  # day max wind
+        **{item_id: (">h", None, 0.1) for item_id in range(0x1A, 0x22)},  # temperature channel 1-8
+        **{item_id: (">B", None, 1) for item_id in range(0x22, 0x2A)},  # humidity channel 1-8
+        0x2A: (">H", None, 0.1),  # PM2.5 channel 1
+        **{item_id: (">h", None, 0.1) for item_id in range(0x2B, 0x3B, 2)},  # soil temperature 1-8
+        **{item_id: (">B", None, 1) for item_id in range(0x2C, 0x3B, 2)},  # soil moisture 1-8
+        0x4C: ("16s", None, 1),  # low battery flags
+        **{item_id: (">H", None, 0.1) for item_id in range(0x4D, 0x54)},  # PM2.5 24h averages + channels 2-4
+        **{item_id: (">B", None, 1) for item_id in range(0x58, 0x5C)},  # leak channel 1-4
+        0x60: (">B", None, 1),  # lightning distance
+        0x61: (">I", None, 1),  # lightning time
+        0x62: (">I", None, 1),  # lightning count
+        **{item_id: ("3s", None, 1) for item_id in range(0x63, 0x6B)},  # WH34 temperature channel 1-8
+    }
+
+    # precomputed: id => (struct.Struct, result key, factor)
+    _DECODERS = {item_id: (struct.Struct(fmt), key, factor) for item_id, (fmt, key, factor) in ITEMS.items()}
+
+    DEFERRED_IMPORTS = []
+
+    @classmethod
+    def parse_address(cls, url: str):
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme != "tcp" or not parts.hostname:
+            raise FetcherException(f"expected URL 'tcp://<host>[:<port>]' ({url})!")
+        return parts.hostname, parts.port or cls.DEFAULT_PORT
+
+    @classmethod
+    def build_request(cls, command: int) -> bytes:
+        body = bytes([command, 3])  # command + size (command, size, checksum)
+        return cls.HEADER + body + bytes([sum(body) & 0xFF])
+
+    def _get_address(self):
+        return self.parse_address(self._url)
+
+    def _get_items(self) -> [FetcherItem]:
+        return self.config_fetcher_items(self._config)
+
+    @classmethod
+    def config_fetcher_items(cls, config) -> [FetcherItem]:
+        """The values are decoded already, the items are needed for the time series (and replays of decoded values)."""
+        fetcher_items = []
+        for _, result_key, _ in cls._DECODERS.values():
+            if result_key is not None:
+                time_series = RingMaxTimeSeries(result_key, timedelta(minutes=15)) if result_key == FetcherKey.WIND_GUST else None
+                fetcher_items.append(FetcherItem(result_key, None, transformation.ValueTransformation(result_key), time_series=time_series))
+        return fetcher_items
+
+    def _load_page(self) -> bytes:
+        try:
+            with socket.create_connection(self._get_address(), timeout=self._connect_timeout) as connection:
+                deadline = time.monotonic() + self._read_timeout
+                connection.settimeout(self._read_timeout)
+                connection.sendall(self.build_request(self.CMD_GW1000_LIVEDATA))
+
+                response = b""
+                expected_length = None
+                while expected_length is None or len(response) < expected_length:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise FetcherException(f"read timeout ({self._read_timeout}s) exceeded ({self._url})!")
+                    connection.settimeout(remaining)
+                    chunk = connection.recv(4096)
+                    if not chunk:
+                        raise FetcherException(f"connection closed by the gateway ({self._url})!")
+                    response += chunk
+                    if expected_length is None and len(response) >= 5:
+                        expected_length = struct.unpack_from(">H", response, 3)[0] + 2  # size counts from the command byte
+                return response
+        except OSError as ex:
+            raise FetcherException(f"could not query the gateway ({self._url}): {ex}") from None
+
+    def extract_values(self, page: bytes, items: Optional[List[FetcherItem]] = None) -> Dict[str, any]:
+        values = self.decode_livedata(page)
+
+        # like `GustTransformation`: the gust is at least the wind speed
+        speed, gust = values.get(FetcherKey.WIND_SPEED), values.get(FetcherKey.WIND_GUST)
+        if speed is not None and (gust is None or speed > gust):
+            values[FetcherKey.WIND_GUST] = speed
+
+        altitude = self._config.get(FetcherConfKey.ALTITUDE)
+        if altitude is not None:  # same calculation as for the other stations
+            values[FetcherKey.PRESSURE_REL] = transformation.RelPressureTransformation.calculate(
+                values.get(FetcherKey.PRESSURE_ABS), values.get(FetcherKey.TEMP_OUTSIDE), altitude
+            )
+
+        return values
+
+    @classmethod
+    def decode_livedata(cls, packet: bytes) -> Dict[str, float]:
+        if len(packet) < 6 or packet[:2] != cls.HEADER or packet[2] != cls.CMD_GW1000_LIVEDATA:
+            raise FetcherException("invalid gateway response (header)!")
+        size = struct.unpack_from(">H", packet, 3)[0]
+        if len(packet) != size + 2:
+            raise FetcherException(f"invalid gateway response (size {size}, got {len(packet) - 2})!")
+        if sum(packet[2:-1]) & 0xFF != packet[-1]:
+            raise FetcherException("invalid gateway response (checksum)!")
+
+        values = {}
+        decoders = cls._DECODERS
+        offset, end = 5, len(packet) - 1
+        while offset < end:
+            item_id = packet[offset]
+            decoder = decoders.get(item_id)
+            if decoder is None:
+                _logger.warning("unknown gateway data item 0x%02x (offset %d) => remaining items skipped", item_id, offset)
+                break
+            item_struct, result_key, factor = decoder
+            if result_key is not None:
+                values[result_key] = round(item_struct.unpack_from(packet, offset + 1)[0] * factor, 2)
+            offset += 1 + item_struct.size
+
+        return values
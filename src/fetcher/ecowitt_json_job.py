@@ -0,0 +1,168 @@
+import json
+import logging
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.fetcher import transformation
+from src.fetcher.fetcher_config import FetcherConfKey
+from src.fetcher.fetcher_item import FetcherItem
+from src.fetcher.fetcher_job import FetcherException, FetcherJob
+from src.fetcher.fetcher_key import FetcherKey
+from src.fetcher.time_series import RingMaxTimeSeries
+
+_logger = logging.getLogger(__name__)
+
+
+class EcowittJsonJob(FetcherJob):
+    """
+    Gateways serving `/get_livedata_info` (JSON; Ecowitt GW1100/GW2000, Froggit DP1500, ...). The item keys are paths
+    into the JSON document: "<section>/<id>" for the id/val lists, "<section>/<index>/<field>" for plain objects.
+    Values come with units ("43%", "4.0 km/h"; temperatures: "unit" field), imperial units are converted to the metric
+    units of the other stations (°C, hPa, km/h, mm) before the transformation.
+    """
+
+    DEFERRED_IMPORTS = ["http.client"]
+
+    PATH_INDOOR = "wh25/0/"
+
+    METRIC_UNITS = {"", "%", "C", "°C", "hPa", "km/h", "mm", "mm/Hr", "W/m2"}
+    UNIT_CONVERSIONS = {
+        "F": lambda v: (v - 32) / 1.8,
+        "°F": lambda v: (v - 32) / 1.8,
+        "inHg": lambda v: v * 33.8639,
+        "mmHg": lambda v: v * 1.333224,
+        "mph": lambda v: v * 1.609344,
+        "m/s": lambda v: v * 3.6,
+        "ft/s": lambda v: v * 1.09728,
+        "knots": lambda v: v * 1.852,
+        "in": lambda v: v * 25.4,
+        "in/Hr": lambda v: v * 25.4,
+    }  # type: Dict[str, Callable[[float], float]]
+
+    # precomputed: path => segments (list indexes as int)
+    _PATHS = {}  # type: Dict[str, tuple]
+
+    @classmethod
+    def get_path_segments(cls, path: str) -> tuple:
+        segments = cls._PATHS.get(path)
+        if segments is None:
+            segments = tuple(int(s) if s.isdigit() else s for s in path.split("/"))
+            cls._PATHS[path] = segments
+        return segments
+
+    def _get_items(self) -> [FetcherItem]:
+        return self.config_fetcher_items(self._config)
+
+    @classmethod
+    def config_fetcher_items(cls, config) -> [FetcherItem]:
+
+        fetcher_items = []
+
+        def add_standard(path, key, transform_class):
+            fetcher_items.append(FetcherItem(key, path, transform_class(key)))
+
+        add_standard(cls.PATH_INDOOR + "intemp", FetcherKey.TEMP_INSIDE, transformation.FloatTransformation)
+        add_standard(cls.PATH_INDOOR + "inhumi", FetcherKey.HUMI_INSIDE, transformation.FloatTransformation)
+        add_standard(cls.PATH_INDOOR + "abs", FetcherKey.PRESSURE_ABS, transformation.FloatTransformation)
+
+        add_standard("common_list/0x02", FetcherKey.TEMP_OUTSIDE, transformation.FloatTransformation)
+        add_standard("common_list/0x07", FetcherKey.HUMI_OUTSIDE, transformation.FloatTransformation)
+        add_standard("common_list/0x0A", FetcherKey.WIND_DIRECTION, transformation.FloatTransformation)
+        add_standard("common_list/0x0B", FetcherKey.WIND_SPEED, transformation.FloatTransformation)
+        add_standard("common_list/0x15", FetcherKey.SOLAR_RADIATION, transformation.FloatTransformation)
+        add_standard("common_list/0x17", FetcherKey.UVI, transformation.FloatTransformation)
+
+        add_standard("rain/0x0E", FetcherKey.RAIN_HOURLY, transformation.FloatTransformation)  # rain rate
+        add_standard("rain/0x13", FetcherKey.RAIN_COUNTER, transformation.FloatTransformation)  # yearly rain
+
+        # Wind Gust
+        result_key = FetcherKey.WIND_GUST
+        item = FetcherItem(
+            result_key,
+            "common_list/0x0C",
+            transformation.GustTransformation(FetcherKey.WIND_SPEED, result_key),
+            time_series=RingMaxTimeSeries(result_key, timedelta(minutes=15))
+        )
+        fetcher_items.append(item)
+
+        # Relative Pressure: own calculation (like for the other stations) if the altitude is configured
+        altitude = config.get(FetcherConfKey.ALTITUDE)
+        result_key = FetcherKey.PRESSURE_REL
+        if altitude is not None:
+            transform = transformation.RelPressureTransformation(result_key, FetcherKey.TEMP_OUTSIDE, altitude)
+            fetcher_items.append(FetcherItem(result_key, cls.PATH_INDOOR + "abs", transform))
+        else:
+            add_standard(cls.PATH_INDOOR + "rel", result_key, transformation.FloatTransformation)
+
+        # the gateway delivers the rain rate itself
+        if config.get(FetcherConfKey.DERIVED_METRICS):
+            add_standard("rain/0x0E", FetcherKey.RAIN_RATE, transformation.FloatTransformation)
+
+        return fetcher_items
+
+    def _load_values(self, items: List[FetcherItem], page) -> Dict[str, str]:
+        document = json.loads(page)
+        id_indexes = {}  # the id/val lists are indexed once per document
+        values = {}
+
+        for item in items:
+            if not item.do_fetch:
+                continue
+            try:
+                value, unit = self._resolve(document, self.get_path_segments(item.html_key), id_indexes)
+                if value is not None:
+                    value = self.to_metric(value, unit)
+            except (LookupError, TypeError, ValueError) as ex:
+                _logger.error('cannot load value (%s)! %s', item, ex)
+                value = None
+
+            if value is not None:
+                values[item.result_key] = value
+            else:
+                _logger.debug('value not delivered (%s)', item)
+
+        return values
+
+    @classmethod
+    def _resolve(cls, document, segments: tuple, id_indexes: Dict[str, dict]) -> Tuple[any, Optional[str]]:
+        """The value and the "unit" field of its object (if any)."""
+        section = segments[0]
+        node = document.get(section)
+        if node is None:
+            return None, None
+
+        if len(segments) == 2 and isinstance(node, list):  # "<section>/<id>"
+            id_index = id_indexes.get(section)
+            if id_index is None:
+                id_index = id_indexes[section] = {entry.get("id"): entry for entry in node if isinstance(entry, dict)}
+            entry = id_index.get(segments[1])
+            return (entry.get("val"), entry.get("unit")) if entry is not None else (None, None)
+
+        unit = None
+        for segment in segments[1:]:
+            if isinstance(node, list):
+                node = node[segment] if isinstance(segment, int) and segment < len(node) else None
+            elif isinstance(node, dict):
+                unit = node.get("unit")
+                node = node.get(segment)
+            if node is None:
+                return None, None
+        return node, unit
+
+    @classmethod
+    def to_metric(cls, value, unit: Optional[str] = None) -> str:
+        """
+        "4.0 km/h" => "4.0", "43%" => "43", "2.5 mph" => "4.02"; `unit` (the "unit" field) applies to values without
+        unit suffix. Unknown units fail the fetch. The transformations handle "--" (no value).
+        """
+        number, _, value_unit = str(value).strip().partition(" ")
+        if number.endswith("%"):
+            number, value_unit = number[:-1], "%"
+        unit = value_unit.strip() or (unit or "").strip()
+
+        if unit in cls.METRIC_UNITS or number.startswith("--"):
+            return number
+        conversion = cls.UNIT_CONVERSIONS.get(unit)
+        if conversion is None:
+            raise FetcherException(f"unit not supported ({value!r}, unit: {unit})!")
+        return str(round(conversion(float(number)), 2))
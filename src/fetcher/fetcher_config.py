@@ -1,13 +1,50 @@
 
+class FetcherType:
+    FROGGIT_WH2600 = "froggit_wh2600"
+    ECOWITT_GW1000 = "ecowitt_gw1000"
+    ECOWITT_JSON = "ecowitt_json"
+
+
 class FetcherConfKey:
+    TYPE = "type"
     URL = "url"
     ALTITUDE = "altitude"
+    PARSE_WORKERS = "parse_workers"
+    DERIVED_METRICS = "derived_metrics"
+    RAIN_ACCUMULATION = "rain_accumulation"
+    RAIN_STATE_FILE = "rain_state_file"
+    OUTLIER_FILTER = "outlier_filter"
+    OUTLIER_WINDOW = "outlier_window"
+    OUTLIER_THRESHOLD = "outlier_threshold"
+
+    CONNECT_TIMEOUT = "connect_timeout"
+    READ_TIMEOUT = "read_timeout"
+    RETRIES = "retries"
+    RETRY_DELAY = "retry_delay"
+    HEDGING = "hedging"
+    CIRCUIT_BREAKER = "circuit_breaker"
+    CIRCUIT_FAILURES = "circuit_failures"
+    CIRCUIT_OPEN_TIME = "circuit_open_time"
+
+    RECORD_DIR = "record_dir"
+    RECORD_MAX_BYTES = "record_max_bytes"
+    RECORD_MAX_SEGMENTS = "record_max_segments"
+    RECORD_COMPRESSION = "record_compression"
+    RECORD_NAME = "record_name"
 
 
 FETCHER_JSONSCHEMA = {
     "type": "object",
     "properties": {
 
+        FetcherConfKey.TYPE: {
+            "type": "string",
+            "enum": [FetcherType.FROGGIT_WH2600, FetcherType.ECOWITT_GW1000, FetcherType.ECOWITT_JSON],
+            "description": "Station type (default: froggit_wh2600 == HTML page). "
+                           "ecowitt_gw1000: binary LAN API of Ecowitt gateways (GW1000, GW1100, GW2000), URL: 'tcp://<host>[:45000]'. "
+                           "ecowitt_json: JSON of newer gateways, URL: 'http://<host>/get_livedata_info'."
+        },
+
         FetcherConfKey.ALTITUDE: {
             "type": "number",
             "minimum": -1000,
@@ -22,6 +59,112 @@ FETCHER_JSONSCHEMA = {
             "description": "URL to download the weather data."
         },
 
+        FetcherConfKey.PARSE_WORKERS: {
+            "type": "integer",
+            "minimum": 0,
+            "description": "Count of worker processes for HTML parsing/transformation, shared by all stations of a process "
+                           "(default: 0 == in process)."
+        },
+
+        FetcherConfKey.DERIVED_METRICS: {
+            "type": "boolean",
+            "description": "Adds dew point, heat index, wind chill, feels-like, absolute humidity and rain rate (default: false). "
+                           "Metric station units (°C, km/h, mm) are expected."
+        },
+
+        FetcherConfKey.RAIN_ACCUMULATION: {
+            "type": "boolean",
+            "description": "Adds the rain of the current hour, the current day and the last 24 hours (default: false)."
+        },
+        FetcherConfKey.RAIN_STATE_FILE: {
+            "type": "string",
+            "minLength": 1,
+            "description": "Keeps the rain accumulation state across restarts (optional)."
+        },
+
+        FetcherConfKey.OUTLIER_FILTER: {
+            "type": "boolean",
+            "description": "Drops values out of physical bounds and spikes of slowly changing values (default: false)."
+        },
+        FetcherConfKey.OUTLIER_WINDOW: {
+            "type": "integer",
+            "minimum": 10,
+            "description": "Count of former values for the rolling median (default: 30)."
+        },
+        FetcherConfKey.OUTLIER_THRESHOLD: {
+            "type": "number",
+            "exclusiveMinimum": 0,
+            "description": "Max deviation from the rolling median, in multiples of the (scaled) MAD (default: 6)."
+        },
+
+        FetcherConfKey.CONNECT_TIMEOUT: {
+            "type": "number",
+            "exclusiveMinimum": 0,
+            "description": "Deadline to connect to the station (seconds; default: 10)."
+        },
+        FetcherConfKey.READ_TIMEOUT: {
+            "type": "number",
+            "exclusiveMinimum": 0,
+            "description": "Deadline to receive the whole response after the connect (seconds; default: 10)."
+        },
+        FetcherConfKey.RETRIES: {
+            "type": "integer",
+            "minimum": 0,
+            "description": "Retries within a fetch cycle after connection errors or exceeded deadlines (default: 0)."
+        },
+        FetcherConfKey.RETRY_DELAY: {
+            "type": "number",
+            "minimum": 0,
+            "description": "Max delay before the first retry, doubled per retry; the delay is random up to this (seconds; default: 0.5)."
+        },
+        FetcherConfKey.HEDGING: {
+            "type": "boolean",
+            "description": "Sends a second request if the first hasn't answered within the p95 latency of the former "
+                           "requests; the first response wins (default: false)."
+        },
+
+        FetcherConfKey.CIRCUIT_BREAKER: {
+            "type": "boolean",
+            "description": "Stops fetching from an unreachable station (fail fast) until a cheap probe (TCP connect) "
+                           "succeeds again (default: false)."
+        },
+        FetcherConfKey.CIRCUIT_FAILURES: {
+            "type": "integer",
+            "minimum": 1,
+            "description": "Consecutive failed fetches which open the circuit (default: 3)."
+        },
+        FetcherConfKey.CIRCUIT_OPEN_TIME: {
+            "type": "number",
+            "minimum": 1,
+            "description": "Time until the first probe (seconds; default: 30), doubled after each failed probe (up to 600s)."
+        },
+
+        FetcherConfKey.RECORD_DIR: {
+            "type": "string",
+            "minLength": 1,
+            "description": "Records the raw station responses into this directory (optional; can be replayed)."
+        },
+        FetcherConfKey.RECORD_MAX_BYTES: {
+            "type": "integer",
+            "minimum": 10240,
+            "description": "Max uncompressed bytes per capture segment file (default: 10 MB)."
+        },
+        FetcherConfKey.RECORD_MAX_SEGMENTS: {
+            "type": "integer",
+            "minimum": 1,
+            "description": "Max count of capture segment files (default: 20)."
+        },
+        FetcherConfKey.RECORD_COMPRESSION: {
+            "type": "string",
+            "enum": ["none", "gzip", "zstd"],
+            "description": "Compression of capture segment files (default: gzip; zstd needs package 'zstandard')."
+        },
+        FetcherConfKey.RECORD_NAME: {
+            "type": "string",
+            "minLength": 1,
+            "description": "Station name within the capture segment file names (default: host and port of the url)."
+        },
+
     },
     "additionalProperties": False,
     "required": [FetcherConfKey.URL],
@@ -1,14 +1,189 @@
 import copy
+import importlib
 
-from src.fetcher.froggit_wh2600_job import FroggitWh2600Job
+from src.fetcher.capture_recorder import CaptureRecorder
+from src.fetcher.circuit_breaker import CircuitBreaker
+from src.fetcher.fetcher_config import FetcherConfKey, FetcherType
+from src.fetcher.outlier_filter import OutlierFilter
+from src.fetcher.parse_pool import ParsePool
+from src.fetcher.rain_accumulator import RainAccumulator
+from src.fetcher.request_policy import RequestPolicy
 from src.fetcher.time_series_manager import TimeSeriesManager
 
 
 class FetcherFactory:
 
+    # registry of the station types; modules are only imported when configured
+    FETCHER_CLASSES = {
+        FetcherType.FROGGIT_WH2600: ("src.fetcher.froggit_wh2600_job", "FroggitWh2600Job"),
+        FetcherType.ECOWITT_GW1000: ("src.fetcher.ecowitt_gw1000_job", "EcowittGw1000Job"),
+        FetcherType.ECOWITT_JSON: ("src.fetcher.ecowitt_json_job", "EcowittJsonJob"),
+    }
+
+    REQUEST_POLICY_KEYS = [FetcherConfKey.RETRIES, FetcherConfKey.RETRY_DELAY, FetcherConfKey.HEDGING]
+    # a changed URL (other station) starts with a closed circuit
+    CIRCUIT_BREAKER_KEYS = [FetcherConfKey.CIRCUIT_BREAKER, FetcherConfKey.CIRCUIT_FAILURES, FetcherConfKey.CIRCUIT_OPEN_TIME,
+                            FetcherConfKey.URL]
+
+    # a changed URL changes the default station name of the capture segments
+    RECORDER_KEYS = [FetcherConfKey.RECORD_DIR, FetcherConfKey.RECORD_MAX_BYTES, FetcherConfKey.RECORD_MAX_SEGMENTS,
+                     FetcherConfKey.RECORD_COMPRESSION, FetcherConfKey.RECORD_NAME, FetcherConfKey.URL]
+
     def __init__(self, fetcher_config):
         self._fetcher_config = copy.deepcopy(fetcher_config)
+        self._job_class = self.get_job_class(self._fetcher_config)
         self._time_series_manager = TimeSeriesManager()
+        self._recorder = None
+        self._parse_pool = None
+        self._parse_workers = 0
+        self._rain_accumulator = self._create_rain_accumulator()
+        self._persistent = False
+        self._outlier_filter = self._create_outlier_filter()
+        self._request_policy = self._create_request_policy()
+        self._circuit_breaker = self._create_circuit_breaker()
 
     def create_fetcher_job(self):
-        return FroggitWh2600Job(self._fetcher_config, self._time_series_manager)
+        return self._job_class(self._fetcher_config, self._time_series_manager, recorder=self._recorder, parse_pool=self._parse_pool,
+                                rain_accumulator=self._rain_accumulator, outlier_filter=self._outlier_filter,
+                                request_policy=self._request_policy, circuit_breaker=self._circuit_breaker)
+
+    @classmethod
+    def get_job_class(cls, fetcher_config):
+        module_name, class_name = cls.FETCHER_CLASSES[fetcher_config.get(FetcherConfKey.TYPE, FetcherType.FROGGIT_WH2600)]
+        return getattr(importlib.import_module(module_name), class_name)
+
+    def _create_rain_accumulator(self):
+        return RainAccumulator() if self._fetcher_config.get(FetcherConfKey.RAIN_ACCUMULATION) else None
+
+    def _create_outlier_filter(self):
+        if not self._fetcher_config.get(FetcherConfKey.OUTLIER_FILTER):
+            return None
+        return OutlierFilter(
+            window=self._fetcher_config.get(FetcherConfKey.OUTLIER_WINDOW, OutlierFilter.DEFAULT_WINDOW),
+            threshold=self._fetcher_config.get(FetcherConfKey.OUTLIER_THRESHOLD, OutlierFilter.DEFAULT_THRESHOLD),
+        )
+
+    def _create_request_policy(self):
+        retries = self._fetcher_config.get(FetcherConfKey.RETRIES, RequestPolicy.DEFAULT_RETRIES)
+        hedging = self._fetcher_config.get(FetcherConfKey.HEDGING, False)
+        if not retries and not hedging:
+            return None
+        return RequestPolicy(
+            retries=retries,
+            retry_delay=self._fetcher_config.get(FetcherConfKey.RETRY_DELAY, RequestPolicy.DEFAULT_RETRY_DELAY),
+            hedging=hedging,
+        )
+
+    def _create_circuit_breaker(self):
+        if not self._fetcher_config.get(FetcherConfKey.CIRCUIT_BREAKER):
+            return None
+        return CircuitBreaker(
+            failure_threshold=self._fetcher_config.get(FetcherConfKey.CIRCUIT_FAILURES, CircuitBreaker.DEFAULT_FAILURE_THRESHOLD),
+            open_time=self._fetcher_config.get(FetcherConfKey.CIRCUIT_OPEN_TIME, CircuitBreaker.DEFAULT_OPEN_TIME),
+        )
+
+    @property
+    def fetcher_config(self):
+        return self._fetcher_config
+
+    @property
+    def outlier_filter(self):
+        return self._outlier_filter
+
+    def get_statistics(self):
+        statistics = {}
+        if self._recorder is not None:
+            statistics["recorder"] = {"dropped": self._recorder.dropped}
+        if self._outlier_filter is not None:
+            statistics["outliers"] = self._outlier_filter.get_statistics()
+        if self._request_policy is not None:
+            statistics["requests"] = self._request_policy.get_statistics()
+        if self._circuit_breaker is not None:
+            statistics["circuit"] = self._circuit_breaker.get_statistics()
+        return statistics
+
+    def update_config(self, fetcher_config):
+        """Applies a reloaded config, the time series are kept."""
+        restart_recorder = self._recorder is not None and \
+            any(fetcher_config.get(key) != self._fetcher_config.get(key) for key in self.RECORDER_KEYS)
+        outlier_keys = [FetcherConfKey.OUTLIER_FILTER, FetcherConfKey.OUTLIER_WINDOW, FetcherConfKey.OUTLIER_THRESHOLD]
+        recreate_outlier_filter = any(fetcher_config.get(key) != self._fetcher_config.get(key) for key in outlier_keys)
+        recreate_request_policy = any(fetcher_config.get(key) != self._fetcher_config.get(key) for key in self.REQUEST_POLICY_KEYS)
+        recreate_circuit_breaker = any(fetcher_config.get(key) != self._fetcher_config.get(key) for key in self.CIRCUIT_BREAKER_KEYS)
+
+        self._fetcher_config = copy.deepcopy(fetcher_config)
+        self._job_class = self.get_job_class(self._fetcher_config)
+
+        if recreate_outlier_filter:
+            self._outlier_filter = self._create_outlier_filter()
+
+        if recreate_request_policy:
+            if self._request_policy is not None:
+                self._request_policy.close()
+            self._request_policy = self._create_request_policy()
+
+        if recreate_circuit_breaker:
+            self._circuit_breaker = self._create_circuit_breaker()
+
+        if restart_recorder:
+            self._recorder.close()
+            self._recorder = None
+            self.start_recorder()
+
+        if bool(fetcher_config.get(FetcherConfKey.RAIN_ACCUMULATION)) != (self._rain_accumulator is not None):
+            self._rain_accumulator = self._create_rain_accumulator()
+        if self._persistent:
+            self.start_persistence()  # new accumulator or changed state file
+
+        if self._parse_pool is not None and fetcher_config.get(FetcherConfKey.PARSE_WORKERS) != self._parse_workers:
+            ParsePool.release(self._parse_pool)
+            self._parse_pool = None
+            self.start_parse_pool()
+
+    def warm_up(self):
+        self._job_class.warm_up()
+        if self._parse_pool is not None:
+            self._parse_pool.warm_up()
+
+    def start_parse_pool(self):
+        """Starts the worker processes for parsing/transformation if configured (shared by all stations of the process)."""
+        workers = self._fetcher_config.get(FetcherConfKey.PARSE_WORKERS, 0)
+        if workers and self._parse_pool is None:
+            self._parse_pool = ParsePool.acquire(workers)
+            self._parse_workers = workers
+
+    def start_recorder(self):
+        """Starts recording raw station responses if configured (not used for replays)."""
+        record_dir = self._fetcher_config.get(FetcherConfKey.RECORD_DIR)
+        if record_dir and self._recorder is None:
+            self._recorder = CaptureRecorder(
+                record_dir,
+                max_bytes=self._fetcher_config.get(FetcherConfKey.RECORD_MAX_BYTES, CaptureRecorder.DEFAULT_MAX_BYTES),
+                max_segments=self._fetcher_config.get(FetcherConfKey.RECORD_MAX_SEGMENTS, CaptureRecorder.DEFAULT_MAX_SEGMENTS),
+                compression=self._fetcher_config.get(FetcherConfKey.RECORD_COMPRESSION, "gzip"),
+                name=self._fetcher_config.get(FetcherConfKey.RECORD_NAME) or self._get_station_name(),
+            )
+
+    def _get_station_name(self) -> str:
+        """Distinguishes the captures of stations sharing a record dir: "<host>:<port>" of the url."""
+        import urllib.parse
+
+        return urllib.parse.urlsplit(self._fetcher_config.get(FetcherConfKey.URL, "")).netloc
+
+    def start_persistence(self):
+        """Loads and saves the state of the rain accumulation if configured (not used for replays)."""
+        self._persistent = True
+        state_file = self._fetcher_config.get(FetcherConfKey.RAIN_STATE_FILE)
+        if self._rain_accumulator is not None and self._rain_accumulator.state_file != state_file:
+            self._rain_accumulator.set_state_file(state_file)
+
+    def close(self):
+        if self._parse_pool is not None:
+            ParsePool.release(self._parse_pool)
+            self._parse_pool = None
+        if self._recorder is not None:
+            self._recorder.close()
+            self._recorder = None
+        if self._request_policy is not None:
+            self._request_policy.close()
+            self._request_policy = None
@@ -1,17 +1,26 @@
 import abc
+import asyncio
 import copy
 import logging
-import urllib.error
-import urllib.request
-from typing import Dict, List
-
-from bs4 import BeautifulSoup
+import importlib
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional
 
+from src.fetcher.capture_recorder import CaptureRecorder
+from src.fetcher.circuit_breaker import CircuitBreaker, CircuitState
 from src.fetcher.fetcher_config import FetcherConfKey
 from src.fetcher.fetcher_item import FetcherItem
 from src.fetcher.fetcher_key import FetcherKey
 from src.fetcher.fetcher_status import FetcherStatus
+from src.fetcher.outlier_filter import OutlierFilter
+from src.fetcher.parse_pool import ParsePool
+from src.fetcher.rain_accumulator import RainAccumulator
 from src.fetcher.time_series_manager import TimeSeriesManager
+from src.fetcher import transformation
+from src.utils.time_utils import TimeUtils
+
+if TYPE_CHECKING:
+    from src.fetcher.request_policy import RequestPolicy  # imports `FetcherException`
 
 _logger = logging.getLogger(__name__)
 
@@ -22,51 +31,256 @@ class FetcherException(Exception):
 
 class FetcherJob:
 
-    def __init__(self, config, time_series_manager: TimeSeriesManager):
+    # imported on demand, to not delay the startup (see `warm_up`)
+    DEFERRED_IMPORTS = ["http.client", "bs4"]
+
+    DEFAULT_CONNECT_TIMEOUT = 10  # seconds
+    DEFAULT_READ_TIMEOUT = 10  # seconds
+    READ_CHUNK_SIZE = 65536
+    DEFAULT_PORTS = {"http": 80, "https": 443}
+
+    DERIVED_METRICS = transformation.DerivedMetrics([
+        transformation.FeelsLikeMetric(FetcherKey.FEELS_LIKE, FetcherKey.TEMP_OUTSIDE, FetcherKey.HEAT_INDEX, FetcherKey.WIND_CHILL),
+        transformation.DewPointMetric(FetcherKey.DEW_POINT, FetcherKey.TEMP_OUTSIDE, FetcherKey.HUMI_OUTSIDE),
+        transformation.HeatIndexMetric(FetcherKey.HEAT_INDEX, FetcherKey.TEMP_OUTSIDE, FetcherKey.HUMI_OUTSIDE),
+        transformation.WindChillMetric(FetcherKey.WIND_CHILL, FetcherKey.TEMP_OUTSIDE, FetcherKey.WIND_SPEED),
+        transformation.AbsoluteHumidityMetric(FetcherKey.HUMI_ABSOLUTE, FetcherKey.TEMP_OUTSIDE, FetcherKey.HUMI_OUTSIDE),
+    ])
+
+    def __init__(self, config, time_series_manager: Optional[TimeSeriesManager], recorder: Optional[CaptureRecorder] = None,
+                 parse_pool: Optional[ParsePool] = None, rain_accumulator: Optional[RainAccumulator] = None,
+                 outlier_filter: Optional[OutlierFilter] = None, request_policy: Optional['RequestPolicy'] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None):
         super().__init__()
 
         self._config = copy.deepcopy(config)
         self._url = self._config[FetcherConfKey.URL]
+        self._connect_timeout = self._config.get(FetcherConfKey.CONNECT_TIMEOUT, self.DEFAULT_CONNECT_TIMEOUT)
+        self._read_timeout = self._config.get(FetcherConfKey.READ_TIMEOUT, self.DEFAULT_READ_TIMEOUT)
 
         self._time_series_manager = time_series_manager
+        self._recorder = recorder
+        self._parse_pool = parse_pool
+        self._rain_accumulator = rain_accumulator
+        self._outlier_filter = outlier_filter
+        self._request_policy = request_policy
+        self._circuit_breaker = circuit_breaker
 
     @property
     def time_series_key(self):
         return self.__class__.__name__
 
+    @classmethod
+    def warm_up(cls):
+        """Imports the deferred modules; should be called while waiting for something else (e.g. the MQTT connection)."""
+        for module_name in cls.DEFERRED_IMPORTS:
+            importlib.import_module(module_name)
+
     @abc.abstractmethod
     def _get_items(self) -> [FetcherItem]:
         raise NotImplementedError()
 
+    def _get_derived_metrics(self) -> Optional[transformation.DerivedMetrics]:
+        """Optional stage after the transformation."""
+        return self.DERIVED_METRICS if self._config.get(FetcherConfKey.DERIVED_METRICS) else None
+
     def fetch_safe(self):
+        failed = self._check_circuit()
+        if failed is not None:
+            return failed
+        return self._record_circuit(self._fetch_logged())
+
+    async def fetch_safe_async(self):
+        """
+        `fetch_safe` for the runner loop, which stays responsive (HTTP API, other stations): the blocking parts run in
+        threads, only the stateful rest of the pipeline (time series etc.) runs in the loop thread.
+        """
+        loop = asyncio.get_running_loop()
+        failed = await loop.run_in_executor(None, self._check_circuit)  # may probe
+        if failed is not None:
+            return failed
+
+        try:
+            _logger.debug("fetching %s", self._url)
+            page = await loop.run_in_executor(None, self._load_page_recorded)
+            values = await self.process_page_async(page)
+        except asyncio.CancelledError:  # fetch timeout
+            self._record_circuit({FetcherKey.STATUS: FetcherStatus.TIMEOUT})
+            raise
+        except Exception as ex:
+            _logger.exception(ex)
+            values = {FetcherKey.STATUS: FetcherStatus.ERROR}
+        return self._record_circuit(values)
+
+    def _check_circuit(self) -> Optional[Dict[str, any]]:
+        """The result of a skipped fetch (open circuit, failed probe) or `None` (go ahead)."""
+        breaker = self._circuit_breaker
+        if breaker is None:
+            return None
+
+        if not breaker.allow_request():  # fail fast
+            return {FetcherKey.STATUS: FetcherStatus.ERROR, FetcherKey.CIRCUIT: breaker.state}
+
+        if breaker.state == CircuitState.HALF_OPEN:
+            try:
+                self.probe()
+            except FetcherException as ex:
+                _logger.info("probe failed: %s", ex)
+                breaker.record_failure()
+                return {FetcherKey.STATUS: FetcherStatus.ERROR, FetcherKey.CIRCUIT: breaker.state}
+
+        return None
+
+    def _record_circuit(self, values: Dict[str, any]) -> Dict[str, any]:
+        breaker = self._circuit_breaker
+        if breaker is None:
+            return values
+
+        if values.get(FetcherKey.STATUS) == FetcherStatus.OK:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+        values[FetcherKey.CIRCUIT] = breaker.state
+        return values
+
+    def _fetch_logged(self):
         try:
             return self.fetch()
         except Exception as ex:
             _logger.exception(ex)
             return {FetcherKey.STATUS: FetcherStatus.ERROR}
 
+    def _get_address(self):
+        import urllib.parse
+
+        parts = urllib.parse.urlsplit(self._url)
+        return parts.hostname, parts.port or self.DEFAULT_PORTS.get(parts.scheme, 80)
+
+    def probe(self):
+        """Cheap reachability check (TCP connect only) before a full fetch, used by the half open circuit breaker."""
+        import socket
+
+        try:
+            socket.create_connection(self._get_address(), timeout=self._connect_timeout).close()
+        except OSError as ex:
+            raise FetcherException(f"station not reachable ({self._url}): {ex}") from None
+
     def fetch(self):
         _logger.debug("fetching %s", self._url)
 
+        html = self._load_page_recorded()
+        return self.process_page(html)
+
+    def _load_page_recorded(self):
+        if self._recorder is None:
+            return self._load_page_resilient()
+
+        fetched = TimeUtils.now()
+        time_start = time.perf_counter()
+        html = self._load_page_resilient()
+        self._recorder.record(fetched, time.perf_counter() - time_start, html)
+        return html
+
+    def _load_page_resilient(self):
+        """Retries/hedging if configured (`RequestPolicy`); `_load_page` is a single request."""
+        if self._request_policy is None:
+            return self._load_page()
+        return self._request_policy.execute(self._load_page)
+
+    def process_page(self, html):
+        """Runs the extraction, transformation and time series pipeline on an already loaded page."""
+        items = self._get_items()
+        if self._parse_pool is None:
+            values_transformed = self.extract_values(html, items)
+        else:
+            values_transformed = self._parse_pool.extract_values(self.__class__, self._config, html)
+        return self._process_timed_values(items, values_transformed)
+
+    async def process_page_async(self, html):
+        """`process_page` without blocking the event loop: the extraction runs in a thread or a `ParsePool` worker."""
         items = self._get_items()
+        if self._parse_pool is None:
+            values_transformed = await asyncio.get_running_loop().run_in_executor(None, self.extract_values, html, items)
+        else:
+            values_transformed = await self._parse_pool.extract_values_async(self.__class__, self._config, html)
+        return self._process_timed_values(items, values_transformed)
+
+    def process_raw_values(self, values_raw: Dict[str, str]):
+        """Like `process_page`, but starts with already extracted raw values (keyed by result key)."""
+        items = self._get_items()
+        values_transformed = self._transform_values(items, values_raw)
+        return self._process_timed_values(items, values_transformed)
 
-        html = self._load_page()
+    def extract_values(self, html, items: Optional[List[FetcherItem]] = None) -> Dict[str, any]:
+        """The CPU bound (stateless) part of the pipeline: extraction + transformation. May run in a `ParsePool` worker."""
+        if items is None:
+            items = self._get_items()
         values_raw = self._load_values(items, html)
-        values_transformed = self._transform_values(items, values_raw)
+        return self._transform_values(items, values_raw)
+
+    def _process_timed_values(self, items: List[FetcherItem], values_transformed: Dict[str, any]):
+        """The stateful part of the pipeline (main process): outlier filter, derived metrics, time series."""
+        if self._outlier_filter is not None:
+            self._outlier_filter.filter(values_transformed)
+        self._derive_values(values_transformed)
+
         values_over_time = self._calculated_timed_values(items, values_transformed)
+        if self._rain_accumulator is not None:
+            values_over_time.update(self._rain_accumulator.collect(values_over_time.get(FetcherKey.RAIN_COUNTER)))
 
         values_over_time[FetcherKey.STATUS] = FetcherStatus.OK
         return values_over_time
 
-    def _load_page(self) -> str:
+    def _load_page(self) -> bytes:
+        """HTTP GET with separate deadlines: connect, then the whole response (not only per socket read)."""
+        import http.client
+        import socket
+        import urllib.parse
+
+        parts = urllib.parse.urlsplit(self._url)
+        connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+        connection = connection_class(parts.hostname, parts.port, timeout=self._connect_timeout)
         try:
-            with urllib.request.urlopen(self._url, timeout=10) as response:
-                html = response.read()
-                return html
-        except urllib.error.URLError:
-            raise FetcherException('could not open url ({})!'.format(self._url)) from None
+            try:
+                connection.connect()
+            except OSError as ex:
+                raise FetcherException(f"could not connect ({self._url}): {ex}") from None
+
+            sock = connection.sock  # is handed over to the response
+            deadline = time.monotonic() + self._read_timeout
+            sock.settimeout(self._read_timeout)
+            connection.request("GET", path)
+            response = connection.getresponse()
+            if 300 <= response.status < 400:  # not followed (`urlopen` did): the configured url should be the target
+                location = response.getheader("Location")
+                raise FetcherException(f"url ({self._url}) is redirected (HTTP {response.status} => {location})!")
+            if response.status >= 400:
+                raise FetcherException(f"could not open url ({self._url}): HTTP {response.status}!")
+
+            chunks = []
+            while not response.isclosed():  # closed by `http.client` when complete
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise socket.timeout()
+                sock.settimeout(remaining)
+                chunk = response.read1(self.READ_CHUNK_SIZE)  # returns what is available (deadline check)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            return b"".join(chunks)
+
+        except socket.timeout:
+            raise FetcherException(f"read timeout ({self._read_timeout}s) exceeded ({self._url})!") from None
+        except (OSError, http.client.HTTPException) as ex:
+            raise FetcherException(f"could not open url ({self._url}): {ex}") from None
+        finally:
+            connection.close()
 
     def _load_values(self, items: List[FetcherItem], html: str) -> Dict[str, str]:
+        from bs4 import BeautifulSoup
+
         soup = BeautifulSoup(html, 'html.parser')
         values = {}
 
@@ -123,8 +337,13 @@ class FetcherJob:
 
         return results
 
+    def _derive_values(self, values: Dict[str, any]):
+        derived_metrics = self._get_derived_metrics()
+        if derived_metrics is not None:
+            derived_metrics.calculate(values)
+
     def _calculated_timed_values(self, items: List[FetcherItem], values: Dict[str, str]):
-        results = {}
+        results = dict(values)  # keeps the derived metrics
 
         for item in items:
             value = values.get(item.result_key)
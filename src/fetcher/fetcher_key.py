@@ -2,6 +2,7 @@
 class FetcherKey:
 
     STATUS = "status"
+    CIRCUIT = "circuit"  # circuit breaker state (if configured)
 
     BATTERY = "battery"
     BATTERY_INSIDE = "batteryInside"
@@ -30,3 +31,16 @@ class FetcherKey:
 
     RAIN_HOURLY = "rainHourly"
     RAIN_COUNTER = "rainCounter"
+
+    # rain accumulation (optional)
+    RAIN_HOUR = "rainHour"
+    RAIN_DAY = "rainDay"
+    RAIN_24H = "rain24h"
+
+    # derived metrics (optional)
+    DEW_POINT = "dewPoint"
+    FEELS_LIKE = "feelsLike"
+    HEAT_INDEX = "heatIndex"
+    HUMI_ABSOLUTE = "humidityAbsolute"
+    RAIN_RATE = "rainRate"
+    WIND_CHILL = "windChill"
@@ -5,7 +5,7 @@ from src.fetcher.fetcher_item import FetcherItem
 from src.fetcher.fetcher_job import FetcherJob
 from src.fetcher import transformation
 from src.fetcher.fetcher_key import FetcherKey
-from src.fetcher.time_series import MaxTimeSeries
+from src.fetcher.time_series import RateTimeSeries, RingMaxTimeSeries
 
 
 class FroggitWh2600Job(FetcherJob):
@@ -63,7 +63,7 @@ class FroggitWh2600Job(FetcherJob):
             result_key,
             "gustspeed",
             transformation.GustTransformation(FetcherKey.WIND_SPEED, result_key),
-            time_series=MaxTimeSeries(result_key, timedelta(minutes=15))
+            time_series=RingMaxTimeSeries(result_key, timedelta(minutes=15))
         )
         fetcher_items.append(item)
 
@@ -78,4 +78,15 @@ class FroggitWh2600Job(FetcherJob):
             )
             fetcher_items.append(item)
 
+        # Rain rate (mm/h) out of the counter deltas: needs the samples of former fetches => time series
+        if config.get(FetcherConfKey.DERIVED_METRICS):
+            result_key = FetcherKey.RAIN_RATE
+            item = FetcherItem(
+                result_key,
+                "rainofyearly",
+                transformation.FloatTransformation(result_key),
+                time_series=RateTimeSeries(result_key, timedelta(minutes=10))
+            )
+            fetcher_items.append(item)
+
         return fetcher_items
@@ -0,0 +1,158 @@
+import bisect
+import logging
+import threading
+from collections import deque, namedtuple
+from typing import Dict, Optional
+
+from src.fetcher.fetcher_key import FetcherKey
+
+_logger = logging.getLogger(__name__)
+
+
+# `min_deviation`: the MAD test applies only to slowly changing values; the floor avoids rejections when the MAD is ~0.
+Bounds = namedtuple('Bounds', ['lower', 'upper', 'min_deviation'])
+
+
+class _RollingWindow:
+    """
+    Last `size` values in insertion order + sorted (bisect): median in O(1), MAD in O(log n). An update is O(n) (list
+    insert/delete shift the elements; the bisect search is O(log n)), which is cheap for small windows (default: 30).
+    """
+
+    def __init__(self, size: int):
+        self._size = size
+        self._values = deque()
+        self._sorted = []
+
+    def __len__(self):
+        return len(self._sorted)
+
+    def add(self, value: float):
+        if len(self._values) >= self._size:
+            old_value = self._values.popleft()
+            del self._sorted[bisect.bisect_left(self._sorted, old_value)]
+        self._values.append(value)
+        bisect.insort(self._sorted, value)
+
+    def clear(self):
+        self._values.clear()
+        self._sorted.clear()
+
+    def median(self) -> float:
+        return self._sorted[(len(self._sorted) - 1) // 2]  # lower median
+
+    def mad(self) -> float:
+        """
+        Median absolute deviation (lower median). The deviations left of the median and right of it are both sorted,
+        so the result is the k-th smallest element of two sorted sequences (binary search).
+        """
+        s = self._sorted
+        n = len(s)
+        mid = (n - 1) // 2
+        median = s[mid]
+
+        a_len, b_len = mid, n - mid
+
+        def a(i):  # deviations left of the median, ascending
+            return median - s[mid - 1 - i]
+
+        def b(j):  # deviations from the median on, ascending
+            return s[mid + j] - median
+
+        k = (n + 1) // 2
+        low, high = max(0, k - b_len), min(k, a_len)
+        while True:
+            i = (low + high) // 2  # taken from a
+            j = k - i  # taken from b
+            if i > 0 and j < b_len and a(i - 1) > b(j):
+                high = i - 1
+            elif j > 0 and i < a_len and b(j - 1) > a(i):
+                low = i + 1
+            else:
+                if i == 0:
+                    return b(j - 1)
+                if j == 0:
+                    return a(i - 1)
+                return max(a(i - 1), b(j - 1))
+
+
+class OutlierFilter:
+    """
+    Streaming filter between the transformation and the time series: values outside of physical bounds or (for slowly
+    changing values) too far from the rolling median (`threshold` * scaled MAD) are replaced by `None`.
+    Rejected values don't enter the window; after `MAX_CONSECUTIVE_REJECTIONS` the value is accepted as a real change.
+    """
+
+    DEFAULT_WINDOW = 30  # samples
+    DEFAULT_THRESHOLD = 6.0
+    MIN_SAMPLES = 10
+    MAX_CONSECUTIVE_REJECTIONS = 5
+    MAD_SCALE = 1.4826  # MAD => standard deviation (normal distribution)
+
+    BOUNDS = {
+        FetcherKey.TEMP_INSIDE: Bounds(-40, 60, 1.0),
+        FetcherKey.TEMP_OUTSIDE: Bounds(-60, 65, 1.0),
+        FetcherKey.HUMI_INSIDE: Bounds(1, 100, 3.0),
+        FetcherKey.HUMI_OUTSIDE: Bounds(1, 100, 3.0),
+        FetcherKey.PRESSURE_ABS: Bounds(700, 1100, 1.0),
+        FetcherKey.PRESSURE_REL: Bounds(850, 1100, 1.0),
+        FetcherKey.WIND_DIRECTION: Bounds(0, 360, None),
+        FetcherKey.WIND_SPEED: Bounds(0, 250, None),
+        FetcherKey.WIND_GUST: Bounds(0, 350, None),
+        FetcherKey.SOLAR_RADIATION: Bounds(0, 2000, None),
+        FetcherKey.UVI: Bounds(0, 20, None),
+        FetcherKey.RAIN_HOURLY: Bounds(0, 500, None),
+        FetcherKey.RAIN_COUNTER: Bounds(0, 100000, None),
+        FetcherKey.RAIN_RATE: Bounds(0, 100000, None),  # still the rain counter (the time series calculates the rate)
+    }
+
+    def __init__(self, window: int = DEFAULT_WINDOW, threshold: float = DEFAULT_THRESHOLD):
+        self._lock = threading.Lock()
+        self._window = window
+        self._threshold = threshold
+
+        self._windows = {}  # type: Dict[str, _RollingWindow]
+        self._consecutive_rejections = {}  # type: Dict[str, int]
+        self._rejected = {}  # type: Dict[str, int]
+
+    def get_statistics(self) -> Dict[str, int]:
+        """Count of rejected values per key (since start)."""
+        with self._lock:
+            return dict(self._rejected)
+
+    def filter(self, values: Dict[str, any]):
+        """Replaces the rejected values (in place)."""
+        with self._lock:
+            for key, bounds in self.BOUNDS.items():
+                value = values.get(key)
+                if value is None:
+                    continue
+                reason = self._check(key, value, bounds)
+                if reason is not None:
+                    values[key] = None
+                    self._rejected[key] = self._rejected.get(key, 0) + 1
+                    _logger.warning("value rejected (%s=%s): %s", key, value, reason)
+
+    def _check(self, key: str, value: float, bounds: Bounds) -> Optional[str]:
+        if value < bounds.lower or value > bounds.upper:
+            return f"out of bounds [{bounds.lower}, {bounds.upper}]"
+        if bounds.min_deviation is None:
+            return None
+
+        window = self._windows.get(key)
+        if window is None:
+            window = self._windows[key] = _RollingWindow(self._window)
+
+        if len(window) >= self.MIN_SAMPLES:
+            median = window.median()
+            max_deviation = self._threshold * max(window.mad() * self.MAD_SCALE, bounds.min_deviation)
+            if abs(value - median) > max_deviation:
+                rejections = self._consecutive_rejections.get(key, 0) + 1
+                if rejections <= self.MAX_CONSECUTIVE_REJECTIONS:
+                    self._consecutive_rejections[key] = rejections
+                    return f"spike (median={median}, max deviation={max_deviation:.2f})"
+                window.clear()  # persistent change => start over
+
+        self._consecutive_rejections[key] = 0
+        window.add(value)
+        return None
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import threading
+from typing import Dict, Optional, Union
+
+_logger = logging.getLogger(__name__)
+
+
+def _extract_values(job_class, config, page: Union[bytes, str]) -> Dict[str, any]:
+    """Runs in a worker process: extraction + transformation, but no time series (stay in the main process)."""
+    fetcher_job = job_class(config, None)
+    return fetcher_job.extract_values(page)
+
+
+def _noop():
+    return None
+
+
+class ParsePool:
+    """
+    Process pool for the CPU bound part of a fetch (HTML parsing, transformation), which is serialized by the GIL otherwise.
+    Raw page bytes are handed to the workers and only the compact value dicts come back.
+
+    There is one pool per process (`acquire`/`release`): all stations of a process (e.g. a supervisor shard) share the
+    workers. `multiprocessing` and `concurrent.futures.process` are imported with the first pool only.
+    """
+
+    TIMEOUT = 30  # seconds
+
+    _shared_lock = threading.Lock()
+    _shared = None  # type: Optional[ParsePool]
+    _shared_users = 0
+
+    def __init__(self, workers: int):
+        self._lock = threading.Lock()
+        self._workers = workers
+        self._executor = self._create_executor()
+
+    @classmethod
+    def acquire(cls, workers: int) -> 'ParsePool':
+        """The pool of this process; it grows if more `workers` are requested than it has. Hand it back via `release`."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(workers)
+            elif workers > cls._shared.workers:
+                cls._shared.resize(workers)
+            cls._shared_users += 1
+            return cls._shared
+
+    @classmethod
+    def release(cls, parse_pool: 'ParsePool'):
+        """The last user closes the pool."""
+        with cls._shared_lock:
+            if parse_pool is not cls._shared:
+                parse_pool.close()
+                return
+            cls._shared_users -= 1
+            if cls._shared_users <= 0:
+                cls._shared.close()
+                cls._shared = None
+                cls._shared_users = 0
+
+    def _create_executor(self):
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        # "spawn": the main process runs threads (MQTT), forking them is not safe
+        return ProcessPoolExecutor(max_workers=self._workers, mp_context=multiprocessing.get_context("spawn"))
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    def resize(self, workers: int):
+        """Pending extractions are finished by the old workers."""
+        with self._lock:
+            self._workers = workers
+            old_executor, self._executor = self._executor, self._create_executor()
+        old_executor.shutdown(wait=False)
+
+    def warm_up(self):
+        """Starts the worker processes (takes a while with "spawn")."""
+        for future in [self._submit(_noop) for _ in range(self._workers)]:
+            future.result(self.TIMEOUT)
+
+    def _submit(self, fn, *args):
+        with self._lock:
+            executor = self._executor
+            if executor is None:
+                raise RuntimeError("parse pool is closed!")
+        return executor.submit(fn, *args)
+
+    def _handle_broken_pool(self, executor, ex: BaseException):
+        from concurrent.futures.process import BrokenProcessPool
+
+        if not isinstance(ex, BrokenProcessPool):
+            return
+        with self._lock:
+            if self._executor is not executor:
+                return  # recreated already (by another station)
+            _logger.error("parse worker crashed => pool is recreated")
+            self._executor = self._create_executor()
+        executor.shutdown(wait=False)
+
+    def extract_values(self, job_class, config, page: Union[bytes, str]) -> Dict[str, any]:
+        """Blocks the calling thread (e.g. replays); see `extract_values_async` for the runner loop."""
+        executor = self._executor
+        try:
+            return self._submit(_extract_values, job_class, config, page).result(self.TIMEOUT)
+        except Exception as ex:
+            self._handle_broken_pool(executor, ex)
+            raise
+
+    async def extract_values_async(self, job_class, config, page: Union[bytes, str]) -> Dict[str, any]:
+        """The event loop stays free (other stations, HTTP API) while a worker parses."""
+        executor = self._executor
+        try:
+            future = self._submit(_extract_values, job_class, config, page)
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.TIMEOUT)
+        except Exception as ex:
+            self._handle_broken_pool(executor, ex)
+            raise
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
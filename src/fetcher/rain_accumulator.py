@@ -0,0 +1,127 @@
+import json
+import logging
+import os
+import threading
+from array import array
+from typing import Dict, Optional
+
+from src.fetcher.fetcher_key import FetcherKey
+from src.utils.time_utils import TimeUtils
+
+_logger = logging.getLogger(__name__)
+
+
+class RainAccumulator:
+    """
+    Derives the rain of the current hour, the current (local) day and the rolling last 24 hours out of the deltas of the
+    station's rain counter. 24 hourly buckets => constant effort per sample. A decreasing counter (yearly reset or
+    "Rain Reset" at the station) counts from 0; rain during gaps (e.g. downtime) is accounted to the next sample.
+    The state can be persisted (`state_file`), so the totals survive restarts.
+    """
+
+    HOURS = 24
+    STATE_VERSION = 1
+
+    def __init__(self, state_file: Optional[str] = None):
+        self._lock = threading.Lock()
+        self._state_file = state_file
+        self._reset()
+
+    def _reset(self):
+        self._last_counter = None  # type: Optional[float]
+        self._hour = None  # type: Optional[int]  # hours since epoch of the newest bucket
+        self._day = None  # type: Optional[str]  # local date (ISO)
+        self._day_total = 0.0
+        self._buckets = array('d', bytes(8 * self.HOURS))  # index: hour % 24
+
+    @property
+    def state_file(self) -> Optional[str]:
+        return self._state_file
+
+    def set_state_file(self, state_file: Optional[str]):
+        """Activates the persistence, an existing state is loaded."""
+        with self._lock:
+            self._state_file = state_file
+            if state_file and os.path.isfile(state_file):
+                self._load_state()
+
+    def collect(self, counter: Optional[float]) -> Dict[str, Optional[float]]:
+        with self._lock:
+            now = TimeUtils.now()
+            changed = self._advance(int(now.timestamp() // 3600), now.date().isoformat())
+
+            if counter is not None:
+                if self._last_counter is not None:
+                    delta = counter - self._last_counter if counter >= self._last_counter else counter  # reset
+                    if delta > 0:
+                        self._buckets[self._hour % self.HOURS] += delta
+                        self._day_total += delta
+                        changed = True
+                changed = changed or counter != self._last_counter
+                self._last_counter = counter
+
+            if changed and self._state_file:
+                self._save_state()
+
+            if self._last_counter is None:
+                return {FetcherKey.RAIN_HOUR: None, FetcherKey.RAIN_DAY: None, FetcherKey.RAIN_24H: None}
+            return {
+                FetcherKey.RAIN_HOUR: round(self._buckets[self._hour % self.HOURS], 2),
+                FetcherKey.RAIN_DAY: round(self._day_total, 2),
+                FetcherKey.RAIN_24H: round(sum(self._buckets), 2),
+            }
+
+    def _advance(self, hour: int, day: str) -> bool:
+        """Clears the buckets of elapsed hours (at most 24) and the day total at midnight."""
+        changed = False
+        if self._hour is None or hour - self._hour >= self.HOURS:
+            if any(self._buckets):
+                self._buckets = array('d', bytes(8 * self.HOURS))
+                changed = True
+        elif hour > self._hour:
+            for h in range(self._hour + 1, hour + 1):
+                self._buckets[h % self.HOURS] = 0.0
+            changed = True
+        if self._hour is None or hour > self._hour:
+            self._hour = hour
+
+        if day != self._day:
+            self._day = day
+            self._day_total = 0.0
+            changed = True
+        return changed
+
+    def _load_state(self):
+        try:
+            with open(self._state_file, "r") as stream:
+                state = json.load(stream)
+            if state.get("version") != self.STATE_VERSION:
+                raise ValueError(f"unknown version ({state.get('version')})")
+            self._last_counter = state["counter"]
+            self._hour = state["hour"]
+            self._day = state["day"]
+            self._day_total = state["dayTotal"]
+            self._buckets = array('d', state["buckets"])
+            if len(self._buckets) != self.HOURS:
+                raise ValueError("wrong bucket count")
+            _logger.info("rain state loaded (%s)", self._state_file)
+        except Exception as ex:
+            _logger.error("could not load the rain state (%s), starting over! %s", self._state_file, ex)
+            self._reset()
+
+    def _save_state(self):
+        state = {
+            "version": self.STATE_VERSION,
+            "counter": self._last_counter,
+            "hour": self._hour,
+            "day": self._day,
+            "dayTotal": self._day_total,
+            "buckets": list(self._buckets),
+        }
+        temp_file = self._state_file + ".tmp"
+        try:
+            with open(temp_file, "w") as stream:
+                json.dump(state, stream)
+            os.replace(temp_file, self._state_file)  # atomic: no half written state on crashes
+        except OSError as ex:
+            _logger.error("could not save the rain state (%s)! %s", self._state_file, ex)
@@ -0,0 +1,129 @@
+import bisect
+import logging
+import math
+import random
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Dict, Optional, TypeVar
+
+from src.fetcher.fetcher_job import FetcherException
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+_logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class RequestPolicy:
+    """
+    Page loads within one fetch cycle: retries with exponential backoff and full jitter, and optional hedging: if the
+    first request hasn't answered after the p95 latency of the former loads, a second request is sent and the first
+    response wins. The deadlines of a single request are up to the `FetcherJob`.
+    Owned by the `FetcherFactory` (the latencies are kept across fetch jobs).
+    """
+
+    DEFAULT_RETRIES = 0
+    DEFAULT_RETRY_DELAY = 0.5  # seconds, doubled per retry
+
+    LATENCY_WINDOW = 100  # loads
+    HEDGE_PERCENTILE = 95
+    HEDGE_MIN_SAMPLES = 20  # no hedging before (the percentile would be random)
+    HEDGE_WORKERS = 4  # a losing request keeps running until its deadlines
+
+    def __init__(self, retries: int = DEFAULT_RETRIES, retry_delay: float = DEFAULT_RETRY_DELAY, hedging: bool = False):
+        self._retries = retries
+        self._retry_delay = retry_delay
+
+        self._lock = threading.Lock()
+        self._latencies = deque()
+        self._sorted_latencies = []
+
+        self._retried = 0
+        self._hedged = 0
+        self._hedges_won = 0
+
+        self._executor = None  # type: Optional[ThreadPoolExecutor]
+        if hedging:
+            import concurrent.futures
+
+            self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.HEDGE_WORKERS, thread_name_prefix="fetch")
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def get_statistics(self) -> Dict[str, any]:
+        with self._lock:
+            return {"retried": self._retried, "hedged": self._hedged, "hedgesWon": self._hedges_won}
+
+    def get_hedge_delay(self) -> Optional[float]:
+        with self._lock:
+            count = len(self._sorted_latencies)
+            if count < self.HEDGE_MIN_SAMPLES:
+                return None
+            return self._sorted_latencies[math.ceil(count * self.HEDGE_PERCENTILE / 100) - 1]
+
+    def execute(self, load: Callable[[], T]) -> T:
+        attempt = 0
+        while True:
+            try:
+                if self._executor is not None:
+                    return self._load_hedged(load)
+                return self._load_timed(load)
+            except FetcherException as ex:
+                if attempt >= self._retries:
+                    raise
+                delay = random.uniform(0, self._retry_delay * 2 ** attempt)  # full jitter: no synchronized retries
+                attempt += 1
+                with self._lock:
+                    self._retried += 1
+                _logger.warning("%s => retry %d/%d in %.2fs", ex, attempt, self._retries, delay)
+                time.sleep(delay)
+
+    def _load_timed(self, load: Callable[[], T]) -> T:
+        started = time.monotonic()
+        result = load()
+        self._add_latency(time.monotonic() - started)  # successful loads only
+        return result
+
+    def _add_latency(self, latency: float):
+        with self._lock:
+            if len(self._latencies) >= self.LATENCY_WINDOW:
+                del self._sorted_latencies[bisect.bisect_left(self._sorted_latencies, self._latencies.popleft())]
+            self._latencies.append(latency)
+            bisect.insort(self._sorted_latencies, latency)
+
+    def _load_hedged(self, load: Callable[[], T]) -> T:
+        import concurrent.futures
+
+        hedge_delay = self.get_hedge_delay()
+        first = self._executor.submit(self._load_timed, load)
+        if hedge_delay is None:
+            return first.result()
+
+        try:
+            return first.result(timeout=hedge_delay)
+        except concurrent.futures.TimeoutError:
+            pass
+
+        _logger.info("no response within %.2fs (p%d) => hedged request", hedge_delay, self.HEDGE_PERCENTILE)
+        second = self._executor.submit(self._load_timed, load)
+        with self._lock:
+            self._hedged += 1
+
+        pending = {first, second}
+        error = None
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is second:
+                        with self._lock:
+                            self._hedges_won += 1
+                    return future.result()
+                error = future.exception()
+        raise error
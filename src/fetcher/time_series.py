@@ -1,6 +1,7 @@
 import copy
 import threading
-from collections import namedtuple
+from array import array
+from collections import deque, namedtuple
 from datetime import timedelta
 from typing import Optional
 
@@ -52,3 +53,107 @@ class MaxTimeSeries(TimeSeries):
                     max_value = tiva.value
 
             return max_value
+
+
+class RingMaxTimeSeries(TimeSeries):
+    """
+    Same as `MaxTimeSeries`, but the samples are stored in a ring buffer of two `array('d')` (POSIX timestamps and values)
+    instead of a list of namedtuples with datetime objects: 16 bytes per sample. The buffer grows (doubles) when full.
+    The max is cached and only rescanned, when the max sample drops out of the window.
+    """
+
+    INITIAL_CAPACITY = 64
+
+    def __init__(self, value_key, time_delta: timedelta):
+        super().__init__(value_key)
+
+        self._lock = threading.Lock()
+        self._time_delta = time_delta.total_seconds()
+        self._time_stamps = array('d', bytes(8 * self.INITIAL_CAPACITY))
+        self._values = array('d', bytes(8 * self.INITIAL_CAPACITY))
+        self._head = 0  # index of the oldest sample
+        self._count = 0
+        self._max = None  # type: Optional[float]
+
+    def __len__(self):
+        return self._count
+
+    def collect_and_deliver(self, value: Optional[float]):
+        with self._lock:
+            # timestamps (no monotonic clock) so that mocked or frozen times (tests, replay) still work
+            time_curr = TimeUtils.now().timestamp()
+            time_limit = time_curr - self._time_delta
+
+            capacity = len(self._values)
+            max_evicted = False
+            while self._count > 0 and self._time_stamps[self._head] < time_limit:
+                max_evicted = max_evicted or self._values[self._head] >= self._max
+                self._head = (self._head + 1) % capacity
+                self._count -= 1
+
+            if value is not None:
+                if self._count == capacity:
+                    self._grow()
+                    capacity = len(self._values)
+                index = (self._head + self._count) % capacity
+                self._time_stamps[index] = time_curr
+                self._values[index] = value
+                self._count += 1
+
+            if self._count == 0:
+                self._max = None
+            elif max_evicted or self._max is None:
+                self._max = self._scan_max()
+            elif value is not None and value > self._max:
+                self._max = value
+
+            return self._max
+
+    def _scan_max(self) -> float:
+        """Only needed if the max sample was evicted."""
+        capacity = len(self._values)
+        end = self._head + self._count
+        if end <= capacity:
+            return max(self._values[self._head:end])
+        return max(max(self._values[self._head:]), max(self._values[:end - capacity]))
+
+    def _grow(self):
+        """Unrolls the ring into a buffer of double capacity."""
+        capacity = len(self._values)
+        self._time_stamps = self._time_stamps[self._head:] + self._time_stamps[:self._head] + array('d', bytes(8 * capacity))
+        self._values = self._values[self._head:] + self._values[:self._head] + array('d', bytes(8 * capacity))
+        self._head = 0
+
+
+class RateTimeSeries(TimeSeries):
+    """
+    Delivers the increase of a counter (e.g. rain) per hour, averaged over `time_delta`. A decreasing counter
+    (reset) starts over; `None` as long as there are less than two samples within the window.
+    """
+
+    def __init__(self, value_key, time_delta: timedelta):
+        super().__init__(value_key)
+
+        self._lock = threading.Lock()
+        self._time_delta = time_delta.total_seconds()
+        self._samples = deque()  # (timestamp, counter)
+
+    def collect_and_deliver(self, value: Optional[float]):
+        with self._lock:
+            time_curr = TimeUtils.now().timestamp()
+            time_limit = time_curr - self._time_delta
+
+            while self._samples and self._samples[0][0] < time_limit:
+                self._samples.popleft()
+
+            if value is not None:
+                if self._samples and value < self._samples[-1][1]:
+                    self._samples.clear()  # counter reset
+                self._samples.append((time_curr, value))
+
+            if len(self._samples) < 2:
+                return None
+            (time_first, counter_first), (time_last, counter_last) = self._samples[0], self._samples[-1]
+            if time_last <= time_first:
+                return None
+            return round((counter_last - counter_first) * 3600 / (time_last - time_first), 2)
@@ -22,7 +22,7 @@ class TimeSeriesManager:
 
         with self._lock:
             chosen = self._items.get(key)
-            if chosen:
+            if chosen is not None:
                 if type(chosen) != type(blueprint):
                     raise RuntimeError("Wrong collector types!")
             else:
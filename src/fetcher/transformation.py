@@ -1,7 +1,8 @@
 import abc
 import datetime
 import logging
-from typing import Dict, Optional
+import math
+from typing import Dict, List, Optional, Tuple
 
 from src.utils.time_utils import TimeUtils
 
@@ -45,6 +46,13 @@ class FloatTransformation(SingleTransformation):
         return self.convert2float(raw_value)
 
 
+class ValueTransformation(SingleTransformation):
+    """Takes over already typed values (e.g. decoded from binary protocols)."""
+
+    def transform(self, raw_values: Dict[str, any]) -> any:
+        return raw_values.get(self._value_key)
+
+
 class StringTransformation(SingleTransformation):
 
     def __init__(self, value_key, trim=True):
@@ -148,22 +156,25 @@ class RelPressureTransformation(Transformation):
         Calculates the relative air pressure
         """
         t = raw_values.get(self._abs_pres_key)
-
         abs_press = self.convert2float(t)
-        rel_pres = None
 
-        if abs_press is not None:
-            t = raw_values.get(self._temp_key)
-            temp_station = self.convert2float(t)
+        t = raw_values.get(self._temp_key)
+        temp_station = self.convert2float(t) if abs_press is not None else None
 
-            if temp_station is not None:
-                temp_sea_level = 273.15 + temp_station + self.TEMP_GRADIENT * self._altitude  # temperature on sea level
+        return self.calculate(abs_press, temp_station, self._altitude)
 
-                # print("t_in=%d => t0=%.1f" % (temp, tx))
+    @classmethod
+    def calculate(cls, abs_press: Optional[float], temp_station: Optional[float], altitude: float) -> Optional[float]:
+        rel_pres = None
+
+        if abs_press is not None and temp_station is not None:
+            temp_sea_level = 273.15 + temp_station + cls.TEMP_GRADIENT * altitude  # temperature on sea level
+
+            # print("t_in=%d => t0=%.1f" % (temp, tx))
 
-                divisor = (1 - self.TEMP_GRADIENT * self._altitude / temp_sea_level)
-                rel_pres = abs_press / divisor ** (0.03416 / self.TEMP_GRADIENT)
-                rel_pres = round(rel_pres, 1)
+            divisor = (1 - cls.TEMP_GRADIENT * altitude / temp_sea_level)
+            rel_pres = abs_press / divisor ** (0.03416 / cls.TEMP_GRADIENT)
+            rel_pres = round(rel_pres, 1)
 
         return rel_pres
 
@@ -193,3 +204,141 @@ class GustTransformation(Transformation):
         else:
             speed = max(speed1, speed2)
         return speed
+
+
+class DerivedMetric(abc.ABC):
+    """
+    Calculates a value out of already transformed values (or other derived metrics). `calculate` gets the values of
+    `input_keys` as positional arguments (`None` if not available).
+    """
+
+    def __init__(self, result_key: str, input_keys: Tuple[str, ...]):
+        self.result_key = result_key
+        self.input_keys = input_keys
+
+    def __repr__(self) -> str:
+        return '{}({})'.format(self.__class__.__name__, self.result_key)
+
+    @abc.abstractmethod
+    def calculate(self, *inputs: Optional[float]) -> Optional[float]:
+        pass
+
+
+class DewPointMetric(DerivedMetric):
+    """Magnus formula (°C)"""
+
+    A = 17.62
+    B = 243.12
+
+    def __init__(self, result_key: str, temp_key: str, humi_key: str):
+        super().__init__(result_key, (temp_key, humi_key))
+
+    def calculate(self, temp: Optional[float], humi: Optional[float]) -> Optional[float]:
+        if temp is None or not humi:
+            return None
+        gamma = math.log(humi / 100) + self.A * temp / (self.B + temp)
+        return round(self.B * gamma / (self.A - gamma), 1)
+
+
+class HeatIndexMetric(DerivedMetric):
+    """Rothfusz regression (NWS), only defined for >= 26.7°C and >= 40% humidity."""
+
+    def __init__(self, result_key: str, temp_key: str, humi_key: str):
+        super().__init__(result_key, (temp_key, humi_key))
+
+    def calculate(self, temp: Optional[float], humi: Optional[float]) -> Optional[float]:
+        if temp is None or humi is None or temp < 26.7 or humi < 40:
+            return None
+        t = temp * 1.8 + 32  # °F
+        hi = (-42.379 + 2.04901523 * t + 10.14333127 * humi - 0.22475541 * t * humi - 6.83783e-3 * t * t -
+              5.481717e-2 * humi * humi + 1.22874e-3 * t * t * humi + 8.5282e-4 * t * humi * humi - 1.99e-6 * t * t * humi * humi)
+        return round((hi - 32) / 1.8, 1)
+
+
+class WindChillMetric(DerivedMetric):
+    """Environment Canada formula (km/h), only defined for <= 10°C and > 4.8 km/h."""
+
+    def __init__(self, result_key: str, temp_key: str, wind_speed_key: str):
+        super().__init__(result_key, (temp_key, wind_speed_key))
+
+    def calculate(self, temp: Optional[float], wind_speed: Optional[float]) -> Optional[float]:
+        if temp is None or wind_speed is None or temp > 10 or wind_speed <= 4.8:
+            return None
+        v = wind_speed ** 0.16
+        return round(13.12 + 0.6215 * temp - 11.37 * v + 0.3965 * temp * v, 1)
+
+
+class FeelsLikeMetric(DerivedMetric):
+    """Heat index or wind chill, if defined, otherwise the temperature."""
+
+    def __init__(self, result_key: str, temp_key: str, heat_index_key: str, wind_chill_key: str):
+        super().__init__(result_key, (temp_key, heat_index_key, wind_chill_key))
+
+    def calculate(self, temp: Optional[float], heat_index: Optional[float], wind_chill: Optional[float]) -> Optional[float]:
+        if heat_index is not None:
+            return heat_index
+        if wind_chill is not None:
+            return wind_chill
+        return temp
+
+
+class AbsoluteHumidityMetric(DerivedMetric):
+    """g/m³"""
+
+    def __init__(self, result_key: str, temp_key: str, humi_key: str):
+        super().__init__(result_key, (temp_key, humi_key))
+
+    def calculate(self, temp: Optional[float], humi: Optional[float]) -> Optional[float]:
+        if temp is None or humi is None:
+            return None
+        saturation_pressure = 6.112 * math.exp(17.67 * temp / (temp + 243.5))  # hPa
+        return round(saturation_pressure * humi * 2.1674 / (273.15 + temp), 1)
+
+
+class DerivedMetrics:
+    """
+    Stage after the transformation: the evaluation order (dependencies first) is resolved once in the constructor,
+    so `calculate` is a single pass over a flat list.
+    """
+
+    def __init__(self, metrics: List[DerivedMetric]):
+        self._metrics = self._sort_by_dependencies(metrics)
+        self._evaluation = [(metric.result_key, metric.calculate, metric.input_keys) for metric in self._metrics]
+
+    @property
+    def metrics(self) -> List[DerivedMetric]:
+        return list(self._metrics)
+
+    @classmethod
+    def _sort_by_dependencies(cls, metrics: List[DerivedMetric]) -> List[DerivedMetric]:
+        by_key = {metric.result_key: metric for metric in metrics}
+        ordered = []
+        visiting = set()
+
+        def visit(metric: DerivedMetric):
+            if metric in ordered:
+                return
+            if metric.result_key in visiting:
+                raise ValueError("cyclic dependency of derived metric '{}'!".format(metric.result_key))
+            visiting.add(metric.result_key)
+            for input_key in metric.input_keys:
+                dependency = by_key.get(input_key)
+                if dependency is not None:
+                    visit(dependency)
+            visiting.discard(metric.result_key)
+            ordered.append(metric)
+
+        for m in metrics:
+            visit(m)
+        return ordered
+
+    def calculate(self, values: Dict[str, any]):
+        """Adds the derived values to `values` (in place)."""
+        for result_key, calculate, input_keys in self._evaluation:
+            try:
+                value = calculate(*[values.get(key) for key in input_keys])
+            except (TypeError, ValueError, ArithmeticError) as ex:
+                _logger.error('cannot calculate derived metric %s! %s', result_key, ex)
+                value = None
+            if value is not None:
+                values[result_key] = value
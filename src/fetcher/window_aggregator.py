@@ -0,0 +1,85 @@
+import datetime
+import math
+from typing import Dict, Optional
+
+from src.utils.time_utils import TimeUtils
+
+
+class _Aggregate:
+
+    __slots__ = ("min", "max", "sum", "count", "last")
+
+    def __init__(self, value: float):
+        self.min = value
+        self.max = value
+        self.sum = value
+        self.count = 1
+        self.last = value
+
+    def add(self, value: float):
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.sum += value
+        self.count += 1
+        self.last = value
+
+    def to_dict(self) -> Dict[str, float]:
+        return {"min": self.min, "max": self.max, "mean": round(self.sum / self.count, 2), "last": self.last}
+
+
+class WindowAggregator:
+    """
+    Tumbling window aggregation (min/max/mean/last) of all numeric fetcher values. The windows are aligned to multiples of
+    `interval` (e.g. :00, :05, ... for 300s). A window is closed (and delivered) with the first sample of a later window.
+    """
+
+    def __init__(self, interval: float):
+        self._interval = interval
+        self._window_start = None  # type: Optional[float]
+        self._samples = 0
+        self._aggregates = {}  # type: Dict[str, _Aggregate]
+
+    @property
+    def interval(self) -> float:
+        return self._interval
+
+    def collect(self, fetched: datetime.datetime, values: Optional[Dict[str, any]]) -> Optional[Dict[str, any]]:
+        """Returns the aggregation of the former window, if `fetched` starts a new one. Failed fetches (no values) count too."""
+        window_start = math.floor(fetched.timestamp() / self._interval) * self._interval
+
+        closed = None
+        if self._window_start is not None and window_start != self._window_start:
+            closed = self._close()
+        self._window_start = window_start
+
+        if values:
+            self._samples += 1
+            aggregates = self._aggregates
+            for key, value in values.items():
+                if value is None or isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                aggregate = aggregates.get(key)
+                if aggregate is None:
+                    aggregates[key] = _Aggregate(value)
+                else:
+                    aggregate.add(value)
+
+        return closed
+
+    def _close(self) -> Optional[Dict[str, any]]:
+        samples, aggregates = self._samples, self._aggregates
+        self._samples = 0
+        self._aggregates = {}
+        if not samples:
+            return None
+
+        result = {
+            "start": TimeUtils.from_timestamp(self._window_start).isoformat(),
+            "end": TimeUtils.from_timestamp(self._window_start + self._interval).isoformat(),
+            "samples": samples,
+        }
+        for key in sorted(aggregates):
+            result[key] = aggregates[key].to_dict()
+        return result
@@ -0,0 +1,85 @@
+import bisect
+import datetime
+import math
+import os
+from collections import deque
+from typing import Dict, Optional
+
+from src.fetcher.fetcher_status import FetcherStatus
+
+
+class HealthMonitor:
+    """
+    Fetch statistics over the last `window` fetches, updated with each fetch (no log parsing): latency percentiles
+    (sorted window, bisect), error and timeout rates and the last successful fetch.
+    """
+
+    DEFAULT_WINDOW = 100  # fetches
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self._window = window
+
+        self._fetches = deque()  # (latency, status)
+        self._latencies = []  # sorted
+        self._errors = 0
+        self._timeouts = 0
+
+        self._count = 0
+        self._last_success = None  # type: Optional[datetime.datetime]
+
+    def add_fetch(self, fetched: datetime.datetime, latency: float, status: str):
+        if len(self._fetches) >= self._window:
+            old_latency, old_status = self._fetches.popleft()
+            del self._latencies[bisect.bisect_left(self._latencies, old_latency)]
+            self._count_status(old_status, -1)
+
+        self._fetches.append((latency, status))
+        bisect.insort(self._latencies, latency)
+        self._count_status(status, 1)
+
+        self._count += 1
+        if status == FetcherStatus.OK:
+            self._last_success = fetched
+
+    def _count_status(self, status: str, delta: int):
+        if status == FetcherStatus.TIMEOUT:
+            self._timeouts += delta
+        elif status != FetcherStatus.OK:
+            self._errors += delta
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Nearest rank."""
+        if not self._latencies:
+            return None
+        rank = max(1, math.ceil(len(self._latencies) * percent / 100))
+        return self._latencies[rank - 1]
+
+    def get_statistics(self) -> Dict[str, any]:
+        samples = len(self._fetches)
+        return {
+            "count": self._count,
+            "window": samples,
+            "errorRate": round(self._errors / samples, 3) if samples else None,
+            "timeoutRate": round(self._timeouts / samples, 3) if samples else None,
+            "lastSuccess": self._last_success,
+            "latency": {
+                "p50": self.percentile(50),
+                "p95": self.percentile(95),
+                "max": self._latencies[-1] if self._latencies else None,
+            },
+        }
+
+    @classmethod
+    def get_rss(cls) -> Optional[int]:
+        """Resident set size (bytes) of the process; peak RSS if /proc is not available."""
+        try:
+            with open("/proc/self/statm") as file:
+                return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            pass
+
+        try:
+            import resource
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        except (ImportError, OSError):
+            return None
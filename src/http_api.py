@@ -0,0 +1,146 @@
+import asyncio
+import datetime
+import logging
+import math
+import zlib
+from typing import Dict, Optional, Tuple
+
+from src.fetcher.fetcher_key import FetcherKey
+from src.fetcher.fetcher_status import FetcherStatus
+
+from src.utils.json_utils import JsonUtils
+from src.utils.time_utils import TimeUtils
+
+_logger = logging.getLogger(__name__)
+
+
+class HttpApi:
+    """
+    Minimal HTTP server (runs in the runner loop) serving the latest fetch result from memory, so local consumers
+    don't poll the station themselves: `GET /values` (all values) and `GET /values/<key>`. Responses carry an ETag
+    (=> 304 for `If-None-Match`) and `Cache-Control: max-age` up to the next scheduled fetch.
+    A failed fetch keeps the last good values; the status of the latest fetch is sent as `X-Fetch-Status` header.
+    """
+
+    DEFAULT_HOST = "127.0.0.1"
+    PATH = "/values"
+    STATUS_HEADER = "X-Fetch-Status"
+
+    MAX_REQUEST_BYTES = 8192
+    REQUEST_TIMEOUT = 5  # seconds
+
+    REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+    def __init__(self, port: int, host: str = DEFAULT_HOST):
+        self._host = host
+        self._port = port
+        self._server = None  # type: Optional[asyncio.AbstractServer]
+
+        self._values = None  # type: Optional[Dict[str, any]]
+        self._body = None  # type: Optional[bytes]
+        self._etag = None  # type: Optional[str]
+        self._next_fetch = None  # type: Optional[datetime.datetime]
+        self._fetch_status = None  # type: Optional[str]
+
+    @property
+    def port(self) -> int:
+        """The bound port (e.g. if configured as 0)."""
+        if self._server is not None and self._server.sockets:
+            return self._server.sockets[0].getsockname()[1]
+        return self._port
+
+    async def start(self):
+        if self._server is None:
+            self._server = await asyncio.start_server(self._handle_connection, self._host, self._port)
+            _logger.info("HTTP API listening on %s:%d", self._host, self.port)
+
+    def close(self):
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+
+    def update(self, values: Dict[str, any], next_fetch: datetime.datetime):
+        """Called once per fetch: the document is serialized here, not per request. Only successful fetches replace it."""
+        self._fetch_status = values.get(FetcherKey.STATUS) or FetcherStatus.ERROR
+        self._next_fetch = next_fetch
+        if self._fetch_status != FetcherStatus.OK:
+            return
+
+        self._values = values
+        self._body = JsonUtils.dumps(values).encode("utf-8")
+        self._etag = self.create_etag(self._body)
+
+    @classmethod
+    def create_etag(cls, body: bytes) -> str:
+        return f'"{zlib.crc32(body):08x}-{len(body):x}"'
+
+    def get_max_age(self) -> int:
+        if self._next_fetch is None:
+            return 0
+        return max(0, math.ceil((self._next_fetch - TimeUtils.now()).total_seconds()))
+
+    def respond(self, method: str, path: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        if method not in ("GET", "HEAD"):
+            return 405, {"Allow": "GET, HEAD"}, b""
+
+        path = path.split("?", 1)[0].rstrip("/")
+        if path == self.PATH:
+            body, etag = self._body, self._etag
+        elif path.startswith(self.PATH + "/") and self._values is not None:
+            key = path[len(self.PATH) + 1:]
+            if key not in self._values:
+                return 404, {}, b""
+            body = JsonUtils.dumps(self._values[key]).encode("utf-8")
+            etag = self.create_etag(body)
+        else:
+            return 404, {}, b""
+
+        if body is None:  # nothing fetched yet
+            return 404, {}, b""
+
+        response_headers = {
+            "Content-Type": "application/json",
+            "ETag": etag,
+            "Cache-Control": f"max-age={self.get_max_age()}",
+            self.STATUS_HEADER: self._fetch_status,
+        }
+        if headers.get("if-none-match") in (etag, "*"):
+            return 304, response_headers, b""
+        return 200, response_headers, body
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            try:
+                request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.REQUEST_TIMEOUT)
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError):
+                return
+            if len(request) > self.MAX_REQUEST_BYTES:
+                status, headers, body = 400, {}, b""
+                method = None
+            else:
+                lines = request.decode("latin-1").split("\r\n")
+                parts = lines[0].split(" ")
+                if len(parts) != 3:
+                    status, headers, body = 400, {}, b""
+                    method = None
+                else:
+                    method, path = parts[0], parts[1]
+                    request_headers = {}
+                    for line in lines[1:]:
+                        name, _, value = line.partition(":")
+                        if name:
+                            request_headers[name.strip().lower()] = value.strip()
+                    status, headers, body = self.respond(method, path, request_headers)
+
+            head = [f"HTTP/1.1 {status} {self.REASONS[status]}", f"Content-Length: {len(body)}", "Connection: close"]
+            head.extend(f"{name}: {value}" for name, value in headers.items())
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+            if method != "HEAD":
+                writer.write(body)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        except Exception as ex:
+            _logger.error("HTTP API request failed: %s", ex)
+        finally:
+            writer.close()
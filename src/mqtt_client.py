@@ -1,12 +1,14 @@
 import datetime
 import logging
 import threading
-from typing import Optional
-
-import paho.mqtt.client as mqtt
-from tzlocal import get_localzone
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Optional
 
 from src.mqtt_config import MqttConfKey
+from src.utils.time_utils import TimeUtils
+
+if TYPE_CHECKING:
+    import paho.mqtt.client as mqtt
 
 
 _logger = logging.getLogger(__name__)
@@ -27,6 +29,7 @@ class MqttClient:
     TIME_WAIT_FOR_CONNECTION = 10  # seconds
 
     def __init__(self, config):
+        import paho.mqtt.client as mqtt  # deferred (startup time)
 
         self._host = None
         self._port = None
@@ -35,7 +38,7 @@ class MqttClient:
         self._client = None
         self._is_connected = False
         self._connection_error_info = None  # type: Optional[str]
-        self._subscribed = False
+        self._subscriptions = {}  # type: Dict[str, Callable[[str, str], None]]
         self._shutdown = False
 
         self._lock = threading.Lock()
@@ -48,6 +51,17 @@ class MqttClient:
         self._retain = config.get(MqttConfKey.RETAIN, True)
 
         protocol = config.get(MqttConfKey.PROTOCOL, self.DEFAULT_PROTOCOL)
+        self._is_v5 = protocol == mqtt.MQTTv5
+        self._message_expiry = config.get(MqttConfKey.MESSAGE_EXPIRY) if self._is_v5 else None
+        self._use_topic_aliases = bool(config.get(MqttConfKey.TOPIC_ALIASES)) and self._is_v5
+        if self._use_topic_aliases and self._qos != 0:
+            # QoS 1/2 messages may be resent on a new connection, where the alias is unknown
+            _logger.warning("MQTT topic aliases need QoS 0 => not used")
+            self._use_topic_aliases = False
+        if not self._is_v5 and (config.get(MqttConfKey.MESSAGE_EXPIRY) or config.get(MqttConfKey.TOPIC_ALIASES)):
+            _logger.warning("MQTT message expiry and topic aliases need protocol 5 => not used")
+        self._topic_alias_maximum = 0  # announced by the broker (per connection)
+        self._topic_aliases = {}  # type: Dict[str, int]
         client_id = config.get(MqttConfKey.CLIENT_ID)
         ssl_ca_certs = config.get(MqttConfKey.SSL_CA_CERTS)
         ssl_certfile = config.get(MqttConfKey.SSL_CERTFILE)
@@ -82,11 +96,25 @@ class MqttClient:
         with self._lock:
             return self._is_connected
 
+    @property
+    def supports_properties(self) -> bool:
+        """MQTT v5 (user properties)."""
+        return self._is_v5
+
     def connect(self):
         self._client.connect_async(self._host, port=self._port, keepalive=self._keepalive)
         self._client.loop_start()
         _logger.debug("%s is connecting...", self.__class__.__name__)
 
+    def wait_for_connection(self, timeout: float):
+        """Blocking wait (for non asyncio usage)."""
+        time_limit = time.monotonic() + timeout
+        while not self.is_connected():
+            self.ensure_connection_error()
+            if time.monotonic() > time_limit:
+                raise MqttException(f"couldn't connect to MQTT (within {timeout}s)!")
+            time.sleep(0.1)
+
     def close(self):
         self._shutdown = True
         if self._client is not None:
@@ -101,14 +129,17 @@ class MqttClient:
         Check for rarely unexpected disconnects, but when happens, it's not clear how to heal. At least the loop has to be restarted.
         Best to restart the whole app. Recognise a stopped service in system log.
         """
+        self.ensure_connection_error()
+
+        if not self.is_connected():
+            raise MqttException("MQTT is not connected!")
+
+    def ensure_connection_error(self):
         with self._lock:
-            is_connected = self._is_connected
             connection_error_info = self._connection_error_info
 
         if connection_error_info:
             raise MqttException(connection_error_info)  # leads to exit => restarted by systemd
-        if not is_connected:
-            raise MqttException("MQTT is not connected!")
 
     def set_last_will(self, topic: str, last_will: str):
         if self.is_connected():
@@ -121,41 +152,105 @@ class MqttClient:
             retain=self._retain
         )
 
-    def publish(self, topic: str, payload: str):
+    def subscribe(self, topic: str, callback: Callable[[str, str], None]):
+        """
+        Commands only (retained messages are ignored). The callback `(topic, payload)` is called in the MQTT thread.
+        Subscriptions are renewed with each (re)connect.
+        """
+        with self._lock:
+            self._subscriptions[topic] = callback
+            is_connected = self._is_connected
+        if is_connected:
+            self._client.subscribe(topic, qos=self._qos)
+        _logger.debug("subscribed to '%s'", topic)
+
+    def unsubscribe(self, topic: str):
+        with self._lock:
+            callback = self._subscriptions.pop(topic, None)
+            is_connected = self._is_connected
+        if callback is not None and is_connected:
+            self._client.unsubscribe(topic)
+
+    def get_queue_depth(self) -> int:
+        """Messages (QoS 1/2) not yet acknowledged by the broker."""
+        client = self._client
+        return len(getattr(client, "_out_messages", ())) if client is not None else 0
+
+    def publish(self, topic: str, payload: str, retain: Optional[bool] = None, user_properties: Optional[Dict[str, str]] = None):
         if self._shutdown:
             return
 
+        publish_topic, properties = self._prepare_publish(topic, user_properties) if self._is_v5 else (topic, None)
+
         result = self._client.publish(
-            topic=topic,
+            topic=publish_topic,
             payload=payload,
             qos=self._qos,
-            retain=self._retain
+            retain=self._retain if retain is None else retain,
+            properties=properties
         )
 
-        _logger.debug("sent - topic: '%s' | payload: '%s'", topic, payload)
+        if _logger.isEnabledFor(logging.DEBUG):  # hot path: full payloads
+            _logger.debug("sent - topic: '%s' | payload: '%s'", topic, payload)
 
         return result
 
-    def _on_connect(self, _mqtt_client, _userdata, _flags, rc):
-        """MQTT callback is called when client connects to MQTT server."""
+    def _prepare_publish(self, topic: str, user_properties: Optional[Dict[str, str]]):
+        """MQTT v5 publish properties; a topic is replaced by its alias (empty topic) after the first message."""
+        from paho.mqtt.packettypes import PacketTypes
+        from paho.mqtt.properties import Properties
+
+        properties = Properties(PacketTypes.PUBLISH)
+        is_empty = True
+
+        if self._message_expiry:
+            properties.MessageExpiryInterval = self._message_expiry
+            is_empty = False
+        if user_properties:
+            properties.UserProperty = [(str(key), str(value)) for key, value in user_properties.items()]
+            is_empty = False
+
+        if self._use_topic_aliases:
+            alias = None
+            with self._lock:
+                known_alias = self._topic_aliases.get(topic)
+                if known_alias is not None:
+                    alias = known_alias
+                    topic = ""
+                elif len(self._topic_aliases) < self._topic_alias_maximum:
+                    alias = self._topic_aliases[topic] = len(self._topic_aliases) + 1
+            if alias is not None:
+                properties.TopicAlias = alias
+                is_empty = False
+
+        return topic, None if is_empty else properties
+
+    def _on_connect(self, _mqtt_client, _userdata, _flags, rc, properties=None):
+        """MQTT callback is called when client connects to MQTT server (`properties`: MQTT v5 only)."""
         class_name = self.__class__.__name__
         if rc == 0:
             with self._lock:
                 self._is_connected = True
+                topics = list(self._subscriptions)
+                self._topic_aliases = {}  # aliases are valid per connection
+                self._topic_alias_maximum = getattr(properties, "TopicAliasMaximum", None) or 0
             _logger.debug("%s was connected.", class_name)
+            for topic in topics:
+                self._client.subscribe(topic, qos=self._qos)
         else:
-            connection_error_info = f"{class_name} connection failed (#{rc}: {mqtt.error_string(rc)})!"
+            reason = str(rc) if self._is_v5 else self._error_string(rc)
+            connection_error_info = f"{class_name} connection failed (#{rc}: {reason})!"
             _logger.error(connection_error_info)
             with self._lock:
                 self._is_connected = False
                 self._connection_error_info = connection_error_info
 
-    def _on_disconnect(self, _mqtt_client, _userdata, rc):
+    def _on_disconnect(self, _mqtt_client, _userdata, rc, _properties=None):
         """MQTT callback for when the client disconnects from the MQTT server."""
         class_name = self.__class__.__name__
         connection_error_info = None
         if rc != 0:
-            connection_error_info = f"{class_name} connection was lost (#{rc}: {mqtt.error_string(rc)}) => abort => restart!"
+            connection_error_info = f"{class_name} connection was lost (#{rc}: {self._error_string(rc)}) => abort => restart!"
 
         with self._lock:
             self._is_connected = False
@@ -167,12 +262,32 @@ class MqttClient:
         else:
             _logger.error("%s was unexpectedly disconnected: %s", class_name, connection_error_info or "???")
 
-    def _on_message(self, mqtt_client, userdata, mqtt_message: mqtt.MQTTMessage):
+    def _on_message(self, mqtt_client, userdata, mqtt_message: 'mqtt.MQTTMessage'):
         """MQTT callback when a message is received from MQTT server"""
+        if mqtt_message.retain:
+            _logger.warning("retained message on '%s' ignored (no commands out of the past)!", mqtt_message.topic)
+            return
+
+        with self._lock:
+            callback = self._subscriptions.get(mqtt_message.topic)
+        if callback is None:
+            return
+
+        try:
+            payload = mqtt_message.payload.decode("utf-8", errors="replace")
+            callback(mqtt_message.topic, payload)
+        except Exception as ex:
+            _logger.exception("handling message on '%s' failed! %s", mqtt_message.topic, ex)
 
     def _on_publish(self, mqtt_client, userdata, mid):
         """MQTT callback is invoked when message was successfully sent to the MQTT server."""
 
+    @classmethod
+    def _error_string(cls, rc: int) -> str:
+        import paho.mqtt.client as mqtt
+
+        return mqtt.error_string(rc)
+
     @classmethod
     def _now(cls) -> datetime:
-        return datetime.datetime.now(tz=get_localzone())
+        return datetime.datetime.now(tz=TimeUtils.get_localzone())
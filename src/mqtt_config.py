@@ -10,6 +10,10 @@ class MqttConfKey:
     QOS = "qos"
     RETAIN = "retain"
 
+    # MQTT v5
+    MESSAGE_EXPIRY = "message_expiry"
+    TOPIC_ALIASES = "topic_aliases"
+
     SSL_CA_CERTS = "ssl_ca_certs"
     SSL_CERTFILE = "ssl_certfile"
     SSL_INSECURE = "ssl_insecure"
@@ -32,6 +36,14 @@ MQTT_JSONSCHEMA = {
         MqttConfKey.PASSWORD: {"type": "string"},
         MqttConfKey.QOS: {"type": "integer", "enum": [0, 1, 2]},
         MqttConfKey.RETAIN: {"type": "boolean", "description": "Default: True"},
+        MqttConfKey.MESSAGE_EXPIRY: {
+            "type": "integer", "minimum": 1,
+            "description": "MQTT v5: the broker discards messages (incl. retained ones) older than this (seconds)."
+        },
+        MqttConfKey.TOPIC_ALIASES: {
+            "type": "boolean",
+            "description": "MQTT v5: topics are sent once per connection, then replaced by a numeric alias (needs QoS 0)."
+        },
 
     },
     "additionalProperties": False,
@@ -0,0 +1,209 @@
+import base64
+import datetime
+import gzip
+import io
+import json
+import logging
+import os
+import tarfile
+import time
+from collections import namedtuple
+from typing import BinaryIO, Iterable, Iterator, Optional, TextIO
+
+from src.fetcher.fetcher_factory import FetcherFactory
+from src.fetcher.fetcher_key import FetcherKey
+from src.fetcher.fetcher_status import FetcherStatus
+from src.runner import Runner
+from src.runner_config import RunnerConfKey
+from src.utils.json_utils import JsonUtils
+from src.utils.time_utils import TimeUtils
+
+_logger = logging.getLogger(__name__)
+
+try:
+    import zstandard  # optional dependency
+except ImportError:
+    zstandard = None
+
+
+class _ClosingGzipFile(gzip.GzipFile):
+    """Closes the wrapped `fileobj` too (`GzipFile` leaves it open)."""
+
+    def close(self):
+        fileobj = self.fileobj
+        try:
+            super().close()
+        finally:
+            if fileobj is not None:
+                fileobj.close()
+
+
+# a capture contains either a raw `page` (as delivered by the station) or already extracted raw `values` (keyed by result key)
+Capture = namedtuple('Capture', ['fetched', 'page', 'values'])
+ReplayResult = namedtuple('ReplayResult', ['fetched', 'values'])
+
+
+class ReplayException(Exception):
+    pass
+
+
+class ReplaySource:
+    """
+    Streams archived captures (one at a time, memory stays bounded):
+    - a directory of page files (e.g. `livedata.htm` captures, the file modification time is used as fetch time)
+    - a tar archive of page files (member modification time is used as fetch time)
+    - JSONL files (optionally gzip/zstd compressed, like written by `CaptureRecorder`), one record per line:
+      `{"fetched": <iso time>, "page": ...}` or `{"fetched": <iso time>, "values": {...}}`
+    Directories and tar archives may contain JSONL files too.
+    """
+
+    JSONL_SUFFIXES = (".jsonl", ".jsonl.gz", ".jsonl.zst")
+
+    @classmethod
+    def iter_captures(cls, path: str) -> Iterator[Capture]:
+        if os.path.isdir(path):
+            yield from cls._iter_directory(path)
+        elif cls.is_jsonl(path):
+            with cls.open_jsonl(path) as stream:
+                yield from cls.parse_jsonl(stream)
+        elif os.path.isfile(path) and tarfile.is_tarfile(path):
+            yield from cls._iter_tar(path)
+        elif os.path.isfile(path):
+            yield cls._load_page_file(path)
+        else:
+            raise ReplayException(f"replay source ({path}) does not exist!")
+
+    @classmethod
+    def is_jsonl(cls, path: str) -> bool:
+        return path.endswith(cls.JSONL_SUFFIXES)
+
+    @classmethod
+    def open_jsonl(cls, path: str) -> TextIO:
+        return cls.decode_jsonl(path, open(path, "rb"))
+
+    @classmethod
+    def decode_jsonl(cls, name: str, file: BinaryIO) -> TextIO:
+        """Text stream of a (gzip/zstd compressed, see suffix of `name`) JSONL file; closing it closes `file` too."""
+        if name.endswith(".gz"):
+            file = _ClosingGzipFile(fileobj=file)
+        elif name.endswith(".zst"):
+            if zstandard is None:
+                file.close()
+                raise ReplayException(f"package 'zstandard' is needed to read {name}!")
+            file = zstandard.ZstdDecompressor().stream_reader(file, closefd=True)
+        return io.TextIOWrapper(file, encoding="utf-8")
+
+    @classmethod
+    def parse_jsonl(cls, lines: Iterable[str]) -> Iterator[Capture]:
+        for line_number, line in enumerate(lines, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+                fetched = datetime.datetime.fromisoformat(record["fetched"])
+                if fetched.tzinfo is None:
+                    fetched = fetched.astimezone()
+                page = record.get("page")
+                if page is None and "pageBase64" in record:
+                    page = base64.b64decode(record["pageBase64"])  # binary protocols
+                values = record.get("values")
+                if page is None and values is None:
+                    raise KeyError("page|values")
+            except (ValueError, KeyError, TypeError) as ex:
+                _logger.error("skip invalid replay record (line %d): %s", line_number, ex)
+                continue
+
+            yield Capture(fetched, page, values)
+
+    @classmethod
+    def _iter_directory(cls, path: str) -> Iterator[Capture]:
+        for dir_path, dir_names, file_names in os.walk(path):
+            dir_names.sort()
+            for file_name in sorted(file_names):
+                file_path = os.path.join(dir_path, file_name)
+                if cls.is_jsonl(file_path):
+                    with cls.open_jsonl(file_path) as stream:
+                        yield from cls.parse_jsonl(stream)
+                else:
+                    yield cls._load_page_file(file_path)
+
+    @classmethod
+    def _load_page_file(cls, path: str) -> Capture:
+        with open(path, "rb") as file:
+            page = file.read()
+        fetched = TimeUtils.from_timestamp(os.path.getmtime(path))
+        return Capture(fetched, page, None)
+
+    @classmethod
+    def _iter_tar(cls, path: str) -> Iterator[Capture]:
+        with tarfile.open(path, mode="r|*") as tar:  # stream mode, members are not indexed in memory
+            for member in tar:
+                if not member.isfile():
+                    continue
+                file = tar.extractfile(member)
+                if cls.is_jsonl(member.name):
+                    with cls.decode_jsonl(member.name, file) as stream:
+                        yield from cls.parse_jsonl(stream)
+                else:
+                    with file:
+                        yield Capture(TimeUtils.from_timestamp(member.mtime), file.read(), None)
+
+
+class ReplayPipeline:
+    """Runs archived captures through the regular `FetcherJob` extraction, transformation and time series logic."""
+
+    def __init__(self, fetcher_factory: FetcherFactory):
+        self._fetcher_factory = fetcher_factory
+
+    def process(self, captures: Iterable[Capture]) -> Iterator[ReplayResult]:
+        for capture in captures:
+            # the capture time becomes "now", so outdated checks and time series behave like at fetch time
+            with TimeUtils.frozen(capture.fetched):
+                fetcher = self._fetcher_factory.create_fetcher_job()
+                try:
+                    if capture.page is not None:
+                        values = fetcher.process_page(capture.page)
+                    else:
+                        values = fetcher.process_raw_values(capture.values)
+                except Exception as ex:
+                    _logger.error("cannot process capture (%s): %s", capture.fetched.isoformat(), ex)
+                    values = {FetcherKey.STATUS: FetcherStatus.ERROR}
+
+            yield ReplayResult(capture.fetched, values)
+
+    @classmethod
+    def write_results(cls, results: Iterable[ReplayResult], stream: TextIO) -> int:
+        count = 0
+        for result in results:
+            stream.write(JsonUtils.dumps({"fetched": result.fetched, "values": result.values}))
+            stream.write("\n")
+            count += 1
+        return count
+
+    @classmethod
+    def publish_results(cls, results: Iterable[ReplayResult], mqtt_client, runner_config, speed: Optional[float] = None) -> int:
+        """
+        Publishes the results like the `Runner` does.
+
+        `speed` is the acceleration factor relative to the original fetch intervals (e.g. 60 => one hour of data in one minute);
+        `None` or 0 publishes as fast as possible.
+        """
+        inside_topic = runner_config.get(RunnerConfKey.MQTT_INSIDE_TOPIC)
+        outside_topic = runner_config.get(RunnerConfKey.MQTT_OUTSIDE_TOPIC)
+
+        count = 0
+        last_fetched = None
+        for result in results:
+            if speed and last_fetched is not None:
+                delay = (result.fetched - last_fetched).total_seconds() / speed
+                if delay > 0:
+                    time.sleep(delay)
+            last_fetched = result.fetched
+
+            messages = Runner.splitt_messages(result.values, inside_topic=inside_topic, outside_topic=outside_topic)
+            for message in messages:
+                mqtt_client.publish(topic=message.topic, payload=message.payload)
+            count += 1
+
+        return count
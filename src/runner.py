@@ -3,50 +3,71 @@ import datetime
 import logging
 import signal
 import threading
+import time
 from asyncio import Task
 from collections import namedtuple
 from typing import Optional, List, Dict
 
+from src.app_logging import AppLogging
+from src.config_reloader import ConfigReloader
 from src.fetcher.fetcher_factory import FetcherFactory
 from src.fetcher.fetcher_key import FetcherKey
 from src.fetcher.fetcher_status import FetcherStatus
-from src.runner_config import RunnerConfKey
+from src.fetcher.window_aggregator import WindowAggregator
+from src.health_monitor import HealthMonitor
+from src.http_api import HttpApi
+from src.runner_config import AggregationConfKey, RunnerConfKey
+from src.sink.sink_dispatcher import SinkDispatcher
+from src.sink.sink_factory import SinkFactory
 from src.utils.json_utils import JsonUtils
+from src.utils.profiler import Profiler
+from src.utils.startup_timer import StartupTimer
 from src.utils.time_utils import TimeUtils
 
 _logger = logging.getLogger(__name__)
 
 
-Message = namedtuple('Message', ['topic', 'payload'])  # status: FetcherStatus, values: Dict[str, any]
+Message = namedtuple('Message', ['topic', 'payload', 'timestamp'])  # status: FetcherStatus, values: Dict[str, any]
+Aggregation = namedtuple('Aggregation', ['aggregator', 'topic'])
+
+
+class ControlCommand:
+    PROFILE = "profile"
+    REFRESH = "refresh"
 
 
 class Runner:
 
     DEFAULT_REFRESH_TIME = 60
+    DEFAULT_REFRESH_MIN_INTERVAL = 5
+    DEFAULT_HEALTH_INTERVAL = 300
 
     TIME_LIMIT_MQTT_CONNECTION = 10  # seconds
 
-    def __init__(self, runner_config, fetcher_factory: FetcherFactory, mqtt_client):
+    def __init__(self, runner_config, fetcher_factory: FetcherFactory, mqtt_client,
+                 sink_dispatcher: Optional[SinkDispatcher] = None, config_reloader: Optional[ConfigReloader] = None):
 
         self._lock = threading.Lock()
 
         self._fetcher = None
         self._fetcher_factory = fetcher_factory
+        self._config_reloader = config_reloader
 
-        self._refresh_time = runner_config.get(RunnerConfKey.REFRESH_TIME, self.DEFAULT_REFRESH_TIME)
-        default_resilience_time = min(self._refresh_time * 2.2, 300)
-        self._resilience_time = runner_config.get(RunnerConfKey.RESILIENCE_TIME, default_resilience_time)
-        default_fetch_timeout = max(self._refresh_time / 2, 30)
-        self._fetch_timeout = runner_config.get(RunnerConfKey.FETCH_TIMEOUT, default_fetch_timeout)
-
-        self._payload_mqtt_last_will = runner_config.get(RunnerConfKey.MQTT_LAST_WILL)
-        self._payload_mqtt_inside_topic = runner_config.get(RunnerConfKey.MQTT_INSIDE_TOPIC)
-        self._payload_mqtt_outside_topic = runner_config.get(RunnerConfKey.MQTT_OUTSIDE_TOPIC)
+        self._aggregations_config = None
+        self._aggregators = []  # type: List[Aggregation]
+        self._profiler = Profiler()
+        self._health_monitor = HealthMonitor()
+        self._apply_runner_config(runner_config)
 
         self._next_fetch_trigger = TimeUtils.now()
+        self._next_health_trigger = TimeUtils.now() + datetime.timedelta(seconds=self._health_interval)
         # self._resilience_reference_time = TimeUtils.now()  # in combination with `self._resilience_time`
 
         self._mqtt_client = mqtt_client
+        self._sink_dispatcher = sink_dispatcher
+
+        if self._timestamp_property and not self._mqtt_client.supports_properties:
+            _logger.warning("'%s' needs MQTT protocol 5 => the timestamp stays in the payload", RunnerConfKey.MQTT_TIMESTAMP_PROPERTY)
 
         if self._payload_mqtt_last_will:
             if self._payload_mqtt_inside_topic:
@@ -54,26 +75,162 @@ class Runner:
             if self._payload_mqtt_outside_topic and self._payload_mqtt_outside_topic != self._payload_mqtt_inside_topic:
                 self._mqtt_client.set_last_will(self._payload_mqtt_outside_topic, self._payload_mqtt_last_will)
 
+        self._http_config = self._get_http_config(runner_config)
+        self._http_api = HttpApi(*self._http_config) if self._http_config[0] is not None else None  # type: Optional[HttpApi]
+
+        self._mqtt_control_topic = None  # type: Optional[str]
+        self._subscribe_control_topic(runner_config.get(RunnerConfKey.MQTT_CONTROL_TOPIC))
+
         self._mqtt_client.connect()
 
-        self._loop = asyncio.get_event_loop()
+        if threading.current_thread() is threading.main_thread():
+            self._loop = asyncio.get_event_loop()
+        else:
+            self._loop = asyncio.new_event_loop()  # several runners may run in threads (shards)
+            asyncio.set_event_loop(self._loop)
         self._periodic_task = None  # type: Optional[Task]
+        self._stop_requested = False
         self._fetcher_task = None  # type: Optional[Task]
         self._fetcher_started = None  # type: Optional[datetime.datetime]
+        self._last_fetcher_started = None  # type: Optional[datetime.datetime]
+        self._refresh_requested = False
 
         if threading.current_thread() is threading.main_thread():
             # integration tests run the service in a thread...
             signal.signal(signal.SIGINT, self._shutdown_signaled)
             signal.signal(signal.SIGTERM, self._shutdown_signaled)
+            if self._config_reloader is not None:
+                signal.signal(signal.SIGHUP, self._reload_signaled)
+            signal.signal(signal.SIGUSR1, self._profile_signaled)
+
+    def _apply_runner_config(self, runner_config):
+        self._refresh_time = runner_config.get(RunnerConfKey.REFRESH_TIME, self.DEFAULT_REFRESH_TIME)
+        self._refresh_min_interval = runner_config.get(RunnerConfKey.REFRESH_MIN_INTERVAL, self.DEFAULT_REFRESH_MIN_INTERVAL)
+        default_resilience_time = min(self._refresh_time * 2.2, 300)
+        self._resilience_time = runner_config.get(RunnerConfKey.RESILIENCE_TIME, default_resilience_time)
+        default_fetch_timeout = max(self._refresh_time / 2, 30)
+        self._fetch_timeout = runner_config.get(RunnerConfKey.FETCH_TIMEOUT, default_fetch_timeout)
+
+        self._payload_mqtt_last_will = runner_config.get(RunnerConfKey.MQTT_LAST_WILL)
+        self._payload_mqtt_inside_topic = runner_config.get(RunnerConfKey.MQTT_INSIDE_TOPIC)
+        self._payload_mqtt_outside_topic = runner_config.get(RunnerConfKey.MQTT_OUTSIDE_TOPIC)
+        self._timestamp_property = runner_config.get(RunnerConfKey.MQTT_TIMESTAMP_PROPERTY, False)
+
+        self._mqtt_health_topic = runner_config.get(RunnerConfKey.MQTT_HEALTH_TOPIC)
+        self._health_interval = runner_config.get(RunnerConfKey.HEALTH_INTERVAL, self.DEFAULT_HEALTH_INTERVAL)
+
+        aggregations_config = runner_config.get(RunnerConfKey.AGGREGATIONS) or []
+        if aggregations_config != self._aggregations_config:  # unchanged aggregations keep their open windows
+            self._aggregations_config = aggregations_config
+            self._aggregators = [
+                Aggregation(WindowAggregator(c[AggregationConfKey.INTERVAL]), c[AggregationConfKey.MQTT_TOPIC]) for c in aggregations_config
+            ]
+
+        if self._config_reloader is not None:
+            self._config_reloader.set_watch_interval(runner_config.get(RunnerConfKey.CONFIG_WATCH_INTERVAL, 0))
+
+        self._profiler.set_options(runner_config.get(RunnerConfKey.PROFILE_DIR),
+                                   runner_config.get(RunnerConfKey.PROFILE_DURATION, Profiler.DEFAULT_DURATION))
+
+    @classmethod
+    def _get_http_config(cls, runner_config):
+        return runner_config.get(RunnerConfKey.HTTP_PORT), runner_config.get(RunnerConfKey.HTTP_HOST, HttpApi.DEFAULT_HOST)
+
+    def _subscribe_control_topic(self, topic: Optional[str]):
+        if topic == self._mqtt_control_topic:
+            return
+        if self._mqtt_control_topic:
+            self._mqtt_client.unsubscribe(self._mqtt_control_topic)
+        self._mqtt_control_topic = topic
+        if topic:
+            self._mqtt_client.subscribe(topic, self._on_control_message)
+
+    def _on_control_message(self, _topic: str, payload: str):
+        """Called in the MQTT thread."""
+        command, _, argument = payload.strip().partition(" ")
+        command = command.lower()
+        _logger.info("control command '%s' received", payload.strip())
+
+        if command == ControlCommand.REFRESH:
+            with self._lock:
+                self._refresh_requested = True  # handled by the loop (coalesced)
+        elif command == ControlCommand.PROFILE:
+            try:
+                duration = float(argument) if argument.strip() else None
+            except ValueError:
+                _logger.warning("invalid profiling duration '%s' (seconds expected)!", argument)
+                return
+            self._profiler.request(duration)
+        else:
+            _logger.warning("unknown control command '%s'!", command)
+
+    def _profile_signaled(self, sig, _frame):
+        _logger.info("profiling signaled (%s)", sig)
+        self._profiler.request()
+
+    def _reload_signaled(self, sig, _frame):
+        _logger.info("config reload signaled (%s)", sig)
+        self._config_reloader.request_reload()
+
+    def _reload_config(self):
+        """Applies a changed config file; connections, time series and pending fetches are kept."""
+        config_change = self._config_reloader.poll() if self._config_reloader is not None else None
+        if config_change is None:
+            return
+
+        app_config = config_change.app_config
+        changed_sections = config_change.changed_sections
+
+        if "runner" in changed_sections:
+            last_will_keys = [RunnerConfKey.MQTT_LAST_WILL, RunnerConfKey.MQTT_INSIDE_TOPIC, RunnerConfKey.MQTT_OUTSIDE_TOPIC]
+            last_will_before = [self._payload_mqtt_last_will, self._payload_mqtt_inside_topic, self._payload_mqtt_outside_topic]
+
+            self._apply_runner_config(app_config.get_runner_config())
+            self._subscribe_control_topic(app_config.get_runner_config().get(RunnerConfKey.MQTT_CONTROL_TOPIC))
+
+            last_will_after = [app_config.get_runner_config().get(key) for key in last_will_keys]
+            if self._payload_mqtt_last_will and last_will_before != last_will_after:
+                _logger.warning("changed MQTT topics/last will: the registered last will changes only with a restart!")
+
+            if self._get_http_config(app_config.get_runner_config()) != self._http_config:
+                _logger.warning("changes of the HTTP API need a restart!")
+
+            # a shorter refresh time becomes active immediately
+            next_fetch_trigger = TimeUtils.now() + datetime.timedelta(seconds=self._refresh_time)
+            self._next_fetch_trigger = min(self._next_fetch_trigger, next_fetch_trigger)
+
+        if "fetcher" in changed_sections:
+            self._fetcher_factory.update_config(app_config.get_fetcher_config())
+
+        if "sinks" in changed_sections:
+            old_dispatcher = self._sink_dispatcher
+            self._sink_dispatcher = SinkFactory.create_dispatcher(app_config.get_sinks_config())
+            if old_dispatcher is not None:
+                # draining the queues of slow sinks (up to CLOSE_TIMEOUT each) must not stall the loop
+                self._loop.run_in_executor(None, old_dispatcher.close)
+
+        for section in ["mqtt", "logging"]:
+            if section in changed_sections:
+                _logger.warning("changes of config section '%s' need a restart!", section)
 
     def _shutdown_signaled(self, sig, _frame):
         _logger.info("shutdown signaled (%s)", sig)
         if self._periodic_task:
             self._periodic_task.cancel()
 
+    def stop(self):
+        """Thread safe shutdown trigger."""
+        with self._lock:
+            self._stop_requested = True
+            if self._periodic_task:
+                self._loop.call_soon_threadsafe(self._periodic_task.cancel)
+
     def run(self):
         """endless loop"""
-        self._periodic_task = self._loop.create_task(self._periodic())
+        with self._lock:
+            if self._stop_requested:
+                return
+            self._periodic_task = self._loop.create_task(self._periodic())
 
         try:
             self._loop.run_until_complete(self._periodic_task)
@@ -96,10 +253,18 @@ class Runner:
             await asyncio.sleep(0.1)
 
     async def _periodic(self):
+        self._fetcher_factory.warm_up()  # the MQTT client connects meanwhile in its own thread
+        if self._http_api is not None:
+            await self._http_api.start()
         await self._wait_for_mqtt_connection_timeout(self.TIME_LIMIT_MQTT_CONNECTION)
+        StartupTimer.mark("mqtt connected")
 
         while True:
+            self._profiler.poll()
             self._handle_fetch_result()
+            self._publish_health()
+            self._reload_config()
+            self._handle_refresh_request()
 
             if TimeUtils.now() >= self._next_fetch_trigger:
                 self._start_fetcher_task()
@@ -108,6 +273,23 @@ class Runner:
 
             await asyncio.sleep(0.1)
 
+    def _handle_refresh_request(self):
+        """Out-of-schedule fetch: coalesced with a running fetch, not earlier than `refresh_min_interval` after the last one."""
+        with self._lock:
+            if not self._refresh_requested:
+                return
+            self._refresh_requested = False
+
+        if self._fetcher_task:
+            _logger.debug("refresh request coalesced with the running fetch")
+            return
+
+        refresh_trigger = TimeUtils.now()
+        if self._last_fetcher_started is not None:
+            refresh_trigger = max(refresh_trigger, self._last_fetcher_started + datetime.timedelta(seconds=self._refresh_min_interval))
+        if refresh_trigger < self._next_fetch_trigger:
+            self._next_fetch_trigger = refresh_trigger
+
     def _start_fetcher_task(self):
         if self._fetcher_task:
             now = TimeUtils.now()
@@ -120,42 +302,102 @@ class Runner:
 
         self._fetcher_task = self._loop.create_task(self._fetch_data_timeout())  # type: Task
         self._fetcher_started = TimeUtils.now()
+        self._last_fetcher_started = self._fetcher_started
 
     async def _fetch_data_timeout(self, timeout=None):
         timeout = timeout or self._fetch_timeout
+        started = time.monotonic()
         try:
-            return await asyncio.wait_for(self._fetch_data(), timeout or self._fetch_timeout)
+            result = await asyncio.wait_for(self._fetch_data(), timeout or self._fetch_timeout)
         except asyncio.exceptions.TimeoutError:
             _logger.error("timeout (%.1fs) fetching data", timeout)
-            return {FetcherKey.STATUS: FetcherStatus.TIMEOUT}
+            result = {FetcherKey.STATUS: FetcherStatus.TIMEOUT}
+
+        status = (result or {}).get(FetcherKey.STATUS) or FetcherStatus.ERROR
+        self._health_monitor.add_fetch(TimeUtils.now(), time.monotonic() - started, status)
+        return result
 
     async def _fetch_data(self):
         self._next_fetch_trigger = TimeUtils.now() + datetime.timedelta(seconds=self._refresh_time)
         _logger.debug("_fetch_data...")
 
         fetcher = self._fetcher_factory.create_fetcher_job()
-        return fetcher.fetch_safe()
+        if self._profiler.is_running():
+            # cProfile sees the loop thread only => inline (blocking) fetch while profiling
+            return fetcher.fetch_safe()
+        return await fetcher.fetch_safe_async()  # the loop stays responsive (HTTP API)
 
     def _handle_fetch_result(self):
         if not self._fetcher_task or not self._fetcher_task.done():
             return
 
         fetcher_values = self._fetcher_task.result()
+        fetched = self._fetcher_started or TimeUtils.now()
         self._fetcher_task = None
         self._fetcher_started = None
 
         _logger.debug("fetch_result: %s", fetcher_values)
 
+        timestamp_property = self._timestamp_property and self._mqtt_client.supports_properties
         messages = self.splitt_messages(
             fetcher_values,
             outside_topic=self._payload_mqtt_outside_topic,
             inside_topic=self._payload_mqtt_inside_topic,
+            timestamp_in_payload=not timestamp_property,
         )
 
         for message in messages:
-            self._mqtt_client.publish(topic=message.topic, payload=message.payload)
+            if timestamp_property:
+                self._mqtt_client.publish(topic=message.topic, payload=message.payload,
+                                          user_properties={FetcherKey.TIMESTAMP: message.timestamp})
+            else:
+                self._mqtt_client.publish(topic=message.topic, payload=message.payload)
+        StartupTimer.mark("first publish")
+
+        if self._sink_dispatcher is not None:
+            self._sink_dispatcher.dispatch(fetched, fetcher_values)
+
+        if self._http_api is not None and fetcher_values:
+            self._http_api.update(fetcher_values, self._next_fetch_trigger)  # keeps the last good values on errors
+
+        self._publish_aggregations(fetched, fetcher_values)
+
+    def _publish_aggregations(self, fetched: datetime.datetime, fetcher_values: Optional[Dict[str, any]]):
+        if not self._aggregators:
+            return
+
+        if not fetcher_values or fetcher_values.get(FetcherKey.STATUS) != FetcherStatus.OK:
+            fetcher_values = None  # closes the window anyway
+        for aggregation in self._aggregators:
+            aggregated = aggregation.aggregator.collect(fetched, fetcher_values)
+            if aggregated is not None:
+                self._mqtt_client.publish(topic=aggregation.topic, payload=JsonUtils.dumps(aggregated))
+
+    def _publish_health(self):
+        if not self._mqtt_health_topic or TimeUtils.now() < self._next_health_trigger:
+            return
+        self._next_health_trigger = TimeUtils.now() + datetime.timedelta(seconds=self._health_interval)
+        self._mqtt_client.publish(topic=self._mqtt_health_topic, payload=JsonUtils.dumps(self.get_health()), retain=True)
+
+    def get_health(self) -> Dict[str, any]:
+        health = {
+            "timestamp": TimeUtils.now(),
+            "uptime": round(StartupTimer.elapsed()),
+            "fetches": self._health_monitor.get_statistics(),
+            "mqttQueued": self._mqtt_client.get_queue_depth(),
+            "rss": HealthMonitor.get_rss(),
+            "logging": AppLogging.get_statistics(),
+            **self._fetcher_factory.get_statistics(),
+        }
+        if self._sink_dispatcher is not None:
+            health["sinks"] = self._sink_dispatcher.get_statistics()
+        return health
 
     def close(self):
+        self._profiler.stop()  # results of a running profiling session
+        if self._http_api is not None:
+            self._http_api.close()
+
         if self._mqtt_client is not None:
             try:
                 if self._payload_mqtt_last_will:
@@ -169,8 +411,12 @@ class Runner:
 
             self._mqtt_client = None
 
+        if self._sink_dispatcher is not None:
+            self._sink_dispatcher.close()
+
     @classmethod
-    def splitt_messages(cls, fetcher_values: Optional[Dict[str, any]], inside_topic: str, outside_topic: str) -> List[Message]:
+    def splitt_messages(cls, fetcher_values: Optional[Dict[str, any]], inside_topic: str, outside_topic: str,
+                        timestamp_in_payload: bool = True) -> List[Message]:
         messages = []
 
         fetcher_values = {} if fetcher_values is None else fetcher_values
@@ -191,7 +437,9 @@ class Runner:
             if status == FetcherStatus.OK and not values_:
                 status = FetcherStatus.ERROR
             values_[FetcherKey.STATUS] = status
-            values_[FetcherKey.TIMESTAMP] = source_timestamp
+            append_value(values_, FetcherKey.CIRCUIT)
+            if timestamp_in_payload:
+                values_[FetcherKey.TIMESTAMP] = source_timestamp
             values_[FetcherKey.SENSOR] = sensor_name
 
         if inside_topic:
@@ -201,7 +449,7 @@ class Runner:
             append_value(values, FetcherKey.TEMP_INSIDE, FetcherKey.TEMP)
             add_meta(values, "inside1")
 
-            message = Message(inside_topic, JsonUtils.dumps(values))
+            message = Message(inside_topic, JsonUtils.dumps(values), source_timestamp)
             messages.append(message)
 
         if outside_topic:
@@ -215,14 +463,24 @@ class Runner:
             append_value(values, FetcherKey.UVI)
             append_value(values, FetcherKey.RAIN_HOURLY)
             append_value(values, FetcherKey.RAIN_COUNTER)
+            append_value(values, FetcherKey.RAIN_HOUR)
+            append_value(values, FetcherKey.RAIN_DAY)
+            append_value(values, FetcherKey.RAIN_24H)
 
             append_value(values, FetcherKey.BATTERY_OUTSIDE, FetcherKey.BATTERY)
             append_value(values, FetcherKey.HUMI_OUTSIDE, FetcherKey.HUMI)
             append_value(values, FetcherKey.TEMP_OUTSIDE, FetcherKey.TEMP)
 
+            append_value(values, FetcherKey.DEW_POINT)
+            append_value(values, FetcherKey.FEELS_LIKE)
+            append_value(values, FetcherKey.HEAT_INDEX)
+            append_value(values, FetcherKey.HUMI_ABSOLUTE)
+            append_value(values, FetcherKey.RAIN_RATE)
+            append_value(values, FetcherKey.WIND_CHILL)
+
             add_meta(values, "weatherStation")
 
-            message = Message(outside_topic, JsonUtils.dumps(values))
+            message = Message(outside_topic, JsonUtils.dumps(values), source_timestamp)
             messages.append(message)
 
         return messages
@@ -3,12 +3,31 @@
 class RunnerConfKey:
 
     REFRESH_TIME = "refresh_time"
+    REFRESH_MIN_INTERVAL = "refresh_min_interval"
     RESILIENCE_TIME = "resilience_time"
     FETCH_TIMEOUT = "fetch_timeout"
+    CONFIG_WATCH_INTERVAL = "config_watch_interval"
 
     MQTT_OUTSIDE_TOPIC = "mqtt_outside_topic"
     MQTT_INSIDE_TOPIC = "mqtt_inside_topic"
     MQTT_LAST_WILL = "mqtt_last_will"
+    MQTT_CONTROL_TOPIC = "mqtt_control_topic"
+    MQTT_HEALTH_TOPIC = "mqtt_health_topic"
+    MQTT_TIMESTAMP_PROPERTY = "mqtt_timestamp_property"
+    HEALTH_INTERVAL = "health_interval"
+
+    AGGREGATIONS = "aggregations"
+
+    HTTP_HOST = "http_host"
+    HTTP_PORT = "http_port"
+
+    PROFILE_DIR = "profile_dir"
+    PROFILE_DURATION = "profile_duration"
+
+
+class AggregationConfKey:
+    INTERVAL = "interval"
+    MQTT_TOPIC = "mqtt_topic"
 
 
 RUNNER_JSONSCHEMA = {
@@ -26,11 +45,22 @@ RUNNER_JSONSCHEMA = {
             "minimum": 10,
             "description": "Reloads are triggered after this time (seconds)."
         },
+        RunnerConfKey.REFRESH_MIN_INTERVAL: {
+            "type": "number",
+            "minimum": 0,
+            "description": "Min time between fetches triggered by the 'refresh' command and the former fetch (seconds; default: 5)."
+        },
         RunnerConfKey.FETCH_TIMEOUT: {
             "type": "number",
             "minimum": 1,
             "description": "Timeout to fetch data (seconds)."
         },
+        RunnerConfKey.CONFIG_WATCH_INTERVAL: {
+            "type": "number",
+            "minimum": 0,
+            "description": "Checks the config file for modifications and reloads it (seconds; default: 0 == off). "
+                           "A reload can always be triggered by SIGHUP."
+        },
 
         RunnerConfKey.MQTT_OUTSIDE_TOPIC: {
             "type": "string",
@@ -47,6 +77,70 @@ RUNNER_JSONSCHEMA = {
             "minLength": 1,
             "description": "MQTT last will (leave empty to not set a las will)."
         },
+        RunnerConfKey.MQTT_CONTROL_TOPIC: {
+            "type": "string",
+            "minLength": 1,
+            "description": "MQTT topic for commands (not retained): 'refresh' (immediate fetch), 'profile [<seconds>]'."
+        },
+        RunnerConfKey.MQTT_TIMESTAMP_PROPERTY: {
+            "type": "boolean",
+            "description": "MQTT v5: the timestamp is sent as user property 'timestamp' instead of within the JSON payload."
+        },
+        RunnerConfKey.MQTT_HEALTH_TOPIC: {
+            "type": "string",
+            "minLength": 1,
+            "description": "MQTT topic for the (retained) service health: fetch latency, error rates, queues, memory."
+        },
+        RunnerConfKey.HEALTH_INTERVAL: {
+            "type": "number",
+            "minimum": 10,
+            "description": "Health is published after this time (seconds; default: 300)."
+        },
+
+        RunnerConfKey.AGGREGATIONS: {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    AggregationConfKey.INTERVAL: {
+                        "type": "integer",
+                        "minimum": 60,
+                        "description": "Tumbling window (seconds), aligned to multiples of the interval (e.g. 300 => :00, :05, ...)."
+                    },
+                    AggregationConfKey.MQTT_TOPIC: {
+                        "type": "string",
+                        "minLength": 1,
+                        "description": "MQTT topic for the min/max/mean/last values per window, sent when the window is closed."
+                    },
+                },
+                "additionalProperties": False,
+                "required": [AggregationConfKey.INTERVAL, AggregationConfKey.MQTT_TOPIC],
+            },
+            "description": "Aggregated values for consumers which don't need every fetch (e.g. dashboards)."
+        },
+
+        RunnerConfKey.HTTP_PORT: {
+            "type": "integer",
+            "minimum": 0,
+            "maximum": 65535,
+            "description": "Serves the latest values via HTTP (GET /values, /values/<key>) for local consumers (default: off)."
+        },
+        RunnerConfKey.HTTP_HOST: {
+            "type": "string",
+            "minLength": 1,
+            "description": "Listen address of the HTTP API (default: 127.0.0.1; 0.0.0.0 == all interfaces)."
+        },
+
+        RunnerConfKey.PROFILE_DIR: {
+            "type": "string",
+            "minLength": 1,
+            "description": "Directory for the profiling results (SIGUSR1 or control command 'profile'; default: temp dir)."
+        },
+        RunnerConfKey.PROFILE_DURATION: {
+            "type": "number",
+            "minimum": 1,
+            "description": "Default profiling time span (seconds; default: 60)."
+        },
 
     },
     "additionalProperties": False,
@@ -0,0 +1,83 @@
+import copy
+import logging
+import threading
+from typing import Optional
+
+from src.app_config import AppConfig
+from src.config_reloader import ConfigReloader
+from src.fetcher.fetcher_factory import FetcherFactory
+from src.mqtt_client import MqttClient
+from src.mqtt_config import MqttConfKey
+from src.runner import Runner
+from src.sink.sink_factory import SinkFactory
+
+_logger = logging.getLogger(__name__)
+
+
+class Service:
+    """Wires up and runs all components of one weather station (fetcher, MQTT, sinks, runner)."""
+
+    def __init__(self, app_config: AppConfig, config_file: str, schema_cache_dir: Optional[str] = None,
+                 mqtt_client_id: Optional[str] = None):
+        self._app_config = app_config
+        self._config_file = config_file
+        self._schema_cache_dir = schema_cache_dir
+        self._mqtt_client_id = mqtt_client_id
+
+        self._lock = threading.Lock()
+        self._stopped = False
+
+        self._runner = None  # type: Optional[Runner]
+        self._fetcher_factory = None  # type: Optional[FetcherFactory]
+        self._mqtt_client = None  # type: Optional[MqttClient]
+        self._sink_dispatcher = None
+
+    def run(self):
+        """Blocks until stopped (or an exception occurs)."""
+        try:
+            app_config = self._app_config
+
+            self._fetcher_factory = FetcherFactory(app_config.get_fetcher_config())
+            self._fetcher_factory.start_recorder()
+            self._fetcher_factory.start_parse_pool()
+            self._fetcher_factory.start_persistence()
+
+            mqtt_config = app_config.get_mqtt_config()
+            if self._mqtt_client_id:
+                mqtt_config = {**copy.deepcopy(mqtt_config), MqttConfKey.CLIENT_ID: self._mqtt_client_id}
+            self._mqtt_client = MqttClient(mqtt_config)
+
+            self._sink_dispatcher = SinkFactory.create_dispatcher(app_config.get_sinks_config())
+
+            config_reloader = ConfigReloader(self._config_file, app_config, self._schema_cache_dir)
+
+            with self._lock:
+                if self._stopped:
+                    return
+                self._runner = Runner(app_config.get_runner_config(), self._fetcher_factory, self._mqtt_client,
+                                      self._sink_dispatcher, config_reloader)
+
+            self._runner.run()
+
+        finally:
+            self.close()
+
+    def stop(self):
+        """Thread safe."""
+        with self._lock:
+            self._stopped = True
+            if self._runner is not None:
+                self._runner.stop()
+
+    def close(self):
+        if self._runner is not None:
+            self._runner.close()
+        if self._mqtt_client is not None:
+            self._mqtt_client.close()
+            self._mqtt_client = None
+        if self._fetcher_factory is not None:
+            self._fetcher_factory.close()
+            self._fetcher_factory = None
+        if self._sink_dispatcher is not None:
+            self._sink_dispatcher.close()
+            self._sink_dispatcher = None
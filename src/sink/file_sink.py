@@ -0,0 +1,30 @@
+import datetime
+import os
+from typing import Dict
+
+from src.sink.sink import Sink
+from src.sink.sink_config import FileSinkConfKey
+from src.utils.json_utils import JsonUtils
+
+
+class FileSink(Sink):
+    """Appends each fetch result as JSON line (`{"fetched": ..., "values": {...}}`, can be replayed) to a file."""
+
+    def __init__(self, config):
+        self._path = config[FileSinkConfKey.PATH]
+
+        file_dir = os.path.dirname(self._path)
+        if file_dir:
+            os.makedirs(file_dir, exist_ok=True)
+
+        self._file = open(self._path, "a", encoding="utf-8")
+
+    def write(self, fetched: datetime.datetime, values: Dict[str, any]):
+        self._file.write(JsonUtils.dumps({"fetched": fetched, "values": values}))
+        self._file.write("\n")
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
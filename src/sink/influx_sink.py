@@ -0,0 +1,168 @@
+import datetime
+import logging
+import socket
+import urllib.parse
+from typing import Dict, List, Optional
+
+from src.fetcher.fetcher_key import FetcherKey
+from src.sink.sink import Sink
+from src.sink.sink_config import InfluxConfKey
+
+_logger = logging.getLogger(__name__)
+
+
+class InfluxException(Exception):
+    pass
+
+
+class InfluxSink(Sink):
+    """
+    Serializes fetch results directly into InfluxDB line protocol (one point per fetch result, nanosecond timestamps of the fetch)
+    and sends them batched to a UDP/TCP address or a local (unix) socket, e.g. to a Telegraf `socket_listener`.
+    """
+
+    DEFAULT_MEASUREMENT = "weather"
+    DEFAULT_BATCH_SIZE = 1
+    MAX_DATAGRAM_SIZE = 8192  # bytes, lines are never splitted
+
+    SCHEMES = {
+        "udp": (socket.AF_INET, socket.SOCK_DGRAM),
+        "tcp": (socket.AF_INET, socket.SOCK_STREAM),
+        "unixgram": (socket.AF_UNIX, socket.SOCK_DGRAM),
+        "unix": (socket.AF_UNIX, socket.SOCK_STREAM),
+    }
+
+    SKIPPED_KEYS = {FetcherKey.STATUS, FetcherKey.TIMESTAMP, FetcherKey.CIRCUIT}  # no measurements
+
+    def __init__(self, config):
+        address = config[InfluxConfKey.ADDRESS]
+        self._family, self._type, self._address = self.parse_address(address)
+
+        self._batch_size = config.get(InfluxConfKey.BATCH_SIZE, self.DEFAULT_BATCH_SIZE)
+
+        # measurement + tags are the same for every point
+        measurement = config.get(InfluxConfKey.MEASUREMENT, self.DEFAULT_MEASUREMENT)
+        tags = config.get(InfluxConfKey.TAGS) or {}
+        self._prefix = self.escape_key(measurement, is_measurement=True)
+        for tag_key in sorted(tags):
+            self._prefix += ",{}={}".format(self.escape_key(tag_key), self.escape_key(str(tags[tag_key])))
+        self._prefix += " "
+
+        self._lines = []  # type: List[bytes]
+        self._socket = None  # type: Optional[socket.socket]
+
+    @classmethod
+    def parse_address(cls, address: str):
+        parsed = urllib.parse.urlsplit(address)
+        scheme_info = cls.SCHEMES.get(parsed.scheme)
+        if scheme_info is None:
+            raise InfluxException(f"unsupported address scheme ({address}; expected: {', '.join(cls.SCHEMES)})!")
+
+        family, socket_type = scheme_info
+        if family == socket.AF_UNIX:
+            return family, socket_type, parsed.path
+        if not parsed.hostname or not parsed.port:
+            raise InfluxException(f"address needs host and port ({address})!")
+        return family, socket_type, (parsed.hostname, parsed.port)
+
+    @classmethod
+    def escape_key(cls, value: str, is_measurement: bool = False) -> str:
+        value = value.replace("\\", "\\\\").replace(",", "\\,").replace(" ", "\\ ")
+        if not is_measurement:
+            value = value.replace("=", "\\=")
+        return value
+
+    @classmethod
+    def format_field_value(cls, value) -> Optional[str]:
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if isinstance(value, int):
+            return f"{value}i"
+        if isinstance(value, float):
+            return repr(value)
+        if isinstance(value, str):
+            return '"{}"'.format(value.replace("\\", "\\\\").replace('"', '\\"'))
+        return None
+
+    @classmethod
+    def to_nanoseconds(cls, fetched: datetime.datetime) -> int:
+        if fetched.tzinfo is None:
+            fetched = fetched.astimezone()
+        # integer arithmetic, a float timestamp would lose precision
+        delta = fetched - datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+        return (delta.days * 86400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1000
+
+    def format_line(self, fetched: datetime.datetime, values: Dict[str, any]) -> Optional[str]:
+        fields = []
+        for key in sorted(values):
+            if key in self.SKIPPED_KEYS:
+                continue
+            field_value = self.format_field_value(values[key])
+            if field_value is not None:
+                fields.append(f"{self.escape_key(key)}={field_value}")
+
+        if not fields:
+            return None  # a point needs at least one field
+        return "{}{} {}".format(self._prefix, ",".join(fields), self.to_nanoseconds(fetched))
+
+    def write(self, fetched: datetime.datetime, values: Dict[str, any]):
+        line = self.format_line(fetched, values)
+        if line is None:
+            return
+
+        self._lines.append(line.encode("utf-8") + b"\n")
+        if len(self._lines) >= self._batch_size:
+            self.flush()
+
+    def flush(self):
+        lines = self._lines
+        self._lines = []
+        if not lines:
+            return
+
+        try:
+            if self._type == socket.SOCK_DGRAM:
+                for packet in self._pack_datagrams(lines):
+                    self._get_socket().sendto(packet, self._address)
+            else:
+                self._get_socket().sendall(b"".join(lines))
+        except OSError as ex:
+            self._close_socket()  # reconnect with the next batch
+            raise InfluxException(f"cannot send {len(lines)} lines to {self._address}: {ex}") from None
+
+    def close(self):
+        try:
+            self.flush()
+        except InfluxException as ex:
+            _logger.error(ex)
+        self._close_socket()
+
+    @classmethod
+    def _pack_datagrams(cls, lines: List[bytes]) -> List[bytes]:
+        packets = []
+        packet = b""
+        for line in lines:
+            if packet and len(packet) + len(line) > cls.MAX_DATAGRAM_SIZE:
+                packets.append(packet)
+                packet = b""
+            packet += line
+        if packet:
+            packets.append(packet)
+        return packets
+
+    def _get_socket(self) -> socket.socket:
+        if self._socket is None:
+            sock = socket.socket(self._family, self._type)
+            if self._type == socket.SOCK_STREAM:
+                try:
+                    sock.connect(self._address)
+                except OSError:
+                    sock.close()
+                    raise
+            self._socket = sock
+        return self._socket
+
+    def _close_socket(self):
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
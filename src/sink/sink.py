@@ -0,0 +1,22 @@
+import abc
+import datetime
+from typing import Dict
+
+
+class Sink(abc.ABC):
+    """
+    Output target for fetch results (additionally to the MQTT messages sent by the `Runner`).
+    Sinks are fed by the `SinkDispatcher` from their own thread.
+    """
+
+    @property
+    def name(self) -> str:
+        return self.__class__.__name__
+
+    @abc.abstractmethod
+    def write(self, fetched: datetime.datetime, values: Dict[str, any]):
+        """Receives the (not splitted) fetcher values, keyed by `FetcherKey`. The values are shared, don't modify them!"""
+        raise NotImplementedError()
+
+    def close(self):
+        pass
@@ -0,0 +1,145 @@
+
+class SinkConfKey:
+    QUEUE_SIZE = "queue_size"
+
+    FILE = "file"
+    INFLUX = "influx"
+    SQLITE = "sqlite"
+    WEBHOOK = "webhook"
+
+
+class FileSinkConfKey:
+    PATH = "path"
+
+
+class InfluxConfKey:
+    ADDRESS = "address"
+    BATCH_SIZE = "batch_size"
+    MEASUREMENT = "measurement"
+    TAGS = "tags"
+
+
+class WebhookConfKey:
+    URL = "url"
+    TIMEOUT = "timeout"
+
+
+class SqliteConfKey:
+    DATABASE = "database"
+    BATCH_SIZE = "batch_size"
+    RETENTION_DAYS = "retention_days"
+    DOWNSAMPLE_AFTER_DAYS = "downsample_after_days"
+    DOWNSAMPLE_INTERVAL = "downsample_interval"
+
+
+SQLITE_JSONSCHEMA = {
+    "type": "object",
+    "properties": {
+        SqliteConfKey.DATABASE: {
+            "type": "string",
+            "minLength": 1,
+            "description": "SQLite database file (path)."
+        },
+        SqliteConfKey.BATCH_SIZE: {
+            "type": "integer",
+            "minimum": 1,
+            "description": "Count of fetch results which are inserted together (default: 10)."
+        },
+        SqliteConfKey.RETENTION_DAYS: {
+            "type": "number",
+            "minimum": 1,
+            "description": "Deletes all (raw and downsampled) values older than this (days; default: 365)."
+        },
+        SqliteConfKey.DOWNSAMPLE_AFTER_DAYS: {
+            "type": "number",
+            "minimum": 1,
+            "description": "Raw values older than this are aggregated into downsampled values (days; default: 7)."
+        },
+        SqliteConfKey.DOWNSAMPLE_INTERVAL: {
+            "type": "integer",
+            "minimum": 60,
+            "description": "Time bucket of downsampled values (seconds; default: 900)."
+        },
+    },
+    "additionalProperties": False,
+    "required": [SqliteConfKey.DATABASE],
+}
+
+
+FILE_SINK_JSONSCHEMA = {
+    "type": "object",
+    "properties": {
+        FileSinkConfKey.PATH: {
+            "type": "string",
+            "minLength": 1,
+            "description": "JSONL file (path), each fetch result is appended as one line."
+        },
+    },
+    "additionalProperties": False,
+    "required": [FileSinkConfKey.PATH],
+}
+
+
+WEBHOOK_JSONSCHEMA = {
+    "type": "object",
+    "properties": {
+        WebhookConfKey.URL: {
+            "type": "string",
+            "minLength": 1,
+            "description": "Each fetch result is POSTed as JSON to this URL."
+        },
+        WebhookConfKey.TIMEOUT: {
+            "type": "number",
+            "minimum": 1,
+            "description": "HTTP timeout (seconds; default: 10)."
+        },
+    },
+    "additionalProperties": False,
+    "required": [WebhookConfKey.URL],
+}
+
+
+INFLUX_JSONSCHEMA = {
+    "type": "object",
+    "properties": {
+        InfluxConfKey.ADDRESS: {
+            "type": "string",
+            "pattern": "^(udp|tcp|unix|unixgram)://",
+            "description": "Line protocol target, e.g. 'udp://localhost:8094' or 'unixgram:///tmp/telegraf.sock'."
+        },
+        InfluxConfKey.BATCH_SIZE: {
+            "type": "integer",
+            "minimum": 1,
+            "description": "Count of fetch results (points) which are sent together (default: 1)."
+        },
+        InfluxConfKey.MEASUREMENT: {
+            "type": "string",
+            "minLength": 1,
+            "description": "Measurement name (default: weather)."
+        },
+        InfluxConfKey.TAGS: {
+            "type": "object",
+            "additionalProperties": {"type": "string", "minLength": 1},
+            "description": "Tags added to every point (e.g. station: garden)."
+        },
+    },
+    "additionalProperties": False,
+    "required": [InfluxConfKey.ADDRESS],
+}
+
+
+SINK_JSONSCHEMA = {
+    "type": "object",
+    "properties": {
+        SinkConfKey.QUEUE_SIZE: {
+            "type": "integer",
+            "minimum": 1,
+            "description": "Max queued fetch results per sink; the oldest are dropped if a sink can't keep up (default: 100)."
+        },
+        SinkConfKey.FILE: FILE_SINK_JSONSCHEMA,
+        SinkConfKey.INFLUX: INFLUX_JSONSCHEMA,
+        SinkConfKey.SQLITE: SQLITE_JSONSCHEMA,
+        SinkConfKey.WEBHOOK: WEBHOOK_JSONSCHEMA,
+    },
+    "additionalProperties": False,
+}
@@ -0,0 +1,100 @@
+import datetime
+import logging
+import queue
+import threading
+from typing import Dict, List
+
+from src.sink.sink import Sink
+
+_logger = logging.getLogger(__name__)
+
+
+class _SinkWorker:
+    """Feeds one sink from its own bounded queue and thread. If the sink can't keep up, the oldest results are dropped."""
+
+    def __init__(self, sink: Sink, queue_size: int):
+        self.sink = sink
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._dropped = 0
+        self._failed = 0
+
+        self._thread = threading.Thread(target=self._run, name=f"sink-{sink.name}", daemon=True)
+        self._thread.start()
+
+    @property
+    def dropped(self) -> int:
+        with self._lock:
+            return self._dropped
+
+    @property
+    def failed(self) -> int:
+        with self._lock:
+            return self._failed
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def put(self, item):
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()  # backpressure: drop the oldest result, the newest is more valuable
+                    with self._lock:
+                        self._dropped += 1
+                except queue.Empty:
+                    pass
+
+    def close(self, timeout: float):
+        self.put(None)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            _logger.warning("sink %s did not finish in time (%.1fs)!", self.sink.name, timeout)
+        else:
+            self.sink.close()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            try:
+                self.sink.write(*item)
+            except Exception as ex:
+                with self._lock:
+                    self._failed += 1
+                _logger.error("sink %s failed: %s", self.sink.name, ex)
+
+
+class SinkDispatcher:
+    """
+    Fans out each fetch result concurrently to all sinks. Every sink gets its own bounded queue and worker thread,
+    so a slow sink never delays the fetch loop or the other sinks.
+    """
+
+    DEFAULT_QUEUE_SIZE = 100
+    CLOSE_TIMEOUT = 10  # seconds
+
+    def __init__(self, sinks: List[Sink], queue_size: int = DEFAULT_QUEUE_SIZE):
+        self._workers = [_SinkWorker(sink, queue_size) for sink in sinks]
+
+    def dispatch(self, fetched: datetime.datetime, values: Dict[str, any]):
+        for worker in self._workers:
+            worker.put((fetched, values))
+
+    def get_statistics(self) -> Dict[str, Dict[str, int]]:
+        return {
+            worker.sink.name: {"dropped": worker.dropped, "failed": worker.failed, "queued": worker.queue_depth}
+            for worker in self._workers
+        }
+
+    def close(self):
+        workers = self._workers
+        self._workers = []
+        for worker in workers:
+            worker.close(self.CLOSE_TIMEOUT)
@@ -0,0 +1,28 @@
+import importlib
+
+from src.sink.sink_config import SinkConfKey
+from src.sink.sink_dispatcher import SinkDispatcher
+
+
+class SinkFactory:
+
+    # modules are only imported when the sink is configured (startup time)
+    SINK_CLASSES = {
+        SinkConfKey.FILE: ("src.sink.file_sink", "FileSink"),
+        SinkConfKey.INFLUX: ("src.sink.influx_sink", "InfluxSink"),
+        SinkConfKey.SQLITE: ("src.sink.sqlite_sink", "SqliteSink"),
+        SinkConfKey.WEBHOOK: ("src.sink.webhook_sink", "WebhookSink"),
+    }
+
+    @classmethod
+    def create_dispatcher(cls, sinks_config) -> SinkDispatcher:
+        sinks = []
+
+        for conf_key, (module_name, class_name) in cls.SINK_CLASSES.items():
+            sink_config = sinks_config.get(conf_key)
+            if sink_config:
+                sink_class = getattr(importlib.import_module(module_name), class_name)
+                sinks.append(sink_class(sink_config))
+
+        queue_size = sinks_config.get(SinkConfKey.QUEUE_SIZE, SinkDispatcher.DEFAULT_QUEUE_SIZE)
+        return SinkDispatcher(sinks, queue_size)
@@ -0,0 +1,153 @@
+import datetime
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from typing import Dict, List, Optional
+
+from src.fetcher.fetcher_key import FetcherKey
+from src.sink.sink import Sink
+from src.sink.sink_config import SqliteConfKey
+
+_logger = logging.getLogger(__name__)
+
+
+Sample = namedtuple('Sample', ['time_stamp', 'value'])
+AggregatedSample = namedtuple('AggregatedSample', ['time_stamp', 'min', 'max', 'mean', 'count'])
+
+
+class SqliteSink(Sink):
+    """
+    Stores every fetched value into a local SQLite database (WAL mode, batched inserts), so recent history can be queried
+    without a MQTT broker. Old raw values are downsampled into time buckets (min/max/mean), very old values are deleted.
+    """
+
+    DEFAULT_BATCH_SIZE = 10
+    DEFAULT_RETENTION_DAYS = 365
+    DEFAULT_DOWNSAMPLE_AFTER_DAYS = 7
+    DEFAULT_DOWNSAMPLE_INTERVAL = 900  # seconds
+
+    MAINTENANCE_INTERVAL = 3600  # seconds
+
+    SKIPPED_KEYS = {FetcherKey.STATUS, FetcherKey.TIMESTAMP, FetcherKey.CIRCUIT}
+
+    SQL_CREATE = [
+        "CREATE TABLE IF NOT EXISTS samples (time_stamp REAL NOT NULL, key TEXT NOT NULL, value)",
+        "CREATE INDEX IF NOT EXISTS samples_key_time ON samples (key, time_stamp)",
+        "CREATE TABLE IF NOT EXISTS samples_downsampled ("
+        "time_stamp REAL NOT NULL, key TEXT NOT NULL, min REAL, max REAL, mean REAL, count INTEGER NOT NULL, "
+        "PRIMARY KEY (key, time_stamp))",
+    ]
+    SQL_INSERT = "INSERT INTO samples (time_stamp, key, value) VALUES (?, ?, ?)"
+    # late values (e.g. replays) of an already downsampled bucket are merged into its aggregates
+    SQL_DOWNSAMPLE = (
+        "INSERT INTO samples_downsampled AS d (time_stamp, key, min, max, mean, count) "
+        "SELECT CAST(time_stamp / :interval AS INTEGER) * :interval AS bucket, key, MIN(value), MAX(value), AVG(value), COUNT(*) "
+        "FROM samples WHERE time_stamp < :limit AND typeof(value) IN ('integer', 'real') GROUP BY key, bucket "
+        "ON CONFLICT (key, time_stamp) DO UPDATE SET "
+        "min = MIN(d.min, excluded.min), max = MAX(d.max, excluded.max), "
+        "mean = (d.mean * d.count + excluded.mean * excluded.count) / (d.count + excluded.count), "
+        "count = d.count + excluded.count"
+    )
+    SQL_DELETE_RAW = "DELETE FROM samples WHERE time_stamp < ?"
+    SQL_DELETE_DOWNSAMPLED = "DELETE FROM samples_downsampled WHERE time_stamp < ?"
+    SQL_QUERY = "SELECT time_stamp, value FROM samples WHERE key = ? AND time_stamp >= ? AND time_stamp < ? ORDER BY time_stamp"
+    SQL_QUERY_DOWNSAMPLED = (
+        "SELECT time_stamp, min, max, mean, count FROM samples_downsampled "
+        "WHERE key = ? AND time_stamp >= ? AND time_stamp < ? ORDER BY time_stamp"
+    )
+
+    def __init__(self, config):
+        self._database = config[SqliteConfKey.DATABASE]
+        self._batch_size = config.get(SqliteConfKey.BATCH_SIZE, self.DEFAULT_BATCH_SIZE)
+        self._retention = config.get(SqliteConfKey.RETENTION_DAYS, self.DEFAULT_RETENTION_DAYS) * 86400
+        self._downsample_after = config.get(SqliteConfKey.DOWNSAMPLE_AFTER_DAYS, self.DEFAULT_DOWNSAMPLE_AFTER_DAYS) * 86400
+        self._downsample_interval = config.get(SqliteConfKey.DOWNSAMPLE_INTERVAL, self.DEFAULT_DOWNSAMPLE_INTERVAL)
+
+        self._lock = threading.Lock()
+        self._rows = []
+        self._pending_results = 0
+        self._next_maintenance = 0  # time.monotonic
+
+        database_dir = os.path.dirname(self._database)
+        if database_dir:
+            os.makedirs(database_dir, exist_ok=True)
+
+        self._connection = sqlite3.connect(self._database, check_same_thread=False)  # serialized via `_lock`
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            for sql in self.SQL_CREATE:
+                self._connection.execute(sql)
+
+    def write(self, fetched: datetime.datetime, values: Dict[str, any]):
+        time_stamp = fetched.timestamp()
+
+        with self._lock:
+            for key, value in values.items():
+                if value is not None and key not in self.SKIPPED_KEYS:
+                    self._rows.append((time_stamp, key, value))
+            self._pending_results += 1
+
+            if self._pending_results >= self._batch_size:
+                self._flush()
+
+            if time.monotonic() >= self._next_maintenance:
+                self._maintain(time_stamp)
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def maintain(self, now: Optional[float] = None):
+        """Downsampling and retention job (runs hourly on its own, but may be triggered explicitly)."""
+        with self._lock:
+            self._flush()
+            self._maintain(time.time() if now is None else now)
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._flush()
+                self._connection.close()
+                self._connection = None
+
+    def query(self, key: str, since: datetime.datetime, until: Optional[datetime.datetime] = None) -> List[Sample]:
+        until_stamp = until.timestamp() if until else float("inf")
+        with self._lock:
+            self._flush()
+            cursor = self._connection.execute(self.SQL_QUERY, (key, since.timestamp(), until_stamp))
+            return [Sample(*row) for row in cursor]
+
+    def query_downsampled(self, key: str, since: datetime.datetime, until: Optional[datetime.datetime] = None) -> List[AggregatedSample]:
+        until_stamp = until.timestamp() if until else float("inf")
+        with self._lock:
+            cursor = self._connection.execute(self.SQL_QUERY_DOWNSAMPLED, (key, since.timestamp(), until_stamp))
+            return [AggregatedSample(*row) for row in cursor]
+
+    def _flush(self):
+        self._pending_results = 0
+        if not self._rows or self._connection is None:
+            return
+        try:
+            with self._connection:
+                self._connection.executemany(self.SQL_INSERT, self._rows)
+        except sqlite3.Error as ex:
+            _logger.error("cannot insert %d values into sqlite: %s", len(self._rows), ex)
+        self._rows = []
+
+    def _maintain(self, now: float):
+        self._next_maintenance = time.monotonic() + self.MAINTENANCE_INTERVAL
+
+        # buckets must not be splitted between raw and downsampled values
+        downsample_limit = (now - self._downsample_after) // self._downsample_interval * self._downsample_interval
+        retention_limit = now - self._retention
+        try:
+            with self._connection:
+                self._connection.execute(self.SQL_DOWNSAMPLE, {"interval": self._downsample_interval, "limit": downsample_limit})
+                self._connection.execute(self.SQL_DELETE_RAW, (downsample_limit,))
+                self._connection.execute(self.SQL_DELETE_DOWNSAMPLED, (retention_limit,))
+        except sqlite3.Error as ex:
+            _logger.error("sqlite maintenance failed: %s", ex)
@@ -0,0 +1,31 @@
+import datetime
+import urllib.error
+import urllib.request
+from typing import Dict
+
+from src.sink.sink import Sink
+from src.sink.sink_config import WebhookConfKey
+from src.utils.json_utils import JsonUtils
+
+
+class WebhookException(Exception):
+    pass
+
+
+class WebhookSink(Sink):
+    """POSTs each fetch result as JSON (`{"fetched": ..., "values": {...}}`) to an HTTP endpoint."""
+
+    DEFAULT_TIMEOUT = 10  # seconds
+
+    def __init__(self, config):
+        self._url = config[WebhookConfKey.URL]
+        self._timeout = config.get(WebhookConfKey.TIMEOUT, self.DEFAULT_TIMEOUT)
+
+    def write(self, fetched: datetime.datetime, values: Dict[str, any]):
+        data = JsonUtils.dumps({"fetched": fetched, "values": values}).encode("utf-8")
+        request = urllib.request.Request(self._url, data=data, method="POST", headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self._timeout) as response:
+                response.read()
+        except urllib.error.URLError as ex:
+            raise WebhookException(f"could not post to webhook ({self._url}): {ex}") from None
@@ -0,0 +1,36 @@
+import bisect
+import hashlib
+from typing import Dict, List
+
+
+class HashRing:
+    """
+    Consistent hashing of stations to shards: changing the shard count moves only a minimal part of the stations.
+    Every shard is placed multiple times (virtual nodes) on the ring for an even distribution.
+    """
+
+    DEFAULT_VIRTUAL_NODES = 64
+
+    def __init__(self, shard_count: int, virtual_nodes: int = DEFAULT_VIRTUAL_NODES):
+        points = []
+        for shard in range(shard_count):
+            for virtual_node in range(virtual_nodes):
+                points.append((self._hash(f"shard-{shard}-{virtual_node}"), shard))
+        points.sort()
+
+        self._hashes = [point[0] for point in points]
+        self._shards = [point[1] for point in points]
+
+    @classmethod
+    def _hash(cls, key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+    def get_shard(self, key: str) -> int:
+        index = bisect.bisect(self._hashes, self._hash(key)) % len(self._hashes)
+        return self._shards[index]
+
+    def partition(self, keys: List[str]) -> Dict[int, List[str]]:
+        partitions = {}
+        for key in keys:
+            partitions.setdefault(self.get_shard(key), []).append(key)
+        return partitions
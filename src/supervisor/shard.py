@@ -0,0 +1,110 @@
+import logging
+import os
+import signal
+import sys
+import threading
+from typing import Dict, List, Optional
+
+from src.app_config import AppConfig
+from src.app_logging import AppLogging
+from src.mqtt_config import MqttConfKey
+from src.service import Service
+
+_logger = logging.getLogger(__name__)
+
+
+class Shard:
+    """
+    Runs the stations of one worker process (each station `Service` in its own thread) and reports heartbeats
+    to the supervisor. If one station fails, the shard terminates (and gets restarted by the supervisor).
+    """
+
+    HEARTBEAT_INTERVAL = 5  # seconds
+    JOIN_TIMEOUT = 15  # seconds
+
+    def __init__(self, shard_index: int, station_files: List[str], schema_cache_dir: Optional[str], heartbeat_queue):
+        self._shard_index = shard_index
+        self._station_files = station_files
+        self._schema_cache_dir = schema_cache_dir
+        self._heartbeat_queue = heartbeat_queue
+
+        self._stop_event = threading.Event()
+        self._shutdown_requested = False
+        self._services = {}  # type: Dict[str, Service]
+        self._threads = {}  # type: Dict[str, threading.Thread]
+
+    @classmethod
+    def get_station_name(cls, station_file: str) -> str:
+        return os.path.splitext(os.path.basename(station_file))[0]
+
+    @classmethod
+    def derive_client_id(cls, client_id: Optional[str], shard_index: int, station_name: str) -> Optional[str]:
+        """Every MQTT connection needs a unique client id."""
+        if not client_id:
+            return None  # random client id by paho
+        return f"{client_id}-shard{shard_index}-{station_name}"
+
+    def run(self) -> int:
+        signal.signal(signal.SIGINT, self._shutdown_signaled)
+        signal.signal(signal.SIGTERM, self._shutdown_signaled)
+
+        try:
+            for station_file in self._station_files:
+                station_name = self.get_station_name(station_file)
+                app_config = AppConfig(station_file, self._schema_cache_dir)
+                client_id = self.derive_client_id(app_config.get_mqtt_config().get(MqttConfKey.CLIENT_ID), self._shard_index, station_name)
+
+                service = Service(app_config, station_file, self._schema_cache_dir, mqtt_client_id=client_id)
+                thread = threading.Thread(target=self._run_service, args=(station_name, service), name=f"station-{station_name}")
+                self._services[station_name] = service
+                self._threads[station_name] = thread
+                thread.start()
+
+            while True:
+                stations_alive = {name: thread.is_alive() for name, thread in self._threads.items()}
+                self._heartbeat_queue.put((self._shard_index, os.getpid(), stations_alive))
+
+                if self._shutdown_requested:
+                    return 0
+                if not all(stations_alive.values()):
+                    _logger.error("shard %d: station failed => shard is restarted", self._shard_index)
+                    return 1
+
+                self._stop_event.wait(self.HEARTBEAT_INTERVAL)
+                self._stop_event.clear()
+
+        finally:
+            for service in self._services.values():
+                service.stop()
+            for thread in self._threads.values():
+                thread.join(self.JOIN_TIMEOUT)
+
+    def _run_service(self, station_name: str, service: Service):
+        try:
+            service.run()
+        except Exception as ex:
+            _logger.error("station %s failed!", station_name)
+            _logger.exception(ex)
+        finally:
+            self._stop_event.set()  # wake up: either shutdown or failure
+
+    def _shutdown_signaled(self, sig, _frame):
+        _logger.info("shard %d: shutdown signaled (%s)", self._shard_index, sig)
+        self._shutdown_requested = True
+        self._stop_event.set()
+
+
+def run_shard(shard_index: int, station_files: List[str], schema_cache_dir: Optional[str], logging_options, heartbeat_queue):
+    """Entry point of a worker process."""
+    logging_config, log_file, log_level, print_logs, systemd_mode = logging_options
+    if log_file:
+        log_file = f"{log_file}.shard{shard_index}"  # the processes must not rotate the same file
+    AppLogging.configure(logging_config, log_file, log_level, print_logs, systemd_mode)
+
+    shard = Shard(shard_index, station_files, schema_cache_dir, heartbeat_queue)
+    try:
+        exit_code = shard.run()
+    except Exception as ex:
+        _logger.exception(ex)
+        exit_code = 1
+    sys.exit(exit_code)
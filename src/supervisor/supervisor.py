@@ -0,0 +1,206 @@
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from typing import Dict, List, Optional
+
+from src.app_config import AppConfig, load_yaml
+from src.mqtt_client import MqttClient
+from src.mqtt_config import MqttConfKey
+from src.supervisor.hash_ring import HashRing
+from src.supervisor.shard import Shard, run_shard
+from src.supervisor.supervisor_config import SupervisorConfKey, SUPERVISOR_CONFIG_JSONSCHEMA
+from src.utils.json_utils import JsonUtils
+from src.utils.time_utils import TimeUtils
+
+_logger = logging.getLogger(__name__)
+
+
+class SupervisorConfig:
+
+    def __init__(self, config_file):
+        AppConfig.check_config_file_access(config_file)
+
+        with open(config_file, 'r') as stream:
+            self._config_data = load_yaml(stream)
+
+        import jsonschema  # deferred
+        jsonschema.validate(self._config_data, SUPERVISOR_CONFIG_JSONSCHEMA)
+
+        # station config files are relative to the supervisor config file
+        config_dir = os.path.dirname(os.path.abspath(config_file))
+        supervisor_config = self._config_data["supervisor"]
+        supervisor_config[SupervisorConfKey.STATIONS] = [
+            os.path.normpath(os.path.join(config_dir, station_file)) for station_file in supervisor_config[SupervisorConfKey.STATIONS]
+        ]
+
+    def get_logging_config(self):
+        return self._config_data.get("logging") or {}
+
+    def get_mqtt_config(self):
+        return self._config_data.get("mqtt")
+
+    def get_supervisor_config(self):
+        return self._config_data["supervisor"]
+
+
+class _ShardState:
+
+    def __init__(self, shard_index: int, station_files: List[str]):
+        self.shard_index = shard_index
+        self.station_files = station_files
+        self.process = None  # type: Optional[multiprocessing.Process]
+        self.restarts = 0
+        self.next_start = 0  # time.monotonic
+        self.last_heartbeat = None
+        self.stations_alive = {}  # type: Dict[str, bool]
+
+    def to_status(self, heartbeat_timeout: float) -> Dict[str, any]:
+        alive = self.process is not None and self.process.is_alive()
+        heartbeat_ok = self.last_heartbeat is not None and time.monotonic() - self.last_heartbeat[0] < heartbeat_timeout
+        stations = {Shard.get_station_name(f): self.stations_alive.get(Shard.get_station_name(f), False) for f in self.station_files}
+        return {
+            "shard": self.shard_index,
+            "pid": self.process.pid if alive else None,
+            "status": "ok" if alive and heartbeat_ok and all(stations.values()) else "error",
+            "restarts": self.restarts,
+            "stations": stations,
+            "lastHeartbeat": self.last_heartbeat[1] if self.last_heartbeat else None,
+        }
+
+
+class Supervisor:
+    """
+    Spawns one worker process per shard, stations are partitioned by consistent hashing. Crashed workers are restarted
+    individually (the other shards keep running) and the aggregated health of all workers is published to a status topic.
+    """
+
+    DEFAULT_RESTART_DELAY = 10  # seconds
+    DEFAULT_STATUS_INTERVAL = 60  # seconds
+    CHECK_INTERVAL = 0.5  # seconds
+    TERMINATE_TIMEOUT = 30  # seconds
+
+    LAST_WILL = '{"status": "offline"}'
+
+    def __init__(self, supervisor_config: SupervisorConfig, schema_cache_dir: Optional[str], logging_options):
+        self._config = supervisor_config.get_supervisor_config()
+        self._mqtt_config = supervisor_config.get_mqtt_config()
+        self._schema_cache_dir = schema_cache_dir
+        self._logging_options = logging_options
+
+        self._restart_delay = self._config.get(SupervisorConfKey.RESTART_DELAY, self.DEFAULT_RESTART_DELAY)
+        self._status_interval = self._config.get(SupervisorConfKey.STATUS_INTERVAL, self.DEFAULT_STATUS_INTERVAL)
+        self._status_topic = self._config.get(SupervisorConfKey.MQTT_STATUS_TOPIC)
+
+        self._context = multiprocessing.get_context("spawn")
+        self._heartbeat_queue = self._context.Queue()
+        self._stop_event = threading.Event()
+
+        hash_ring = HashRing(self._config[SupervisorConfKey.WORKERS])
+        partitions = hash_ring.partition(self._config[SupervisorConfKey.STATIONS])
+        self._shards = [_ShardState(shard_index, station_files) for shard_index, station_files in sorted(partitions.items())]
+
+        self._mqtt_client = None  # type: Optional[MqttClient]
+
+    def run(self):
+        signal.signal(signal.SIGINT, self._shutdown_signaled)
+        signal.signal(signal.SIGTERM, self._shutdown_signaled)
+
+        try:
+            self._connect_mqtt()
+
+            next_status = time.monotonic() + Shard.HEARTBEAT_INTERVAL  # give the shards the time for a first heartbeat
+            while not self._stop_event.wait(self.CHECK_INTERVAL):
+                self._read_heartbeats()
+                self._check_shards()
+
+                if time.monotonic() >= next_status:
+                    next_status = time.monotonic() + self._status_interval
+                    self._publish_status()
+        finally:
+            self.close()
+
+    def close(self):
+        for shard in self._shards:
+            if shard.process is not None and shard.process.is_alive():
+                shard.process.terminate()  # SIGTERM => graceful shutdown (last will messages)
+        for shard in self._shards:
+            if shard.process is not None:
+                shard.process.join(self.TERMINATE_TIMEOUT)
+                if shard.process.is_alive():
+                    shard.process.kill()
+                shard.process = None
+
+        if self._mqtt_client is not None:
+            if self._status_topic:
+                self._mqtt_client.publish(self._status_topic, self.LAST_WILL)
+            self._mqtt_client.close()
+            self._mqtt_client = None
+
+    def get_status(self) -> Dict[str, any]:
+        heartbeat_timeout = Shard.HEARTBEAT_INTERVAL * 3
+        workers = [shard.to_status(heartbeat_timeout) for shard in self._shards]
+        return {
+            "status": "ok" if all(worker["status"] == "ok" for worker in workers) else "degraded",
+            "timestamp": TimeUtils.now(),
+            "workers": workers,
+        }
+
+    def _connect_mqtt(self):
+        if not self._mqtt_config or not self._status_topic:
+            return
+
+        mqtt_config = dict(self._mqtt_config)
+        if mqtt_config.get(MqttConfKey.CLIENT_ID):
+            mqtt_config[MqttConfKey.CLIENT_ID] = f"{mqtt_config[MqttConfKey.CLIENT_ID]}-supervisor"
+        self._mqtt_client = MqttClient(mqtt_config)
+        self._mqtt_client.set_last_will(self._status_topic, self.LAST_WILL)
+        self._mqtt_client.connect()
+
+    def _start_shard(self, shard: _ShardState):
+        shard.process = self._context.Process(
+            target=run_shard,
+            args=(shard.shard_index, shard.station_files, self._schema_cache_dir, self._logging_options, self._heartbeat_queue),
+            name=f"shard-{shard.shard_index}",
+        )
+        shard.process.start()
+        shard.stations_alive = {}
+        _logger.info("shard %d started (pid=%d, stations: %s)", shard.shard_index, shard.process.pid, ", ".join(shard.station_files))
+
+    def _check_shards(self):
+        now = time.monotonic()
+        for shard in self._shards:
+            if shard.process is not None and not shard.process.is_alive():
+                _logger.error("shard %d terminated (exit code %s) => restart in %.0fs",
+                              shard.shard_index, shard.process.exitcode, self._restart_delay)
+                shard.process = None
+                shard.restarts += 1
+                shard.next_start = now + self._restart_delay
+
+            if shard.process is None and now >= shard.next_start:
+                self._start_shard(shard)
+
+    def _read_heartbeats(self):
+        while True:
+            try:
+                shard_index, pid, stations_alive = self._heartbeat_queue.get_nowait()
+            except queue.Empty:
+                break
+            for shard in self._shards:
+                if shard.shard_index == shard_index and shard.process is not None and shard.process.pid == pid:
+                    shard.last_heartbeat = (time.monotonic(), TimeUtils.now())
+                    shard.stations_alive = stations_alive
+
+    def _publish_status(self):
+        status = self.get_status()
+        if status["status"] != "ok":
+            _logger.warning("workers degraded: %s", status["workers"])
+        if self._mqtt_client is not None and self._mqtt_client.is_connected():
+            self._mqtt_client.publish(self._status_topic, JsonUtils.dumps(status))
+
+    def _shutdown_signaled(self, sig, _frame):
+        _logger.info("shutdown signaled (%s)", sig)
+        self._stop_event.set()
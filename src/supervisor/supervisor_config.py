@@ -0,0 +1,57 @@
+from src.app_logging import LOGGING_JSONSCHEMA
+from src.mqtt_config import MQTT_JSONSCHEMA
+
+
+class SupervisorConfKey:
+    WORKERS = "workers"
+    STATIONS = "stations"
+    RESTART_DELAY = "restart_delay"
+    STATUS_INTERVAL = "status_interval"
+    MQTT_STATUS_TOPIC = "mqtt_status_topic"
+
+
+SUPERVISOR_JSONSCHEMA = {
+    "type": "object",
+    "properties": {
+        SupervisorConfKey.WORKERS: {
+            "type": "integer",
+            "minimum": 1,
+            "description": "Count of worker processes (shards)."
+        },
+        SupervisorConfKey.STATIONS: {
+            "type": "array",
+            "items": {"type": "string", "minLength": 1},
+            "minItems": 1,
+            "description": "Config files (paths) of the stations (each one like a config file of a single service)."
+        },
+        SupervisorConfKey.RESTART_DELAY: {
+            "type": "number",
+            "minimum": 1,
+            "description": "Crashed workers are restarted after this delay (seconds; default: 10)."
+        },
+        SupervisorConfKey.STATUS_INTERVAL: {
+            "type": "number",
+            "minimum": 1,
+            "description": "Interval of the aggregated status messages (seconds; default: 60)."
+        },
+        SupervisorConfKey.MQTT_STATUS_TOPIC: {
+            "type": "string",
+            "minLength": 1,
+            "description": "MQTT topic for the aggregated worker status (retained)."
+        },
+    },
+    "additionalProperties": False,
+    "required": [SupervisorConfKey.WORKERS, SupervisorConfKey.STATIONS],
+}
+
+
+SUPERVISOR_CONFIG_JSONSCHEMA = {
+    "type": "object",
+    "properties": {
+        "logging": LOGGING_JSONSCHEMA,
+        "mqtt": MQTT_JSONSCHEMA,
+        "supervisor": SUPERVISOR_JSONSCHEMA,
+    },
+    "additionalProperties": False,
+    "required": ["supervisor"],
+}
@@ -0,0 +1,133 @@
+import datetime
+import io
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import cProfile
+    import tracemalloc
+
+_logger = logging.getLogger(__name__)
+
+
+class Profiler:
+    """
+    On-demand profiling of the runner loop plus a `tracemalloc` snapshot diff over the same time span. `cProfile` only
+    covers the thread which called `start` (the loop thread), so the runner fetches inline while a session is running;
+    executor threads are not profiled (`ParsePool` workers are separate processes anyway). Results:
+    "<dir>/profile-<time>.pstats" (e.g. for snakeviz) and a text report "<dir>/profile-<time>.txt". The profiling
+    modules are imported with the first session only.
+    """
+
+    DEFAULT_DURATION = 60  # seconds
+    REPORT_LINES = 40
+    TRACEMALLOC_FRAMES = 5
+
+    def __init__(self, output_dir: Optional[str] = None, duration: float = DEFAULT_DURATION):
+        self._output_dir = output_dir or tempfile.gettempdir()
+        self._duration = duration
+
+        self._lock = threading.Lock()
+        self._requested_duration = None  # type: Optional[float]
+
+        self._profile = None  # type: Optional[cProfile.Profile]
+        self._snapshot = None  # type: Optional[tracemalloc.Snapshot]
+        self._started_tracemalloc = False
+        self._started = None  # type: Optional[datetime.datetime]
+        self._end_time = None  # type: Optional[float]
+
+    def set_options(self, output_dir: Optional[str], duration: float):
+        """Applies to the next profiling session."""
+        self._output_dir = output_dir or tempfile.gettempdir()
+        self._duration = duration
+
+    def is_running(self) -> bool:
+        return self._profile is not None
+
+    def request(self, duration: Optional[float] = None):
+        """Thread safe (signal handlers, MQTT thread); the profiling starts with the next `poll` (loop thread)."""
+        with self._lock:
+            self._requested_duration = duration or self._duration
+
+    def poll(self) -> Optional[str]:
+        """To be called by the profiled thread. Returns the report path when a profiling session was finished."""
+        with self._lock:
+            requested_duration, self._requested_duration = self._requested_duration, None
+
+        if self._profile is not None:
+            if requested_duration is not None:
+                _logger.warning("profiling is running already (request ignored)")
+            if time.monotonic() >= self._end_time:
+                return self.stop()
+        elif requested_duration is not None:
+            self.start(requested_duration)
+        return None
+
+    def start(self, duration: float):
+        """Profiles the calling thread only (`tracemalloc` covers all threads)."""
+        import cProfile
+        import tracemalloc
+
+        self._started_tracemalloc = not tracemalloc.is_tracing()
+        if self._started_tracemalloc:
+            tracemalloc.start(self.TRACEMALLOC_FRAMES)
+        self._snapshot = tracemalloc.take_snapshot()
+
+        self._started = datetime.datetime.now()
+        self._end_time = time.monotonic() + duration
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        _logger.info("profiling started (%.0fs)", duration)
+
+    def stop(self) -> Optional[str]:
+        profile, self._profile = self._profile, None
+        if profile is None:
+            return None
+        profile.disable()
+
+        import tracemalloc
+
+        snapshot_before, self._snapshot = self._snapshot, None
+        snapshot_after = tracemalloc.take_snapshot()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+        try:
+            os.makedirs(self._output_dir, exist_ok=True)
+            base_path = os.path.join(self._output_dir, "profile-" + self._started.strftime("%Y%m%d-%H%M%S"))
+            profile.dump_stats(base_path + ".pstats")
+
+            report_path = base_path + ".txt"
+            with open(report_path, "w", encoding="utf-8") as file:
+                file.write(self.format_report(profile, snapshot_before, snapshot_after))
+        except OSError as ex:
+            _logger.error("could not write the profiling results (%s)! %s", self._output_dir, ex)
+            return None
+
+        _logger.info("profiling finished => %s", report_path)
+        return report_path
+
+    @classmethod
+    def format_report(cls, profile: 'cProfile.Profile', snapshot_before: 'tracemalloc.Snapshot',
+                      snapshot_after: 'tracemalloc.Snapshot') -> str:
+        import pstats
+        import tracemalloc
+
+        stream = io.StringIO()
+
+        stream.write("CPU (cumulative)\n")
+        stats = pstats.Stats(profile, stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(cls.REPORT_LINES)
+
+        stream.write("\nMemory (allocation diff)\n\n")
+        snapshot_filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        snapshot_after = snapshot_after.filter_traces(snapshot_filters)
+        snapshot_before = snapshot_before.filter_traces(snapshot_filters)
+        for stat in snapshot_after.compare_to(snapshot_before, "lineno")[:cls.REPORT_LINES]:
+            stream.write(f"{stat}\n")
+
+        return stream.getvalue()
@@ -0,0 +1,31 @@
+import logging
+import time
+from typing import Dict
+
+_logger = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    """
+    Tracks startup milestones relative to the first import of this module (the entry point imports it first).
+    The service relies on crash-and-restart, so the startup time directly adds to data gaps.
+    """
+
+    _started = time.monotonic()
+    _milestones = {}  # type: Dict[str, float]
+
+    @classmethod
+    def elapsed(cls) -> float:
+        return time.monotonic() - cls._started
+
+    @classmethod
+    def mark(cls, milestone: str):
+        """Records the first occurrence of a milestone only."""
+        if milestone not in cls._milestones:
+            elapsed = cls.elapsed()
+            cls._milestones[milestone] = elapsed
+            _logger.info("startup: %s after %.3fs", milestone, elapsed)
+
+    @classmethod
+    def get_milestones(cls) -> Dict[str, float]:
+        return dict(cls._milestones)
@@ -1,11 +1,37 @@
+import contextlib
 import datetime
-
-from tzlocal import get_localzone
+from typing import Optional
 
 
 class TimeUtils:
 
+    _frozen_now = None  # type: Optional[datetime.datetime]
+
     @classmethod
     def now(cls) -> datetime.datetime:
         """overwrite/mock in test"""
-        return datetime.datetime.now(tz=get_localzone())
+        if cls._frozen_now is not None:
+            return cls._frozen_now
+        return datetime.datetime.now(tz=cls.get_localzone())
+
+    @classmethod
+    def get_localzone(cls):
+        """`tzlocal` is imported on demand (startup time)."""
+        from tzlocal import get_localzone
+
+        return get_localzone()
+
+    @classmethod
+    @contextlib.contextmanager
+    def frozen(cls, now: datetime.datetime):
+        """Lets `now` deliver a fixed time (e.g. the capture time while replaying archived data)."""
+        previous = cls._frozen_now
+        cls._frozen_now = now
+        try:
+            yield now
+        finally:
+            cls._frozen_now = previous
+
+    @classmethod
+    def from_timestamp(cls, timestamp: float) -> datetime.datetime:
+        return datetime.datetime.fromtimestamp(timestamp, tz=cls.get_localzone())
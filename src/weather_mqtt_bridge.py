@@ -1,98 +1,197 @@
 #!/usr/bin/env python3
+from src.utils.startup_timer import StartupTimer  # first import: reference time for startup measurements
+
 import logging
 import sys
 from typing import Optional
 
-import click
-
 from src.app_config import AppConfig
 from src.app_logging import AppLogging, LOGGING_CHOICES
 from src.fetcher.fetcher_factory import FetcherFactory
 from src.mqtt_client import MqttClient
 from src.runner import Runner
+from src.service import Service
 
 
 _logger = logging.getLogger(__name__)
 
 
-@click.command()
-@click.option(
-    "--json-schema",
-    is_flag=True,
-    help="Prints the config file JSON schema and exits."
-)
-@click.option(
-    "--config-file",
-    default="/etc/froggit-mqtt-logger.yaml",
-    help="Config file",
-    show_default=True,
-    # type=click.Path(exists=True),
-)
-@click.option(
-    "--log-file",
-    help="Log file (if stated journal logging is disabled)"
-)
-@click.option(
-    "--log-level",
-    help="Log level",
-    type=click.Choice(LOGGING_CHOICES, case_sensitive=False),
-)
-@click.option(
-    "--print-logs",
-    is_flag=True,
-    help="Prints log output to console too"
-)
-@click.option(
-    "--systemd-mode",
-    is_flag=True,
-    help="Systemd/journald integration: skip timestamp + prints to console"
-)
-def _main(json_schema, config_file, log_file, log_level, print_logs, systemd_mode):
+def create_command():
+    """The command line interface; `click` is imported here, not with the module (startup time)."""
+    import click
+
+    @click.command()
+    @click.option(
+        "--json-schema",
+        is_flag=True,
+        help="Prints the config file JSON schema and exits."
+    )
+    @click.option(
+        "--config-file",
+        default="/etc/froggit-mqtt-logger.yaml",
+        help="Config file",
+        show_default=True,
+        # type=click.Path(exists=True),
+    )
+    @click.option(
+        "--schema-cache-dir",
+        help="Remembers the checked config schema (by hash) to speed up the startup (optional)."
+    )
+    @click.option(
+        "--log-file",
+        help="Log file (if stated journal logging is disabled)"
+    )
+    @click.option(
+        "--log-level",
+        help="Log level",
+        type=click.Choice(LOGGING_CHOICES, case_sensitive=False),
+    )
+    @click.option(
+        "--print-logs",
+        is_flag=True,
+        help="Prints log output to console too"
+    )
+    @click.option(
+        "--systemd-mode",
+        is_flag=True,
+        help="Systemd/journald integration: skip timestamp + prints to console"
+    )
+    @click.option(
+        "--supervise",
+        "supervisor_config_file",
+        help="Supervisor mode: runs the stations of this supervisor config file sharded in several worker processes."
+    )
+    @click.option(
+        "--replay",
+        "replay_path",
+        help="Replays archived captures (directory or tar of pages, JSONL of pages/raw values) instead of running the service."
+    )
+    @click.option(
+        "--replay-output",
+        help="Writes replay results as JSONL to this file ('-' for stdout)."
+    )
+    @click.option(
+        "--replay-mqtt",
+        is_flag=True,
+        help="Publishes replay results to MQTT (like the service does)."
+    )
+    @click.option(
+        "--replay-speed",
+        type=float,
+        default=0,
+        show_default=True,
+        help="Replay acceleration factor relative to the original fetch intervals (0 == as fast as possible)."
+    )
+    def _main(json_schema, config_file, schema_cache_dir, log_file, log_level, print_logs, systemd_mode,
+              supervisor_config_file, replay_path, replay_output, replay_mqtt, replay_speed):
+        try:
+            if json_schema:
+                AppConfig.print_config_file_json_schema()
+            elif supervisor_config_file:
+                run_supervisor(supervisor_config_file, schema_cache_dir, log_file, log_level, print_logs, systemd_mode)
+            elif replay_path:
+                run_replay(config_file, schema_cache_dir, log_file, log_level, print_logs,
+                           replay_path, replay_output, replay_mqtt, replay_speed)
+            else:
+                run_service(config_file, schema_cache_dir, log_file, log_level, print_logs, systemd_mode)
+
+        except KeyboardInterrupt:
+            pass
+
+        except Exception as ex:
+            _logger.exception(ex)
+            sys.exit(1)  # a simple return is not understood by click
+
+    return _main
+
+
+def run_service(config_file, schema_cache_dir, log_file, log_level, print_logs, systemd_mode):
+    """Runs the service of one weather station (fetch, publish to MQTT, sinks) until it is stopped."""
+
+    try:
+        app_config = AppConfig(config_file, schema_cache_dir)
+        AppLogging.configure(
+            app_config.get_logging_config(),
+            log_file, log_level, print_logs, systemd_mode
+        )
+
+        _logger.debug("start")
+        _logger.debug("config loaded in %.1fms, validated in %.1fms", app_config.load_time * 1000, app_config.validation_time * 1000)
+        StartupTimer.mark("config loaded")
+
+        service = Service(app_config, config_file, schema_cache_dir)
+        service.run()
+
+    finally:
+        _logger.info("shutdown")
+
+
+def run_supervisor(supervisor_config_file, schema_cache_dir, log_file, log_level, print_logs, systemd_mode):
+    """Runs many stations sharded in worker processes (a crash of one shard doesn't restart the whole fleet)."""
+    from src.supervisor.supervisor import Supervisor, SupervisorConfig
+
     try:
-        if json_schema:
-            AppConfig.print_config_file_json_schema()
-        else:
-            run_service(config_file, log_file, log_level, print_logs, systemd_mode)
+        supervisor_config = SupervisorConfig(supervisor_config_file)
+        logging_config = supervisor_config.get_logging_config()
+        AppLogging.configure(logging_config, log_file, log_level, print_logs, systemd_mode)
+
+        logging_options = (logging_config, log_file or logging_config.get("log_file"), log_level, print_logs, systemd_mode)
+        supervisor = Supervisor(supervisor_config, schema_cache_dir, logging_options)
+        supervisor.run()
 
-    except KeyboardInterrupt:
-        pass
+    finally:
+        _logger.info("shutdown")
 
-    except Exception as ex:
-        _logger.exception(ex)
-        sys.exit(1)  # a simple return is not understood by click
 
+def run_replay(config_file, schema_cache_dir, log_file, log_level, print_logs, replay_path, replay_output, replay_mqtt, replay_speed):
+    """Streams archived captures through the fetcher pipeline (e.g. for reprocessing after a transformation was fixed)."""
+    from src.replay import ReplayPipeline, ReplaySource
 
-def run_service(config_file, log_file, log_level, print_logs, systemd_mode):
-    """Logs MQTT messages to a Postgres database."""
+    if not replay_output and not replay_mqtt:
+        import click
 
-    runner = None  # type: Optional[Runner]
+        raise click.UsageError("replay needs an output: --replay-output and/or --replay-mqtt")
 
     mqtt_client = None
-    # self._mqtt = MqttClient(app_config.get_mqtt_config())
+    output_stream = None
 
     try:
-        app_config = AppConfig(config_file)
-        AppLogging.configure(
-            app_config.get_logging_config(),
-            log_file, log_level, print_logs, systemd_mode
-        )
+        app_config = AppConfig(config_file, schema_cache_dir)
+        AppLogging.configure(app_config.get_logging_config(), log_file, log_level, print_logs, False)
 
-        _logger.debug("start")
-
-        runner_config = app_config.get_runner_config()
         fetcher_factory = FetcherFactory(app_config.get_fetcher_config())
+        pipeline = ReplayPipeline(fetcher_factory)
+        results = pipeline.process(ReplaySource.iter_captures(replay_path))
+
+        if replay_output:
+            output_stream = sys.stdout if replay_output == "-" else open(replay_output, "w", encoding="utf-8")
+
+            if replay_mqtt:
+                results = _tee_results(pipeline, results, output_stream)
+            else:
+                count = pipeline.write_results(results, output_stream)
+                _logger.info("%d captures replayed", count)
+                return
+
         mqtt_client = MqttClient(app_config.get_mqtt_config())
+        mqtt_client.connect()
+        mqtt_client.wait_for_connection(Runner.TIME_LIMIT_MQTT_CONNECTION)
 
-        runner = Runner(runner_config, fetcher_factory, mqtt_client)
-        runner.run()
+        count = pipeline.publish_results(results, mqtt_client, app_config.get_runner_config(), replay_speed)
+        _logger.info("%d captures replayed", count)
 
     finally:
-        _logger.info("shutdown")
-        if runner is not None:
-            runner.close()
         if mqtt_client is not None:
             mqtt_client.close()
+        if output_stream is not None and output_stream is not sys.stdout:
+            output_stream.close()
+
+
+def _tee_results(pipeline, results, output_stream):
+    for result in results:
+        pipeline.write_results([result], output_stream)
+        yield result
 
 
 if __name__ == '__main__':
-    _main()  # exit codes must be handled by click!
+    create_command()()  # exit codes must be handled by click!
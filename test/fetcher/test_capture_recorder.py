@@ -0,0 +1,63 @@
+import datetime
+import glob
+import os
+import unittest
+
+from src.fetcher.capture_recorder import CaptureRecorder
+from src.replay import ReplaySource
+from test.setup_test import SetupTest
+
+
+class TestCaptureRecorder(unittest.TestCase):
+
+    def test_rotation_and_replay(self):
+        record_dir = SetupTest.ensure_clean_dir(SetupTest.get_test_path("captures"))
+        page = "<html>" + "x" * 1000 + "</html>"
+        fetched = datetime.datetime(2022, 1, 8, 10, 0, 0, tzinfo=datetime.timezone.utc)
+
+        recorder = CaptureRecorder(record_dir, max_bytes=2500, max_segments=2)
+        for i in range(7):
+            recorder.record(fetched + datetime.timedelta(seconds=i), 0.25, page.encode())
+        recorder.close()
+
+        self.assertEqual(recorder.dropped, 0)
+
+        segment_paths = sorted(glob.glob(os.path.join(record_dir, CaptureRecorder.FILE_PREFIX + "*.jsonl.gz")))
+        self.assertEqual(len(segment_paths), 2)  # 3 records per segment => 3 segments, the oldest is removed
+
+        captures = list(ReplaySource.iter_captures(record_dir))
+        self.assertEqual(len(captures), 4)
+        self.assertEqual(captures[0].fetched, fetched + datetime.timedelta(seconds=3))
+        self.assertEqual(captures[-1].page, page)
+
+    def test_shared_record_dir(self):
+        record_dir = SetupTest.ensure_clean_dir(SetupTest.get_test_path("captures_shared"))
+        page = "<html>" + "x" * 1000 + "</html>"
+        fetched = datetime.datetime(2022, 1, 8, 10, 0, 0, tzinfo=datetime.timezone.utc)
+
+        recorders = [CaptureRecorder(record_dir, max_bytes=2500, max_segments=2, name=name) for name in ["gw", "gw-2"]]
+        for i in range(7):
+            for recorder in recorders:
+                recorder.record(fetched + datetime.timedelta(seconds=i), 0.25, page.encode())
+        for recorder in recorders:
+            recorder.close()
+
+        for name in ["gw", "gw-2"]:
+            pattern = os.path.join(record_dir, CaptureRecorder.get_file_prefix(name) + "*.jsonl.gz")
+            self.assertEqual(len(glob.glob(pattern)), 2, name)  # each station keeps its own segments
+        self.assertEqual(len(os.listdir(record_dir)), 4)
+
+        self.assertEqual(CaptureRecorder.get_file_prefix("192.168.1.10:80"), "capture-192.168.1.10_80-")
+        self.assertEqual(CaptureRecorder.get_file_prefix(None), CaptureRecorder.FILE_PREFIX)
+
+    def test_binary_page(self):
+        record_dir = SetupTest.ensure_clean_dir(SetupTest.get_test_path("captures_binary"))
+        page = b"\xff\xff\x27\x00\x07\x01\x00\xdd\x2c"  # no UTF-8
+        fetched = datetime.datetime(2022, 1, 8, 10, 0, 0, tzinfo=datetime.timezone.utc)
+
+        recorder = CaptureRecorder(record_dir, compression="none")
+        recorder.record(fetched, 0.01, page)
+        recorder.close()
+
+        captures = list(ReplaySource.iter_captures(record_dir))
+        self.assertEqual([capture.page for capture in captures], [page])
@@ -0,0 +1,95 @@
+import datetime
+import unittest
+
+from src.fetcher.circuit_breaker import CircuitBreaker, CircuitState
+from src.fetcher.fetcher_job import FetcherException
+from src.fetcher.fetcher_key import FetcherKey
+from src.fetcher.fetcher_status import FetcherStatus
+from src.fetcher.froggit_wh2600_job import FroggitWh2600Job
+from src.fetcher.time_series_manager import TimeSeriesManager
+from src.utils.time_utils import TimeUtils
+from test.setup_test import SetupTest
+
+
+class _MockedFetcherJob(FroggitWh2600Job):
+    """The station is reachable if `station["online"]`."""
+
+    def __init__(self, config, circuit_breaker, station):
+        super().__init__(config, TimeSeriesManager(), circuit_breaker=circuit_breaker)
+        self._station = station
+
+    def _load_page(self) -> str:
+        self._station["loads"] += 1
+        if not self._station["online"]:
+            raise FetcherException("could not connect")
+        return SetupTest.load_froggit_mocked_html("froggit_livedata_firmware_4.6.2.html")
+
+    def probe(self):
+        self._station["probes"] += 1
+        if not self._station["online"]:
+            raise FetcherException("not reachable")
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    # the successful fetch (after 100s) must match the delivery time of the mocked page
+    START = (SetupTest.get_froggit_test_time().replace(tzinfo=datetime.timezone(datetime.timedelta(hours=2))) -
+             datetime.timedelta(seconds=100))
+
+    def at(self, seconds):
+        return TimeUtils.frozen(self.START + datetime.timedelta(seconds=seconds))
+
+    def test_states(self):
+        breaker = CircuitBreaker(failure_threshold=2, open_time=30, max_open_time=100)
+
+        with self.at(0):
+            breaker.record_failure()
+            self.assertEqual(breaker.state, CircuitState.CLOSED)
+            breaker.record_success()  # resets the failure count
+            breaker.record_failure()
+            self.assertEqual(breaker.state, CircuitState.CLOSED)
+            breaker.record_failure()
+            self.assertEqual(breaker.state, CircuitState.OPEN)
+            self.assertFalse(breaker.allow_request())
+
+        with self.at(30):
+            self.assertEqual(breaker.state, CircuitState.HALF_OPEN)
+            self.assertTrue(breaker.allow_request())
+            breaker.record_failure()  # failed probe => 60s
+            self.assertEqual(breaker.state, CircuitState.OPEN)
+
+        with self.at(89):
+            self.assertFalse(breaker.allow_request())
+        with self.at(90):
+            breaker.record_failure()  # => 100s (max)
+        with self.at(189):
+            self.assertEqual(breaker.state, CircuitState.OPEN)
+        with self.at(190):
+            self.assertEqual(breaker.state, CircuitState.HALF_OPEN)
+            breaker.record_success()
+            self.assertEqual(breaker.state, CircuitState.CLOSED)
+            self.assertEqual(breaker.get_statistics(), {"state": "closed", "failures": 0, "opened": 3, "openUntil": None})
+
+    def test_fetcher_job(self):
+        breaker = CircuitBreaker(failure_threshold=2, open_time=30)
+        station = {"online": False, "loads": 0, "probes": 0}
+        config = {"url": "dummy", "circuit_breaker": True}
+
+        def fetch(seconds):
+            with self.at(seconds):
+                return _MockedFetcherJob(config, breaker, station).fetch_safe()
+
+        self.assertEqual(fetch(0)[FetcherKey.CIRCUIT], CircuitState.CLOSED)
+        self.assertEqual(fetch(10), {FetcherKey.STATUS: FetcherStatus.ERROR, FetcherKey.CIRCUIT: CircuitState.OPEN})
+        self.assertEqual(fetch(20), {FetcherKey.STATUS: FetcherStatus.ERROR, FetcherKey.CIRCUIT: CircuitState.OPEN})
+        self.assertEqual(station, {"online": False, "loads": 2, "probes": 0})  # fail fast
+
+        self.assertEqual(fetch(40)[FetcherKey.CIRCUIT], CircuitState.OPEN)  # probe failed
+        self.assertEqual(station, {"online": False, "loads": 2, "probes": 1})
+
+        station["online"] = True
+        self.assertEqual(fetch(60)[FetcherKey.CIRCUIT], CircuitState.OPEN)  # next probe after 60s
+        values = fetch(100)
+        self.assertEqual(values[FetcherKey.STATUS], FetcherStatus.OK)
+        self.assertEqual(values[FetcherKey.CIRCUIT], CircuitState.CLOSED)
+        self.assertEqual(station, {"online": True, "loads": 3, "probes": 2})
@@ -0,0 +1,111 @@
+import socketserver
+import struct
+import threading
+import unittest
+
+from src.fetcher.ecowitt_gw1000_job import EcowittGw1000Job
+from src.fetcher.fetcher_factory import FetcherFactory
+from src.fetcher.fetcher_job import FetcherException
+from src.fetcher.fetcher_key import FetcherKey
+from src.fetcher.fetcher_status import FetcherStatus
+
+
+def encode_livedata(data: bytes) -> bytes:
+    body = bytes([EcowittGw1000Job.CMD_GW1000_LIVEDATA]) + struct.pack(">H", len(data) + 4) + data
+    return EcowittGw1000Job.HEADER + body + bytes([sum(body) & 0xFF])
+
+
+SAMPLE_DATA = b"".join([
+    b"\x01" + struct.pack(">h", 221),  # temp inside 22.1
+    b"\x06" + struct.pack(">B", 45),  # humidity inside
+    b"\x08" + struct.pack(">H", 9912),  # pressure abs 991.2
+    b"\x09" + struct.pack(">H", 10215),  # pressure rel 1021.5
+    b"\x02" + struct.pack(">h", -35),  # temp outside -3.5
+    b"\x07" + struct.pack(">B", 87),  # humidity outside
+    b"\x0A" + struct.pack(">H", 322),  # wind direction
+    b"\x0B" + struct.pack(">H", 20),  # wind speed 2.0 m/s
+    b"\x0C" + struct.pack(">H", 31),  # gust 3.1 m/s
+    b"\x15" + struct.pack(">I", 194920),  # light 19492.0 lux
+    b"\x16" + struct.pack(">H", 123),  # UV (skipped)
+    b"\x17" + struct.pack(">B", 2),  # UVI
+    b"\x0E" + struct.pack(">H", 12),  # rain rate 1.2
+    b"\x13" + struct.pack(">I", 1756),  # rain year 175.6
+    b"\x4C" + bytes(16),  # battery flags (skipped)
+])
+
+
+class FakeGateway(socketserver.TCPServer):
+    """Answers `CMD_GW1000_LIVEDATA` requests with a fixed packet (split into small chunks)."""
+
+    allow_reuse_address = True
+
+    def __init__(self, packet: bytes):
+        super().__init__(("127.0.0.1", 0), _FakeGatewayHandler)
+        self.packet = packet
+        self.requests = []
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"tcp://127.0.0.1:{self.server_address[1]}"
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
+
+
+class _FakeGatewayHandler(socketserver.BaseRequestHandler):
+
+    def handle(self):
+        self.server.requests.append(self.request.recv(5))
+        packet = self.server.packet
+        for i in range(0, len(packet), 16):
+            self.request.sendall(packet[i:i + 16])
+
+
+class TestEcowittGw1000Job(unittest.TestCase):
+
+    def test_decode(self):
+        values = EcowittGw1000Job.decode_livedata(encode_livedata(SAMPLE_DATA))
+        self.assertEqual(values, {
+            FetcherKey.TEMP_INSIDE: 22.1,
+            FetcherKey.HUMI_INSIDE: 45,
+            FetcherKey.PRESSURE_ABS: 991.2,
+            FetcherKey.PRESSURE_REL: 1021.5,
+            FetcherKey.TEMP_OUTSIDE: -3.5,
+            FetcherKey.HUMI_OUTSIDE: 87,
+            FetcherKey.WIND_DIRECTION: 322,
+            FetcherKey.WIND_SPEED: 7.2,
+            FetcherKey.WIND_GUST: 11.16,
+            FetcherKey.SOLAR_RADIATION: 153.84,
+            FetcherKey.UVI: 2,
+            FetcherKey.RAIN_HOURLY: 1.2,
+            FetcherKey.RAIN_COUNTER: 175.6,
+        })
+
+    def test_decode_invalid(self):
+        packet = bytearray(encode_livedata(SAMPLE_DATA))
+        packet[-1] = (packet[-1] + 1) & 0xFF
+        with self.assertRaises(FetcherException):
+            EcowittGw1000Job.decode_livedata(bytes(packet))
+
+        # unknown item: the values before are kept
+        values = EcowittGw1000Job.decode_livedata(encode_livedata(b"\x01" + struct.pack(">h", 221) + b"\xEE\x00\x00"))
+        self.assertEqual(values, {FetcherKey.TEMP_INSIDE: 22.1})
+
+    def test_fetch_by_registry(self):
+        gateway = FakeGateway(encode_livedata(SAMPLE_DATA))
+        try:
+            fetcher_factory = FetcherFactory({"type": "ecowitt_gw1000", "url": gateway.url})
+            fetcher = fetcher_factory.create_fetcher_job()
+            self.assertIsInstance(fetcher, EcowittGw1000Job)
+
+            values = fetcher.fetch()
+        finally:
+            gateway.close()
+
+        self.assertEqual(gateway.requests, [b"\xff\xff\x27\x03\x2a"])
+        self.assertEqual(values[FetcherKey.STATUS], FetcherStatus.OK)
+        self.assertEqual(values[FetcherKey.TEMP_OUTSIDE], -3.5)
+        self.assertEqual(values[FetcherKey.WIND_GUST], 11.16)
+        self.assertEqual(values[FetcherKey.PRESSURE_REL], 1021.5)
@@ -0,0 +1,77 @@
+import unittest
+
+from src.fetcher.ecowitt_json_job import EcowittJsonJob
+from src.fetcher.fetcher_job import FetcherException
+from src.fetcher.fetcher_key import FetcherKey
+from src.fetcher.froggit_wh2600_job import FroggitWh2600Job
+from src.fetcher.time_series_manager import TimeSeriesManager
+from src.utils.time_utils import TimeUtils
+from test.setup_test import SetupTest
+
+
+class _MockedFetcherJob(EcowittJsonJob):
+
+    def _load_page(self) -> str:
+        return SetupTest.load_froggit_mocked_html("ecowitt_livedata_info.json")
+
+
+class TestEcowittJsonJob(unittest.TestCase):
+
+    EXPECTED_VALUES = {
+        FetcherKey.HUMI_INSIDE: 64.0,
+        FetcherKey.HUMI_OUTSIDE: 43.0,
+        FetcherKey.PRESSURE_ABS: 991.0,
+        FetcherKey.PRESSURE_REL: 1019.7,
+        FetcherKey.RAIN_COUNTER: 0.0,
+        FetcherKey.RAIN_HOURLY: 0.0,
+        FetcherKey.SOLAR_RADIATION: 637.87,
+        FetcherKey.STATUS: "ok",
+        FetcherKey.TEMP_INSIDE: 24.0,
+        FetcherKey.TEMP_OUTSIDE: 31.3,
+        FetcherKey.UVI: 4.0,
+        FetcherKey.WIND_DIRECTION: 121.0,
+        FetcherKey.WIND_GUST: 12.2,
+        FetcherKey.WIND_SPEED: 4.0,
+    }
+
+    def test_fetch(self):
+        fetcher = _MockedFetcherJob({"url": "dummy", "altitude": 255}, TimeSeriesManager())
+        self.assertEqual(fetcher.fetch(), self.EXPECTED_VALUES)
+
+        # same values as the HTML page (without timestamp and batteries)
+        with TimeUtils.frozen(SetupTest.get_froggit_test_time()):
+            html_values = FroggitWh2600Job({"url": "dummy", "altitude": 255}, None).extract_values(
+                SetupTest.load_froggit_mocked_html("froggit_livedata_firmware_4.6.2.html")
+            )
+        for key, value in self.EXPECTED_VALUES.items():
+            if key != FetcherKey.STATUS:
+                self.assertEqual(html_values[key], value, key)
+
+    def test_missing_and_empty_values(self):
+        page = '{"common_list": [{"id": "0x02", "val": "--.-"}, {"id": "0x07", "val": "43%"}], "wh25": []}'
+        values = EcowittJsonJob({"url": "dummy"}, None).extract_values(page)
+        self.assertEqual(values, {FetcherKey.HUMI_OUTSIDE: 43.0})
+
+    def test_imperial_units(self):
+        page = SetupTest.load_froggit_mocked_html("ecowitt_livedata_info_imperial.json")
+        values = EcowittJsonJob({"url": "dummy"}, TimeSeriesManager()).extract_values(page)
+        self.assertEqual(values, {
+            FetcherKey.HUMI_INSIDE: 64.0,
+            FetcherKey.HUMI_OUTSIDE: 43.0,
+            FetcherKey.PRESSURE_ABS: 990.86,
+            FetcherKey.PRESSURE_REL: 1019.64,
+            FetcherKey.RAIN_COUNTER: 313.44,
+            FetcherKey.RAIN_HOURLY: 0.51,
+            FetcherKey.SOLAR_RADIATION: 637.87,
+            FetcherKey.TEMP_INSIDE: 24.0,
+            FetcherKey.TEMP_OUTSIDE: 31.28,
+            FetcherKey.UVI: 4.0,
+            FetcherKey.WIND_DIRECTION: 121.0,
+            FetcherKey.WIND_GUST: 12.23,
+            FetcherKey.WIND_SPEED: 4.02,
+        })
+
+    def test_unknown_unit(self):
+        page = '{"common_list": [{"id": "0x15", "val": "45.2 Klux"}]}'
+        with self.assertRaises(FetcherException):
+            EcowittJsonJob({"url": "dummy"}, None).extract_values(page)
@@ -82,3 +82,35 @@ class TestFroggitWh2600Job(unittest.TestCase):
 
         fetcher_values = fetcher.fetch()
         self.assertEqual(self.EXPECTED_VALUES, fetcher_values)
+
+    @mock.patch('src.utils.time_utils.TimeUtils.now')
+    def test_derived_metrics(self, mocked_now):
+        time_series_manager = TimeSeriesManager()
+
+        config = {
+            "url": "dummy",
+            "altitude": 255,
+            "derived_metrics": True,
+        }
+
+        froggit_test_time = SetupTest.get_froggit_test_time()
+        froggit_test_time = froggit_test_time.replace(tzinfo=datetime.timezone(datetime.timedelta(hours=2)))
+        mocked_now.return_value = froggit_test_time
+
+        fetcher = _MockedFetcherJob(config, time_series_manager, "froggit_livedata_firmware_4.6.2.html")
+        fetcher_values = fetcher.fetch()
+
+        expected = dict(self.EXPECTED_VALUES)
+        expected.update({
+            FetcherKey.DEW_POINT: 17.2,
+            FetcherKey.FEELS_LIKE: 31.8,
+            FetcherKey.HEAT_INDEX: 31.8,
+            FetcherKey.HUMI_ABSOLUTE: 14.0,
+            FetcherKey.RAIN_RATE: None,  # needs a second sample
+        })
+        self.assertEqual(expected, fetcher_values)
+
+        # the rain rate is derived from the counter samples of the former fetches
+        mocked_now.return_value = froggit_test_time + datetime.timedelta(minutes=1)
+        fetcher = _MockedFetcherJob(config, time_series_manager, "froggit_livedata_firmware_4.6.2.html")
+        self.assertEqual(fetcher.fetch()[FetcherKey.RAIN_RATE], 0.0)
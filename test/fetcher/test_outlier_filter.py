@@ -0,0 +1,56 @@
+import random
+import unittest
+
+from src.fetcher.fetcher_key import FetcherKey
+from src.fetcher.outlier_filter import OutlierFilter, _RollingWindow
+
+
+class TestRollingWindow(unittest.TestCase):
+
+    def test_median_and_mad(self):
+        rand = random.Random(4711)
+        window = _RollingWindow(25)
+        values = []
+
+        for _ in range(200):
+            value = rand.choice([rand.randint(0, 5), rand.random() * 10])
+            window.add(value)
+            values = (values + [value])[-25:]
+
+            sorted_values = sorted(values)
+            median = sorted_values[(len(sorted_values) - 1) // 2]
+            deviations = sorted(abs(v - median) for v in values)
+            self.assertEqual(window.median(), median)
+            self.assertAlmostEqual(window.mad(), deviations[(len(deviations) - 1) // 2])
+
+
+class TestOutlierFilter(unittest.TestCase):
+
+    def filter(self, outlier_filter, temp, pressure=990.0):
+        values = {FetcherKey.TEMP_OUTSIDE: temp, FetcherKey.PRESSURE_ABS: pressure, FetcherKey.BATTERY_OUTSIDE: "Normal"}
+        outlier_filter.filter(values)
+        return values[FetcherKey.TEMP_OUTSIDE], values[FetcherKey.PRESSURE_ABS]
+
+    def test_bounds_and_spikes(self):
+        outlier_filter = OutlierFilter()
+
+        self.assertEqual(self.filter(outlier_filter, 20.0, 0.0), (20.0, None))  # out of bounds
+
+        for i in range(OutlierFilter.MIN_SAMPLES):
+            self.assertEqual(self.filter(outlier_filter, 20.0 + (i % 3) * 0.1), (20.0 + (i % 3) * 0.1, 990.0))
+
+        self.assertEqual(self.filter(outlier_filter, 99.9), (None, 990.0))  # out of bounds
+        self.assertEqual(self.filter(outlier_filter, 45.0), (None, 990.0))  # spike
+        self.assertEqual(self.filter(outlier_filter, 23.0), (23.0, 990.0))
+
+        self.assertEqual(outlier_filter.get_statistics(), {FetcherKey.PRESSURE_ABS: 1, FetcherKey.TEMP_OUTSIDE: 2})
+
+    def test_persistent_change(self):
+        outlier_filter = OutlierFilter()
+        for _ in range(OutlierFilter.MIN_SAMPLES):
+            self.filter(outlier_filter, 20.0)
+
+        for _ in range(OutlierFilter.MAX_CONSECUTIVE_REJECTIONS):
+            self.assertEqual(self.filter(outlier_filter, 5.0)[0], None)
+        self.assertEqual(self.filter(outlier_filter, 5.0)[0], 5.0)  # accepted as real change
+        self.assertEqual(self.filter(outlier_filter, 5.1)[0], 5.1)
@@ -0,0 +1,58 @@
+import asyncio
+import time
+import unittest
+
+from src.fetcher.fetcher_key import FetcherKey
+from src.fetcher.fetcher_status import FetcherStatus
+from src.fetcher.froggit_wh2600_job import FroggitWh2600Job
+from src.fetcher.parse_pool import ParsePool
+from src.fetcher.time_series_manager import TimeSeriesManager
+from test.setup_test import SetupTest
+
+
+class TestParsePool(unittest.TestCase):
+
+    def test_extract_in_worker(self):
+        page = SetupTest.load_froggit_mocked_html("froggit_livedata_firmware_4.6.2.html")
+        page = page.replace("14:04 8/25/2019", time.strftime("%H:%M %m/%d/%Y"))  # the worker checks with real time
+        config = {"url": "dummy", "altitude": 255}
+
+        parse_pool = ParsePool(1)
+        try:
+            time_series_manager = TimeSeriesManager()
+            fetcher = FroggitWh2600Job(config, time_series_manager, parse_pool=parse_pool)
+            values = fetcher.process_page(page)
+
+            fetcher = FroggitWh2600Job(config, TimeSeriesManager(), parse_pool=parse_pool)
+            loop = asyncio.new_event_loop()
+            try:
+                values_async = loop.run_until_complete(fetcher.process_page_async(page))
+            finally:
+                loop.close()
+
+            expected = FroggitWh2600Job(config, TimeSeriesManager()).process_page(page)
+        finally:
+            parse_pool.close()
+
+        self.assertEqual(values[FetcherKey.STATUS], FetcherStatus.OK)
+        self.assertEqual(values, expected)
+        self.assertEqual(values_async, expected)
+        self.assertEqual(values[FetcherKey.WIND_GUST], 12.2)  # time series in the main process
+
+    def test_shared_pool(self):
+        first = ParsePool.acquire(1)
+        second = ParsePool.acquire(2)  # grows
+        try:
+            self.assertIs(first, second)
+            self.assertEqual(first.workers, 2)
+        finally:
+            ParsePool.release(first)
+        self.assertIs(ParsePool.acquire(1), second)  # still used
+        ParsePool.release(second)
+        ParsePool.release(second)  # the last user closes the pool
+
+        third = ParsePool.acquire(1)
+        try:
+            self.assertIsNot(third, first)
+        finally:
+            ParsePool.release(third)
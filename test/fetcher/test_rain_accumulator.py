@@ -0,0 +1,50 @@
+import datetime
+import os
+import unittest
+
+from src.fetcher.fetcher_key import FetcherKey
+from src.fetcher.rain_accumulator import RainAccumulator
+from src.utils.time_utils import TimeUtils
+from test.setup_test import SetupTest
+
+
+class TestRainAccumulator(unittest.TestCase):
+
+    START = datetime.datetime(2022, 1, 8, 22, 30, 0, tzinfo=datetime.timezone.utc)
+
+    def collect(self, accumulator, minutes, counter):
+        with TimeUtils.frozen(self.START + datetime.timedelta(minutes=minutes)):
+            values = accumulator.collect(counter)
+        return values[FetcherKey.RAIN_HOUR], values[FetcherKey.RAIN_DAY], values[FetcherKey.RAIN_24H]
+
+    def test_accumulation(self):
+        accumulator = RainAccumulator()
+
+        self.assertEqual(self.collect(accumulator, 0, None), (None, None, None))
+        self.assertEqual(self.collect(accumulator, 1, 100.0), (0.0, 0.0, 0.0))
+        self.assertEqual(self.collect(accumulator, 10, 101.5), (1.5, 1.5, 1.5))
+        self.assertEqual(self.collect(accumulator, 40, 102.0), (0.5, 2.0, 2.0))  # next hour
+        self.assertEqual(self.collect(accumulator, 95, 0.5), (0.5, 0.5, 2.5))  # next day (UTC), counter reset
+        self.assertEqual(self.collect(accumulator, 95 + 24 * 60, 0.5), (0.0, 0.0, 0.0))  # a day later
+
+        # gap > 24h: all buckets elapsed
+        self.assertEqual(self.collect(accumulator, 95 + 50 * 60, 1.0), (0.5, 0.5, 0.5))
+
+    def test_persistence(self):
+        test_dir = SetupTest.ensure_clean_dir(SetupTest.get_test_path("rain"))
+        state_file = os.path.join(test_dir, "rain-state.json")
+
+        accumulator = RainAccumulator()
+        accumulator.set_state_file(state_file)
+        self.collect(accumulator, 1, 100.0)
+        self.collect(accumulator, 10, 101.5)
+
+        accumulator = RainAccumulator()
+        accumulator.set_state_file(state_file)
+        self.assertEqual(self.collect(accumulator, 20, 102.0), (2.0, 2.0, 2.0))
+
+        with open(state_file, "w") as stream:
+            stream.write("{broken")
+        accumulator = RainAccumulator()
+        accumulator.set_state_file(state_file)
+        self.assertEqual(self.collect(accumulator, 25, 102.0), (0.0, 0.0, 0.0))
@@ -0,0 +1,116 @@
+import http.server
+import threading
+import time
+import unittest
+
+from src.fetcher.fetcher_job import FetcherException
+from src.fetcher.froggit_wh2600_job import FroggitWh2600Job
+from src.fetcher.request_policy import RequestPolicy
+
+
+class _FlakyLoad:
+    """Sleeps `delays[call]` (if given), fails for the calls in `failures`, returns the call number otherwise."""
+
+    def __init__(self, failures=(), delays=()):
+        self.failures = failures
+        self.delays = delays
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            call = self.calls
+            self.calls += 1
+        if call < len(self.delays):
+            time.sleep(self.delays[call])
+        if call in self.failures:
+            raise FetcherException(f"failure {call}")
+        return call
+
+
+class TestRequestPolicy(unittest.TestCase):
+
+    def test_retries(self):
+        policy = RequestPolicy(retries=2, retry_delay=0.01)
+        self.assertEqual(policy.execute(_FlakyLoad(failures=(0, 1))), 2)
+        self.assertEqual(policy.get_statistics()["retried"], 2)
+
+        with self.assertRaises(FetcherException):
+            policy.execute(_FlakyLoad(failures=(0, 1, 2)))
+
+        with self.assertRaises(ZeroDivisionError):  # no retries for bugs
+            policy.execute(lambda: 1 / 0)
+
+    def test_hedging(self):
+        policy = RequestPolicy(hedging=True)
+        try:
+            self.assertIsNone(policy.get_hedge_delay())
+            for _ in range(RequestPolicy.HEDGE_MIN_SAMPLES):
+                policy.execute(_FlakyLoad())
+            self.assertLess(policy.get_hedge_delay(), 0.05)
+
+            started = time.monotonic()
+            self.assertEqual(policy.execute(_FlakyLoad(delays=[2.0])), 1)  # the first request hangs
+            self.assertLess(time.monotonic() - started, 1.0)
+            self.assertEqual(policy.get_statistics(), {"retried": 0, "hedged": 1, "hedgesWon": 1})
+
+            # the hedged request fails => the first one counts
+            self.assertEqual(policy.execute(_FlakyLoad(delays=[0.3], failures=[1])), 0)
+        finally:
+            policy.close()
+
+
+class _SlowHandler(http.server.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path == "/moved.htm":
+            self.send_response(301)
+            self.send_header("Location", "/livedata.htm")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = b"<html>" + b" " * 100 + b"</html>"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body) * 3))
+        self.end_headers()
+        for _ in range(3):  # trickles within the socket timeout, but exceeds the read deadline
+            self.wfile.write(body)
+            self.wfile.flush()
+            time.sleep(self.server.delay)
+
+    def log_message(self, *_args):
+        pass
+
+
+class TestHttpDeadlines(unittest.TestCase):
+
+    def setUp(self):
+        self.server = http.server.HTTPServer(("127.0.0.1", 0), _SlowHandler)
+        self.server.delay = 0.0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/livedata.htm"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_load_page(self):
+        job = FroggitWh2600Job({"url": self.url}, None)
+        self.assertEqual(len(job._load_page()), 3 * 113)
+
+    def test_read_deadline(self):
+        self.server.delay = 0.2
+        job = FroggitWh2600Job({"url": self.url, "read_timeout": 0.3}, None)
+        with self.assertRaisesRegex(FetcherException, "read timeout"):
+            job._load_page()
+
+    def test_redirect(self):
+        job = FroggitWh2600Job({"url": self.url.replace("livedata", "moved")}, None)
+        with self.assertRaisesRegex(FetcherException, r"redirected \(HTTP 301 => /livedata.htm\)"):
+            job._load_page()
+
+    def test_connect_error(self):
+        job = FroggitWh2600Job({"url": "http://127.0.0.1:1/livedata.htm", "connect_timeout": 0.5}, None)
+        with self.assertRaises(FetcherException):
+            job._load_page()
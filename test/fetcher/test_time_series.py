@@ -2,15 +2,18 @@ import unittest
 from datetime import timedelta, datetime
 from unittest import mock
 
-from src.fetcher.time_series import MaxTimeSeries
+from src.fetcher.time_series import MaxTimeSeries, RateTimeSeries, RingMaxTimeSeries
+from src.fetcher.time_series_manager import TimeSeriesManager
 
 
 class TestMaxTimeSeries(unittest.TestCase):
 
+    TIME_SERIES_CLASS = MaxTimeSeries
+
     @mock.patch('src.utils.time_utils.TimeUtils.now')
     def test_standard(self, mocked_now):
 
-        c = MaxTimeSeries("dummy", timedelta(seconds=20))
+        c = self.TIME_SERIES_CLASS("dummy", timedelta(seconds=20))
 
         mocked_now.return_value = datetime(2019, 1, 1, 1, 1, 0)
         s1 = None
@@ -42,3 +45,58 @@ class TestMaxTimeSeries(unittest.TestCase):
         s5 = 1
         so = c.collect_and_deliver(s5)
         self.assertEqual(so, s3)
+
+
+class TestRingMaxTimeSeries(TestMaxTimeSeries):
+
+    TIME_SERIES_CLASS = RingMaxTimeSeries
+
+    @mock.patch('src.utils.time_utils.TimeUtils.now')
+    def test_grow_and_wrap_around(self, mocked_now):
+        c = RingMaxTimeSeries("dummy", timedelta(seconds=100))
+        start = datetime(2019, 1, 1, 1, 0, 0)
+
+        values = [(i * 37) % 101 for i in range(1000)]  # pseudo random
+        for i, value in enumerate(values):
+            mocked_now.return_value = start + timedelta(seconds=i)
+            so = c.collect_and_deliver(value)
+            self.assertEqual(so, max(values[max(0, i - 100):i + 1]))
+
+        self.assertEqual(len(c), 101)
+        self.assertEqual(len(c._values), 128)  # grown once from 64, the ring was reused afterwards
+
+
+class TestRateTimeSeries(unittest.TestCase):
+
+    @mock.patch('src.utils.time_utils.TimeUtils.now')
+    def test_rate_and_reset(self, mocked_now):
+        c = RateTimeSeries("dummy", timedelta(minutes=10))
+        start = datetime(2019, 1, 1, 1, 0, 0)
+
+        mocked_now.return_value = start
+        self.assertEqual(c.collect_and_deliver(10.0), None)
+
+        mocked_now.return_value = start + timedelta(minutes=6)
+        self.assertEqual(c.collect_and_deliver(10.6), 6.0)  # 0.6 mm in 6 minutes
+
+        # counter reset
+        mocked_now.return_value = start + timedelta(minutes=7)
+        self.assertEqual(c.collect_and_deliver(0.0), None)
+
+        # gap: all former samples out of the window
+        mocked_now.return_value = start + timedelta(minutes=30)
+        self.assertEqual(c.collect_and_deliver(0.5), None)
+
+
+class TestTimeSeriesManager(unittest.TestCase):
+
+    def test_empty_ring_is_kept(self):
+        manager = TimeSeriesManager()
+        first = manager.get_or_add_time_series("fetcher", RingMaxTimeSeries("dummy", timedelta(seconds=100)))
+        self.assertEqual(len(first), 0)  # empty => falsy
+
+        second = manager.get_or_add_time_series("fetcher", RingMaxTimeSeries("dummy", timedelta(seconds=100)))
+        self.assertIs(second, first)
+
+        with self.assertRaises(RuntimeError):
+            manager.get_or_add_time_series("fetcher", MaxTimeSeries("dummy", timedelta(seconds=100)))
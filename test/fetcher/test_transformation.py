@@ -4,7 +4,8 @@ from unittest import mock
 
 from tzlocal import get_localzone
 
-from src.fetcher.transformation import RelPressureTransformation, GustTransformation, TimeStringTransformationChecker
+from src.fetcher.transformation import RelPressureTransformation, GustTransformation, TimeStringTransformationChecker, DerivedMetrics, \
+    DewPointMetric, FeelsLikeMetric, HeatIndexMetric, WindChillMetric
 
 
 class TestRelPressureTransformation(unittest.TestCase):
@@ -71,3 +72,29 @@ class TestTimeStringTransformationChecker(unittest.TestCase):
             with self.assertRaises(ValueError) as ex:
                 transformation.transform({"result_key": "14:02 8/25/2019"})
             self.assertTrue("outdated" in str(ex.exception))
+
+
+class TestDerivedMetrics(unittest.TestCase):
+
+    def test_evaluation_order(self):
+        feels_like = FeelsLikeMetric('feelsLike', 'temp', 'heatIndex', 'windChill')
+        heat_index = HeatIndexMetric('heatIndex', 'temp', 'humi')
+        wind_chill = WindChillMetric('windChill', 'temp', 'wind')
+        dew_point = DewPointMetric('dewPoint', 'temp', 'humi')
+
+        derived_metrics = DerivedMetrics([feels_like, dew_point, heat_index, wind_chill])
+        ordered = derived_metrics.metrics
+        self.assertLess(ordered.index(heat_index), ordered.index(feels_like))
+        self.assertLess(ordered.index(wind_chill), ordered.index(feels_like))
+
+        values = {'temp': -5.0, 'humi': 80.0, 'wind': 30.0}
+        derived_metrics.calculate(values)
+        self.assertEqual(values, {'temp': -5.0, 'humi': 80.0, 'wind': 30.0, 'windChill': -13.0, 'feelsLike': -13.0, 'dewPoint': -7.9})
+
+        values = {'temp': 15.0}  # no humidity, no wind
+        derived_metrics.calculate(values)
+        self.assertEqual(values, {'temp': 15.0, 'feelsLike': 15.0})
+
+    def test_cyclic_dependency(self):
+        with self.assertRaises(ValueError):
+            DerivedMetrics([FeelsLikeMetric('a', 't', 'b', 'c'), FeelsLikeMetric('b', 't', 'a', 'c')])
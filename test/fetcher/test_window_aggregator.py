@@ -0,0 +1,33 @@
+import datetime
+import unittest
+
+from src.fetcher.fetcher_key import FetcherKey
+from src.fetcher.window_aggregator import WindowAggregator
+
+
+class TestWindowAggregator(unittest.TestCase):
+
+    START = datetime.datetime(2022, 1, 8, 10, 0, 0, tzinfo=datetime.timezone.utc)
+
+    def collect(self, aggregator, seconds, values):
+        return aggregator.collect(self.START + datetime.timedelta(seconds=seconds), values)
+
+    def test_tumbling_windows(self):
+        aggregator = WindowAggregator(300)
+
+        self.assertIsNone(self.collect(aggregator, 10, {FetcherKey.TEMP_OUTSIDE: 10.0, FetcherKey.BATTERY_OUTSIDE: "Normal"}))
+        self.assertIsNone(self.collect(aggregator, 100, {FetcherKey.TEMP_OUTSIDE: 12.0, FetcherKey.STATUS: "ok"}))
+        self.assertIsNone(self.collect(aggregator, 200, None))  # failed fetch
+        self.assertIsNone(self.collect(aggregator, 290, {FetcherKey.TEMP_OUTSIDE: 11.5, FetcherKey.HUMI_OUTSIDE: 80.0}))
+
+        aggregated = self.collect(aggregator, 310, {FetcherKey.TEMP_OUTSIDE: 20.0})
+        self.assertEqual(aggregated["samples"], 3)
+        self.assertEqual(datetime.datetime.fromisoformat(aggregated["start"]), self.START)
+        self.assertEqual(datetime.datetime.fromisoformat(aggregated["end"]), self.START + datetime.timedelta(minutes=5))
+        self.assertEqual(aggregated[FetcherKey.TEMP_OUTSIDE], {"min": 10.0, "max": 12.0, "mean": 11.17, "last": 11.5})
+        self.assertEqual(aggregated[FetcherKey.HUMI_OUTSIDE], {"min": 80.0, "max": 80.0, "mean": 80.0, "last": 80.0})
+        self.assertNotIn(FetcherKey.BATTERY_OUTSIDE, aggregated)
+
+        self.assertEqual(self.collect(aggregator, 700, None)["samples"], 1)
+        # only failed fetches within the former window => nothing to deliver
+        self.assertIsNone(self.collect(aggregator, 1000, None))
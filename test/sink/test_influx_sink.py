@@ -0,0 +1,55 @@
+import datetime
+import socket
+import unittest
+
+from src.fetcher.fetcher_key import FetcherKey
+from src.fetcher.fetcher_status import FetcherStatus
+from src.sink.influx_sink import InfluxSink
+from src.sink.sink_config import InfluxConfKey
+
+
+class TestInfluxSink(unittest.TestCase):
+
+    FETCHED = datetime.datetime(2022, 1, 8, 10, 0, 0, 123456, tzinfo=datetime.timezone.utc)
+
+    VALUES = {
+        FetcherKey.STATUS: FetcherStatus.OK,
+        FetcherKey.TIMESTAMP: "2022-01-08T10:00:00",
+        FetcherKey.TEMP_OUTSIDE: 15.5,
+        FetcherKey.BATTERY_OUTSIDE: "Normal",
+        FetcherKey.UVI: None,
+        FetcherKey.CIRCUIT: "closed",
+    }
+
+    def test_format_line(self):
+        sink = InfluxSink({
+            InfluxConfKey.ADDRESS: "udp://localhost:8094",
+            InfluxConfKey.TAGS: {"station": "my garden"},
+        })
+
+        line = sink.format_line(self.FETCHED, self.VALUES)
+        self.assertEqual(line, 'weather,station=my\\ garden batteryOutside="Normal",tempOutside=15.5 1641636000123456000')
+
+        self.assertIsNone(sink.format_line(self.FETCHED, {FetcherKey.STATUS: FetcherStatus.TIMEOUT}))
+        self.assertIsNone(sink.format_line(self.FETCHED, {FetcherKey.STATUS: FetcherStatus.ERROR, FetcherKey.CIRCUIT: "open"}))
+
+    def test_udp_batch(self):
+        receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        receiver.bind(("127.0.0.1", 0))
+        receiver.settimeout(2)
+        port = receiver.getsockname()[1]
+
+        sink = InfluxSink({
+            InfluxConfKey.ADDRESS: f"udp://127.0.0.1:{port}",
+            InfluxConfKey.BATCH_SIZE: 2,
+        })
+        try:
+            sink.write(self.FETCHED, self.VALUES)
+            sink.write(self.FETCHED, self.VALUES)
+
+            packet = receiver.recv(65535)
+            self.assertEqual(len(packet.splitlines()), 2)
+            self.assertTrue(packet.startswith(b"weather "))
+        finally:
+            sink.close()
+            receiver.close()
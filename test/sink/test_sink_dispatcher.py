@@ -0,0 +1,56 @@
+import datetime
+import threading
+import unittest
+from typing import Dict
+
+from src.sink.sink import Sink
+from src.sink.sink_dispatcher import SinkDispatcher
+
+
+class _CollectingSink(Sink):
+
+    def __init__(self, name, blocker: threading.Event = None):
+        self._name = name
+        self.blocker = blocker
+        self.values = []
+        self.received = threading.Event()
+        self.closed = False
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def write(self, fetched: datetime.datetime, values: Dict[str, any]):
+        if self.blocker:
+            self.blocker.wait()
+        self.values.append(values["index"])
+        self.received.set()
+
+    def close(self):
+        self.closed = True
+
+
+class TestSinkDispatcher(unittest.TestCase):
+
+    def test_slow_sink_does_not_block(self):
+        blocker = threading.Event()
+        slow_sink = _CollectingSink("slow", blocker)
+        fast_sink = _CollectingSink("fast")
+
+        dispatcher = SinkDispatcher([slow_sink, fast_sink], queue_size=2)
+        fetched = datetime.datetime.now()
+
+        for index in range(10):
+            dispatcher.dispatch(fetched, {"index": index})
+
+        self.assertTrue(fast_sink.received.wait(1))  # while the slow sink is still blocked
+        statistics = dispatcher.get_statistics()
+        self.assertGreater(statistics["slow"]["dropped"], 0)
+
+        blocker.set()
+        dispatcher.close()
+
+        self.assertEqual(fast_sink.values[-1], 9)
+        self.assertEqual(slow_sink.values[-2:], [8, 9])  # the newest results survive
+        self.assertTrue(slow_sink.closed)
+        self.assertTrue(fast_sink.closed)
@@ -0,0 +1,61 @@
+import datetime
+import os
+import unittest
+
+from src.fetcher.fetcher_key import FetcherKey
+from src.fetcher.fetcher_status import FetcherStatus
+from src.sink.sink_config import SqliteConfKey
+from src.sink.sqlite_sink import SqliteSink
+from test.setup_test import SetupTest
+
+
+class TestSqliteSink(unittest.TestCase):
+
+    def setUp(self):
+        test_dir = SetupTest.ensure_clean_dir(SetupTest.get_test_path("sqlite_sink"))
+        self.sink = SqliteSink({
+            SqliteConfKey.DATABASE: os.path.join(test_dir, "history.db"),
+            SqliteConfKey.BATCH_SIZE: 3,
+            SqliteConfKey.DOWNSAMPLE_AFTER_DAYS: 1,
+            SqliteConfKey.DOWNSAMPLE_INTERVAL: 900,
+            SqliteConfKey.RETENTION_DAYS: 30,
+        })
+
+    def tearDown(self):
+        self.sink.close()
+
+    def test_write_query(self):
+        time_start = datetime.datetime(2022, 1, 8, 10, 0, 0, tzinfo=datetime.timezone.utc)
+        for i in range(5):
+            self.sink.write(time_start + datetime.timedelta(minutes=i), {
+                FetcherKey.STATUS: FetcherStatus.OK,
+                FetcherKey.TEMP_OUTSIDE: 10.0 + i,
+                FetcherKey.BATTERY_OUTSIDE: "Normal",
+                FetcherKey.UVI: None,
+                FetcherKey.CIRCUIT: "closed",
+            })
+
+        samples = self.sink.query(FetcherKey.TEMP_OUTSIDE, time_start + datetime.timedelta(minutes=1))
+        self.assertEqual([s.value for s in samples], [11.0, 12.0, 13.0, 14.0])
+        self.assertEqual(self.sink.query(FetcherKey.UVI, time_start), [])
+        self.assertEqual(self.sink.query(FetcherKey.STATUS, time_start), [])
+        self.assertEqual(self.sink.query(FetcherKey.CIRCUIT, time_start), [])
+
+        # 2 days later => downsampled
+        self.sink.maintain((time_start + datetime.timedelta(days=2)).timestamp())
+
+        self.assertEqual(self.sink.query(FetcherKey.TEMP_OUTSIDE, time_start), [])
+        downsampled = self.sink.query_downsampled(FetcherKey.TEMP_OUTSIDE, time_start)
+        self.assertEqual(len(downsampled), 1)
+        self.assertEqual((downsampled[0].min, downsampled[0].max, downsampled[0].mean, downsampled[0].count), (10.0, 14.0, 12.0, 5))
+        self.assertEqual(self.sink.query_downsampled(FetcherKey.BATTERY_OUTSIDE, time_start), [])
+
+        # a late value of the downsampled bucket
+        self.sink.write(time_start + datetime.timedelta(minutes=5), {FetcherKey.TEMP_OUTSIDE: 18.0})
+        self.sink.maintain((time_start + datetime.timedelta(days=2)).timestamp())
+        downsampled = self.sink.query_downsampled(FetcherKey.TEMP_OUTSIDE, time_start)
+        self.assertEqual((downsampled[0].min, downsampled[0].max, downsampled[0].mean, downsampled[0].count), (10.0, 18.0, 13.0, 6))
+
+        # retention
+        self.sink.maintain((time_start + datetime.timedelta(days=31)).timestamp())
+        self.assertEqual(self.sink.query_downsampled(FetcherKey.TEMP_OUTSIDE, time_start), [])
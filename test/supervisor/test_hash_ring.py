@@ -0,0 +1,32 @@
+import unittest
+
+from src.supervisor.hash_ring import HashRing
+from src.supervisor.shard import Shard
+
+
+class TestHashRing(unittest.TestCase):
+
+    STATIONS = [f"/etc/weather/station-{i}.yaml" for i in range(200)]
+
+    def test_distribution(self):
+        partitions = HashRing(4).partition(self.STATIONS)
+
+        self.assertEqual(set(partitions), {0, 1, 2, 3})
+        self.assertEqual(sum(len(stations) for stations in partitions.values()), len(self.STATIONS))
+        for stations in partitions.values():
+            self.assertGreater(len(stations), 20)
+
+    def test_consistency(self):
+        ring4 = HashRing(4)
+        ring5 = HashRing(5)
+
+        self.assertEqual([ring4.get_shard(s) for s in self.STATIONS], [HashRing(4).get_shard(s) for s in self.STATIONS])
+
+        moved = [s for s in self.STATIONS if ring4.get_shard(s) != ring5.get_shard(s)]
+        self.assertLess(len(moved), len(self.STATIONS) / 2)  # ~1/5 expected
+        for station in moved:
+            self.assertEqual(ring5.get_shard(station), 4)  # only to the new shard
+
+    def test_client_id(self):
+        self.assertEqual(Shard.derive_client_id("bridge", 2, Shard.get_station_name("/etc/garden.yaml")), "bridge-shard2-garden")
+        self.assertIsNone(Shard.derive_client_id(None, 2, "garden"))
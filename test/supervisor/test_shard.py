@@ -0,0 +1,73 @@
+import queue
+import signal
+import threading
+import unittest
+from unittest import mock
+
+from src.mqtt_config import MqttConfKey
+from src.supervisor.shard import Shard
+
+
+class _StubAppConfig:
+
+    def __init__(self, config_file, _schema_cache_dir=None):
+        self.config_file = config_file
+
+    def get_mqtt_config(self):
+        return {MqttConfKey.CLIENT_ID: "bridge"}
+
+
+class _StubService:
+    """Runs until stopped; the station "failing" raises after a short time."""
+
+    instances = []
+
+    def __init__(self, app_config, config_file, schema_cache_dir=None, mqtt_client_id=None):
+        self.config_file = config_file
+        self.mqtt_client_id = mqtt_client_id
+        self.stopped = threading.Event()
+        self.instances.append(self)
+
+    def run(self):
+        if "failing" in self.config_file:
+            if not self.stopped.wait(0.2):
+                raise RuntimeError("station failed")
+        self.stopped.wait(10)
+
+    def stop(self):
+        self.stopped.set()
+
+
+@mock.patch("src.supervisor.shard.Shard.HEARTBEAT_INTERVAL", 0.05)
+@mock.patch("src.supervisor.shard.Service", _StubService)
+@mock.patch("src.supervisor.shard.AppConfig", _StubAppConfig)
+class TestShard(unittest.TestCase):
+
+    def setUp(self):
+        _StubService.instances = []
+        for sig in (signal.SIGINT, signal.SIGTERM):  # `Shard.run` installs its handlers
+            self.addCleanup(signal.signal, sig, signal.getsignal(sig))
+
+    def test_station_failure(self):
+        heartbeats = queue.Queue()
+        shard = Shard(2, ["/etc/weather/garden.yaml", "/etc/weather/failing.yaml"], None, heartbeats)
+
+        self.assertEqual(shard.run(), 1)  # => restart by the supervisor
+
+        self.assertEqual(sorted(s.mqtt_client_id for s in _StubService.instances), ["bridge-shard2-failing", "bridge-shard2-garden"])
+        self.assertTrue(all(s.stopped.is_set() for s in _StubService.instances))  # the other station is stopped too
+
+        last_heartbeat = None
+        while not heartbeats.empty():
+            last_heartbeat = heartbeats.get_nowait()
+        shard_index, _pid, stations_alive = last_heartbeat
+        self.assertEqual((shard_index, stations_alive), (2, {"garden": True, "failing": False}))
+
+    def test_shutdown(self):
+        heartbeats = queue.Queue()
+        shard = Shard(0, ["/etc/weather/garden.yaml"], None, heartbeats)
+        threading.Timer(0.2, shard._shutdown_signaled, args=(signal.SIGTERM, None)).start()
+
+        self.assertEqual(shard.run(), 0)
+        self.assertTrue(_StubService.instances[0].stopped.is_set())
+        self.assertEqual(heartbeats.get_nowait()[2], {"garden": True})
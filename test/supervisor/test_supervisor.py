@@ -0,0 +1,142 @@
+import itertools
+import json
+import queue
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from src.supervisor.shard import Shard
+from src.supervisor.supervisor import Supervisor
+from src.supervisor.supervisor_config import SupervisorConfKey
+
+
+class _StubProcess:
+
+    pids = itertools.count(1000)
+
+    def __init__(self, target, args, name):
+        self.args = args
+        self.pid = next(self.pids)
+        self.exitcode = None
+        self.alive = False
+
+    def start(self):
+        self.alive = True
+
+    def is_alive(self):
+        return self.alive
+
+    def crash(self):
+        self.alive = False
+        self.exitcode = 1
+
+    def terminate(self):
+        self.alive = False
+        self.exitcode = -15
+
+    def join(self, _timeout=None):
+        pass
+
+    def kill(self):
+        self.alive = False
+
+
+class _StubSupervisorConfig:
+
+    def __init__(self, restart_delay):
+        self._config = {
+            SupervisorConfKey.WORKERS: 2,
+            SupervisorConfKey.STATIONS: [f"/etc/weather/station-{i}.yaml" for i in range(6)],
+            SupervisorConfKey.RESTART_DELAY: restart_delay,
+            SupervisorConfKey.MQTT_STATUS_TOPIC: "supervisor/status",
+        }
+
+    def get_supervisor_config(self):
+        return self._config
+
+    def get_mqtt_config(self):
+        return None
+
+
+class TestSupervisor(unittest.TestCase):
+
+    def create_supervisor(self, restart_delay=0):
+        supervisor = Supervisor(_StubSupervisorConfig(restart_delay), None, None)
+        supervisor._context = MagicMock(Process=_StubProcess)  # no worker processes
+        supervisor._heartbeat_queue = queue.Queue()
+        return supervisor
+
+    def send_heartbeats(self, supervisor, alive=True):
+        for shard in supervisor._shards:
+            stations_alive = {Shard.get_station_name(f): alive for f in shard.station_files}
+            supervisor._heartbeat_queue.put((shard.shard_index, shard.process.pid, stations_alive))
+        supervisor._read_heartbeats()
+
+    def test_restart(self):
+        supervisor = self.create_supervisor()
+        supervisor._check_shards()
+        self.assertTrue(all(shard.process.is_alive() for shard in supervisor._shards))
+        self.assertEqual(sorted(f for shard in supervisor._shards for f in shard.process.args[1]),
+                         sorted(supervisor._config[SupervisorConfKey.STATIONS]))
+
+        crashed = supervisor._shards[0]
+        old_pid = crashed.process.pid
+        crashed.process.crash()
+        supervisor._check_shards()
+        self.assertEqual(crashed.restarts, 1)
+        self.assertNotEqual(crashed.process.pid, old_pid)
+        self.assertEqual(supervisor._shards[1].restarts, 0)  # the other shard keeps running
+
+    def test_restart_delay(self):
+        supervisor = self.create_supervisor(restart_delay=60)
+        supervisor._check_shards()
+        crashed = supervisor._shards[1]
+        crashed.process.crash()
+
+        supervisor._check_shards()
+        self.assertIsNone(crashed.process)  # not yet
+        crashed.next_start = time.monotonic()
+        supervisor._check_shards()
+        self.assertTrue(crashed.process.is_alive())
+
+    def test_status(self):
+        supervisor = self.create_supervisor()
+        supervisor._check_shards()
+        self.assertEqual(supervisor.get_status()["status"], "degraded")  # no heartbeats yet
+
+        self.send_heartbeats(supervisor)
+        status = supervisor.get_status()
+        self.assertEqual(status["status"], "ok")
+        self.assertEqual([worker["status"] for worker in status["workers"]], ["ok", "ok"])
+        self.assertEqual(sum(len(worker["stations"]) for worker in status["workers"]), 6)
+
+        stale = supervisor._shards[0]
+        supervisor._heartbeat_queue.put((stale.shard_index, stale.process.pid + 1, {}))  # other (former) process
+        supervisor._read_heartbeats()
+        stale.last_heartbeat = (time.monotonic() - Shard.HEARTBEAT_INTERVAL * 3 - 1, stale.last_heartbeat[1])  # timeout
+        status = supervisor.get_status()
+        self.assertEqual(status["status"], "degraded")
+        self.assertEqual([worker["status"] for worker in status["workers"]], ["error", "ok"])
+        self.assertTrue(all(status["workers"][0]["stations"].values()))
+
+        self.send_heartbeats(supervisor, alive=False)  # a station failed
+        self.assertEqual([worker["status"] for worker in supervisor.get_status()["workers"]], ["error", "error"])
+
+    def test_publish_status(self):
+        supervisor = self.create_supervisor()
+        supervisor._check_shards()
+        self.send_heartbeats(supervisor)
+        mqtt_client = supervisor._mqtt_client = MagicMock()
+        mqtt_client.is_connected.return_value = True
+
+        supervisor._publish_status()
+        topic, payload = mqtt_client.publish.call_args[0]
+        self.assertEqual(topic, "supervisor/status")
+        status = json.loads(payload)
+        self.assertEqual(status["status"], "ok")
+        self.assertEqual([worker["shard"] for worker in status["workers"]], [0, 1])
+
+        processes = [shard.process for shard in supervisor._shards]
+        supervisor.close()
+        mqtt_client.publish.assert_called_with("supervisor/status", Supervisor.LAST_WILL)
+        self.assertFalse(any(process.is_alive() for process in processes))
@@ -1,6 +1,8 @@
 import os
 import unittest
 
+from jsonschema import ValidationError
+
 from src.app_config import AppConfig
 from test.setup_test import SetupTest
 
@@ -26,3 +28,28 @@ class TestAppConfig(unittest.TestCase):
 
         os.chmod(config_file, 0o600)
         AppConfig.check_config_file_access(config_file)  # no exception
+
+    def test_validation(self):
+        schema_cache_dir = SetupTest.ensure_clean_dir(SetupTest.get_test_path("schema_cache"))
+        config_file = SetupTest.get_test_path("app_config_validation.yaml")
+
+        with open(config_file, 'w') as f:
+            f.write("fetcher:\n  url: http://localhost/livedata.htm\nmqtt:\n  host: localhost\nrunner:\n  refresh_time: 30\n")
+        os.chmod(config_file, 0o600)
+
+        AppConfig._validator = None
+        app_config = AppConfig(config_file, schema_cache_dir)
+        self.assertEqual(app_config.get_runner_config(), {"refresh_time": 30})
+        self.assertGreaterEqual(app_config.validation_time, 0)
+
+        marker_file = os.path.join(schema_cache_dir, f"config-schema-{AppConfig.get_schema_hash()}.checked")
+        self.assertTrue(os.path.isfile(marker_file))
+
+        validator = AppConfig.get_validator()
+        AppConfig(config_file, schema_cache_dir)
+        self.assertIs(AppConfig.get_validator(), validator)  # built once
+
+        with open(config_file, 'w') as f:
+            f.write("fetcher:\n  url: http://localhost/livedata.htm\nmqtt:\n  host: localhost\nrunner:\n  refresh_time: 1\n")
+        with self.assertRaises(ValidationError):
+            AppConfig(config_file, schema_cache_dir)
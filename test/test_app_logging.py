@@ -0,0 +1,72 @@
+import logging
+import os
+import queue
+import unittest
+
+from src.app_logging import AppLogging, DroppingQueueHandler
+from test.setup_test import SetupTest
+
+
+class TestAppLogging(unittest.TestCase):
+
+    def setUp(self):
+        root = logging.getLogger()
+        self._root_handlers = list(root.handlers)
+        self._root_level = root.level
+
+    def tearDown(self):
+        AppLogging.shutdown()
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+            handler.close()
+        for handler in self._root_handlers:
+            root.addHandler(handler)
+        root.setLevel(self._root_level)
+
+    def test_queued_file_logging(self):
+        log_file = SetupTest.get_test_path("app_logging/test.log")
+        if os.path.exists(log_file):
+            os.remove(log_file)
+
+        AppLogging.configure({"queue_size": 100}, log_file, "info", False, False)
+        logger = logging.getLogger("test_app_logging")
+        logger.info("info %d", 1)
+        logger.debug("debug %d", 2)
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("failed")
+
+        self.assertEqual(AppLogging.get_statistics()["dropped"], 0)
+        AppLogging.shutdown()  # flushes
+
+        with open(log_file) as file:
+            lines = file.read().splitlines()
+        self.assertTrue(lines[0].endswith("[    INFO] test_app_logging: info 1"))
+        self.assertTrue(lines[1].endswith("[   ERROR] test_app_logging: failed"))
+        self.assertEqual(lines[2], "Traceback (most recent call last):")
+        self.assertEqual(lines[-1], "ValueError: boom")
+        self.assertEqual(sum(1 for line in lines if "test_app_logging:" in line), 2)  # formatted once
+
+    def test_synchronous_logging(self):
+        AppLogging.configure({"queue_size": 0}, None, "info", True, False)
+        self.assertEqual(AppLogging.get_statistics(), {})
+        self.assertIsInstance(logging.getLogger().handlers[0], logging.StreamHandler)
+
+    def test_drop_when_full(self):
+        handler = DroppingQueueHandler(queue.Queue(maxsize=2))
+        logger = logging.getLogger("test_app_logging.drop")
+        logger.propagate = False
+        logger.addHandler(handler)
+        try:
+            for i in range(5):
+                logger.warning("message %d", i)
+        finally:
+            logger.removeHandler(handler)
+            logger.propagate = True
+
+        self.assertEqual(handler.queue.qsize(), 2)
+        self.assertEqual(handler.dropped, 3)
+        self.assertEqual(handler.take_unreported(), 3)
+        self.assertEqual(handler.take_unreported(), 0)
@@ -0,0 +1,88 @@
+import os
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from src.app_config import AppConfig
+from src.config_reloader import ConfigReloader
+from src.runner import Runner
+from src.runner_config import RunnerConfKey
+from test.setup_test import SetupTest
+
+
+class TestConfigReloader(unittest.TestCase):
+
+    CONFIG_TEMPLATE = "fetcher:\n  url: http://localhost/livedata.htm\n  altitude: {altitude}\n" \
+                      "mqtt:\n  host: localhost\nrunner:\n  refresh_time: {refresh_time}\n"
+    SINKS_TEMPLATE = "sinks:\n  queue_size: {queue_size}\n"
+
+    def setUp(self):
+        SetupTest.ensure_test_dir()
+        self.config_file = SetupTest.get_test_path("config_reloader.yaml")
+        self._write_config(altitude=100, refresh_time=60)
+
+    def _write_config(self, **kwargs):
+        with open(self.config_file, 'w') as f:
+            f.write(self.CONFIG_TEMPLATE.format(**kwargs))
+        os.chmod(self.config_file, 0o600)
+
+    def test_reload(self):
+        reloader = ConfigReloader(self.config_file, AppConfig(self.config_file))
+        self.assertIsNone(reloader.poll())
+
+        reloader.request_reload()
+        config_change = reloader.poll()
+        self.assertEqual(config_change.changed_sections, set())
+
+        self._write_config(altitude=100, refresh_time=30)
+        reloader.request_reload()
+        config_change = reloader.poll()
+        self.assertEqual(config_change.changed_sections, {"runner"})
+        self.assertEqual(reloader.app_config.get_runner_config(), {RunnerConfKey.REFRESH_TIME: 30})
+
+        self._write_config(altitude=100, refresh_time=1)  # invalid
+        reloader.request_reload()
+        self.assertIsNone(reloader.poll())
+        self.assertEqual(reloader.app_config.get_runner_config(), {RunnerConfKey.REFRESH_TIME: 30})
+
+    def test_runner_applies_changes(self):
+        app_config = AppConfig(self.config_file)
+        reloader = ConfigReloader(self.config_file, app_config)
+        fetcher_factory = MagicMock()
+
+        runner = Runner(app_config.get_runner_config(), fetcher_factory, MagicMock(), config_reloader=reloader)
+        self.assertEqual(runner._refresh_time, 60)
+
+        self._write_config(altitude=200, refresh_time=30)
+        reloader.request_reload()
+        runner._reload_config()
+
+        self.assertEqual(runner._refresh_time, 30)
+        fetcher_factory.update_config.assert_called_once_with({"url": "http://localhost/livedata.htm", "altitude": 200})
+
+    def test_sink_dispatcher_closed_outside_loop(self):
+        app_config = AppConfig(self.config_file)
+        reloader = ConfigReloader(self.config_file, app_config)
+        old_dispatcher = MagicMock()
+        close_started = threading.Event()
+        close_released = threading.Event()
+
+        def close():
+            close_started.set()
+            close_released.wait(5)  # a slow sink draining its queue
+
+        old_dispatcher.close.side_effect = close
+
+        runner = Runner(app_config.get_runner_config(), MagicMock(), MagicMock(), sink_dispatcher=old_dispatcher,
+                        config_reloader=reloader)
+        try:
+            with open(self.config_file, 'a') as f:
+                f.write(self.SINKS_TEMPLATE.format(queue_size=10))
+            reloader.request_reload()
+            runner._reload_config()  # returns while the old dispatcher is still closing
+
+            self.assertIsNot(runner._sink_dispatcher, old_dispatcher)
+            self.assertTrue(close_started.wait(5))
+        finally:
+            close_released.set()
+            runner.close()
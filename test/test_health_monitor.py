@@ -0,0 +1,44 @@
+import datetime
+import unittest
+
+from src.fetcher.fetcher_status import FetcherStatus
+from src.health_monitor import HealthMonitor
+
+
+class TestHealthMonitor(unittest.TestCase):
+
+    START = datetime.datetime(2022, 1, 8, 10, 0, 0, tzinfo=datetime.timezone.utc)
+
+    def test_empty(self):
+        statistics = HealthMonitor().get_statistics()
+        self.assertEqual(statistics["count"], 0)
+        self.assertIsNone(statistics["errorRate"])
+        self.assertIsNone(statistics["lastSuccess"])
+        self.assertEqual(statistics["latency"], {"p50": None, "p95": None, "max": None})
+
+    def test_rolling_window(self):
+        monitor = HealthMonitor(window=20)
+
+        for i in range(1, 21):  # latencies 1..20
+            status = FetcherStatus.TIMEOUT if i == 20 else FetcherStatus.ERROR if i % 5 == 0 else FetcherStatus.OK
+            monitor.add_fetch(self.START + datetime.timedelta(minutes=i), float(i), status)
+
+        statistics = monitor.get_statistics()
+        self.assertEqual(statistics["count"], 20)
+        self.assertEqual(statistics["latency"], {"p50": 10.0, "p95": 19.0, "max": 20.0})
+        self.assertEqual(statistics["errorRate"], 0.15)  # 5, 10, 15
+        self.assertEqual(statistics["timeoutRate"], 0.05)
+        self.assertEqual(statistics["lastSuccess"], self.START + datetime.timedelta(minutes=19))
+
+        for i in range(10):  # the slow and failed fetches leave the window
+            monitor.add_fetch(self.START + datetime.timedelta(minutes=30 + i), 0.5, FetcherStatus.OK)
+
+        statistics = monitor.get_statistics()
+        self.assertEqual(statistics["count"], 30)
+        self.assertEqual(statistics["window"], 20)
+        self.assertEqual(statistics["latency"], {"p50": 0.5, "p95": 19.0, "max": 20.0})
+        self.assertEqual(statistics["errorRate"], 0.05)  # 15
+        self.assertEqual(statistics["timeoutRate"], 0.05)
+
+    def test_rss(self):
+        self.assertGreater(HealthMonitor.get_rss(), 1024 * 1024)
@@ -0,0 +1,88 @@
+import asyncio
+import datetime
+import json
+import unittest
+
+from src.fetcher.fetcher_key import FetcherKey
+from src.http_api import HttpApi
+from src.utils.time_utils import TimeUtils
+
+
+class TestHttpApi(unittest.TestCase):
+
+    NOW = datetime.datetime(2022, 1, 8, 10, 0, 0, tzinfo=datetime.timezone.utc)
+    VALUES = {FetcherKey.STATUS: "ok", FetcherKey.TIMESTAMP: NOW, FetcherKey.TEMP_OUTSIDE: 4.5}
+
+    def test_respond(self):
+        api = HttpApi(0)
+        self.assertEqual(api.respond("GET", "/values", {})[0], 404)  # nothing fetched yet
+
+        api.update(self.VALUES, self.NOW + datetime.timedelta(seconds=45))
+
+        with TimeUtils.frozen(self.NOW + datetime.timedelta(seconds=15, milliseconds=500)):
+            status, headers, body = api.respond("GET", "/values/", {})
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["Cache-Control"], "max-age=30")
+        self.assertEqual(json.loads(body)[FetcherKey.TIMESTAMP], self.NOW.isoformat())
+
+        with TimeUtils.frozen(self.NOW + datetime.timedelta(seconds=60)):
+            self.assertEqual(api.respond("GET", "/values", {"if-none-match": headers["ETag"]})[:2],
+                             (304, {**headers, "Cache-Control": "max-age=0"}))
+
+        status, key_headers, body = api.respond("GET", "/values/" + FetcherKey.TEMP_OUTSIDE, {})
+        self.assertEqual((status, body), (200, b"4.5"))
+        self.assertNotEqual(key_headers["ETag"], headers["ETag"])
+
+        self.assertEqual(api.respond("GET", "/values/unknown", {})[0], 404)
+        self.assertEqual(api.respond("GET", "/other", {})[0], 404)
+        self.assertEqual(api.respond("POST", "/values", {})[0], 405)
+
+        api.update({**self.VALUES, FetcherKey.TEMP_OUTSIDE: 4.6}, self.NOW)
+        self.assertEqual(api.respond("GET", "/values", {"if-none-match": headers["ETag"]})[0], 200)  # changed
+
+    def test_failed_fetch(self):
+        api = HttpApi(0)
+        api.update({FetcherKey.STATUS: "error"}, self.NOW)
+        self.assertEqual(api.respond("GET", "/values", {})[0], 404)  # nothing good fetched yet
+
+        api.update(self.VALUES, self.NOW)
+        status, headers, body = api.respond("GET", "/values", {})
+        self.assertEqual((status, headers[HttpApi.STATUS_HEADER]), (200, "ok"))
+
+        api.update({FetcherKey.STATUS: "error", FetcherKey.CIRCUIT: "open"}, self.NOW)
+        error_status, error_headers, error_body = api.respond("GET", "/values", {})
+        self.assertEqual((error_status, error_body, error_headers["ETag"]), (200, body, headers["ETag"]))  # last good values
+        self.assertEqual(error_headers[HttpApi.STATUS_HEADER], "error")
+
+    def test_server(self):
+        api = HttpApi(0)
+        api.update(self.VALUES, self.NOW)
+
+        async def request(raw: bytes) -> bytes:
+            reader, writer = await asyncio.open_connection("127.0.0.1", api.port)
+            writer.write(raw)
+            response = await reader.read()
+            writer.close()
+            return response
+
+        async def run():
+            await api.start()
+            try:
+                return (await request(b"GET /values/tempOutside HTTP/1.1\r\nHost: localhost\r\n\r\n"),
+                        await request(b"HEAD /values HTTP/1.1\r\n\r\n"),
+                        await request(b"garbage\r\n\r\n"))
+            finally:
+                api.close()
+
+        loop = asyncio.new_event_loop()
+        try:
+            response, head_response, bad_response = loop.run_until_complete(run())
+        finally:
+            loop.close()
+
+        self.assertTrue(response.startswith(b"HTTP/1.1 200 OK\r\n"))
+        self.assertIn(b"\r\nContent-Type: application/json\r\n", response)
+        self.assertTrue(response.endswith(b"\r\n\r\n4.5"))
+        self.assertTrue(head_response.startswith(b"HTTP/1.1 200 OK\r\n"))
+        self.assertTrue(head_response.endswith(b"\r\n\r\n"))
+        self.assertTrue(bad_response.startswith(b"HTTP/1.1 400 Bad Request\r\n"))
@@ -0,0 +1,65 @@
+import unittest
+from unittest import mock
+
+from paho.mqtt.packettypes import PacketTypes
+from paho.mqtt.properties import Properties
+
+from src.mqtt_client import MqttClient
+from src.mqtt_config import MqttConfKey
+
+
+class TestMqttClient(unittest.TestCase):
+
+    CONFIG_V5 = {
+        MqttConfKey.HOST: "localhost",
+        MqttConfKey.PROTOCOL: 5,
+        MqttConfKey.QOS: 0,
+        MqttConfKey.MESSAGE_EXPIRY: 300,
+        MqttConfKey.TOPIC_ALIASES: True,
+    }
+
+    @classmethod
+    def connect(cls, client: MqttClient, topic_alias_maximum: int):
+        properties = Properties(PacketTypes.CONNACK)
+        properties.TopicAliasMaximum = topic_alias_maximum
+        client._on_connect(None, None, {}, 0, properties)
+
+    def test_topic_aliases(self):
+        client = MqttClient(self.CONFIG_V5)
+        self.connect(client, 2)
+
+        topic, properties = client._prepare_publish("weather/outside", None)
+        self.assertEqual(topic, "weather/outside")
+        self.assertEqual(properties.TopicAlias, 1)
+        self.assertEqual(properties.MessageExpiryInterval, 300)
+
+        topic, properties = client._prepare_publish("weather/outside", {"timestamp": "2022-01-08T10:00:00"})
+        self.assertEqual(topic, "")
+        self.assertEqual(properties.TopicAlias, 1)
+        self.assertEqual(properties.UserProperty, [("timestamp", "2022-01-08T10:00:00")])
+
+        self.assertEqual(client._prepare_publish("weather/inside", None)[1].TopicAlias, 2)
+        topic, properties = client._prepare_publish("weather/health", None)  # maximum reached
+        self.assertEqual(topic, "weather/health")
+        self.assertFalse(hasattr(properties, "TopicAlias"))
+
+        self.connect(client, 2)  # new connection => new aliases
+        self.assertEqual(client._prepare_publish("weather/health", None), ("weather/health", mock.ANY))
+        self.assertEqual(client._prepare_publish("weather/health", None)[0], "")
+
+    def test_no_aliases(self):
+        client = MqttClient({**self.CONFIG_V5, MqttConfKey.QOS: 1})  # QoS 1/2: no aliases
+        self.connect(client, 10)
+        topic, properties = client._prepare_publish("weather/outside", None)
+        self.assertEqual(topic, "weather/outside")
+        self.assertFalse(hasattr(properties, "TopicAlias"))
+
+        client = MqttClient({**self.CONFIG_V5, MqttConfKey.MESSAGE_EXPIRY: None})
+        self.connect(client, 0)  # not supported by the broker
+        self.assertEqual(client._prepare_publish("weather/outside", None), ("weather/outside", None))
+
+    def test_protocol_v311(self):
+        client = MqttClient({**self.CONFIG_V5, MqttConfKey.PROTOCOL: 4})
+        self.assertFalse(client.supports_properties)
+        client._on_connect(None, None, {}, 0)
+        self.assertTrue(client.is_connected())
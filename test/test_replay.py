@@ -0,0 +1,101 @@
+import gzip
+import io
+import json
+import os
+import tarfile
+import unittest
+
+from src.fetcher.fetcher_factory import FetcherFactory
+from src.fetcher.fetcher_key import FetcherKey
+from src.fetcher.fetcher_status import FetcherStatus
+from src.replay import ReplayPipeline, ReplaySource
+from test.setup_test import SetupTest
+
+try:
+    import zstandard  # optional dependency
+except ImportError:
+    zstandard = None
+
+
+class TestReplay(unittest.TestCase):
+
+    PAGE_FILE = "froggit_livedata_firmware_4.6.2.html"
+
+    def setUp(self):
+        self.replay_dir = SetupTest.ensure_clean_dir(SetupTest.get_test_path("replay"))
+        self.capture_time = SetupTest.get_froggit_test_time()
+        self.page = SetupTest.load_froggit_mocked_html(self.PAGE_FILE)
+
+    def _write_page(self, dir_path, file_name):
+        file_path = os.path.join(dir_path, file_name)
+        with open(file_path, "w") as file:
+            file.write(self.page)
+        os.utime(file_path, (self.capture_time.timestamp(), self.capture_time.timestamp()))
+        return file_path
+
+    def _replay(self, path):
+        pipeline = ReplayPipeline(FetcherFactory({"url": "dummy", "altitude": 255}))
+        return list(pipeline.process(ReplaySource.iter_captures(path)))
+
+    def _check_result(self, result):
+        self.assertEqual(result.fetched, self.capture_time)
+        self.assertEqual(result.values[FetcherKey.STATUS], FetcherStatus.OK)
+        self.assertEqual(result.values[FetcherKey.TEMP_OUTSIDE], 31.3)
+        self.assertEqual(result.values[FetcherKey.PRESSURE_REL], 1019.7)
+
+    def test_directory(self):
+        pages_dir = SetupTest.ensure_dir(os.path.join(self.replay_dir, "pages"))
+        self._write_page(pages_dir, "livedata_1.htm")
+        self._write_page(pages_dir, "livedata_2.htm")
+
+        results = self._replay(pages_dir)
+        self.assertEqual(len(results), 2)
+        for result in results:
+            self._check_result(result)
+
+    def test_tar(self):
+        page_path = self._write_page(self.replay_dir, "livedata.htm")
+        tar_path = os.path.join(self.replay_dir, "captures.tar.gz")
+        with tarfile.open(tar_path, "w:gz") as tar:
+            tar.add(page_path, arcname="livedata.htm")
+
+        results = self._replay(tar_path)
+        self.assertEqual(len(results), 1)
+        self._check_result(results[0])
+
+    def test_tar_compressed_jsonl(self):
+        record = json.dumps({"fetched": self.capture_time.isoformat(), "page": self.page}) + "\n"
+        members = {"captures.jsonl.gz": gzip.compress(record.encode("utf-8"))}
+        if zstandard is not None:
+            members["captures.jsonl.zst"] = zstandard.ZstdCompressor().compress(record.encode("utf-8"))
+
+        tar_path = os.path.join(self.replay_dir, "captures.tar")
+        with tarfile.open(tar_path, "w") as tar:
+            for name, data in members.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+
+        results = self._replay(tar_path)
+        self.assertEqual(len(results), len(members))
+        for result in results:
+            self._check_result(result)
+
+    def test_jsonl(self):
+        jsonl_path = os.path.join(self.replay_dir, "captures.jsonl")
+        with open(jsonl_path, "w") as file:
+            file.write(json.dumps({"fetched": self.capture_time.isoformat(), "page": self.page}) + "\n")
+            file.write("no json\n")
+            raw_values = {FetcherKey.TIMESTAMP: "14:04 8/25/2019", FetcherKey.TEMP_OUTSIDE: "20.5"}
+            file.write(json.dumps({"fetched": self.capture_time.isoformat(), "values": raw_values}) + "\n")
+
+        results = self._replay(jsonl_path)
+        self.assertEqual(len(results), 2)
+        self._check_result(results[0])
+        self.assertEqual(results[1].values[FetcherKey.TEMP_OUTSIDE], 20.5)
+
+        stream = io.StringIO()
+        count = ReplayPipeline.write_results(results, stream)
+        self.assertEqual(count, 2)
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(json.loads(lines[1])["values"][FetcherKey.TEMP_OUTSIDE], 20.5)
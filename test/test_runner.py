@@ -1,16 +1,23 @@
 import asyncio
 import datetime
 import json
+import os
+import tempfile
+import threading
 import unittest
 from typing import Optional
 from unittest import mock
-from unittest.mock import MagicMock, call
+from unittest.mock import AsyncMock, MagicMock, call
 
 from src.fetcher.fetcher_factory import FetcherFactory
 from src.fetcher.fetcher_key import FetcherKey
 from src.fetcher.fetcher_status import FetcherStatus
+from src.fetcher.froggit_wh2600_job import FroggitWh2600Job
+from src.fetcher.time_series_manager import TimeSeriesManager
 from src.runner import Runner
 from src.runner_config import RunnerConfKey
+from src.utils.time_utils import TimeUtils
+from test.setup_test import SetupTest
 
 
 class MockedFetcherFactory(FetcherFactory):
@@ -95,7 +102,7 @@ class TestIntegration(unittest.TestCase):
         }
 
         self.mqtt_client.is_connected.return_value = True
-        self.fetcher_job.fetch_safe.return_value = fetcher_values
+        self.fetcher_job.fetch_safe_async = AsyncMock(return_value=fetcher_values)
 
         runner_now.return_value = time_fetch
 
@@ -141,7 +148,7 @@ class TestIntegration(unittest.TestCase):
         }
 
         self.mqtt_client.is_connected.return_value = True
-        self.fetcher_job.fetch_safe = MagicMock(side_effect=asyncio.exceptions.TimeoutError('timeout'))
+        self.fetcher_job.fetch_safe_async = AsyncMock(side_effect=asyncio.exceptions.TimeoutError('timeout'))
 
         runner = MockedRunner(self.runner_config, self.fetcher_factory, self.mqtt_client)
         runner._handle_fetch_result()  # nothing to do
@@ -164,3 +171,157 @@ class TestIntegration(unittest.TestCase):
         # .. abort
         runner._start_fetcher_task()
         runner.fetch_data(300)
+
+    def test_control_topic(self):
+        self.runner_config[RunnerConfKey.MQTT_CONTROL_TOPIC] = "control"
+
+        runner = MockedRunner(self.runner_config, self.fetcher_factory, self.mqtt_client)
+        self.mqtt_client.subscribe.assert_called_once_with("control", runner._on_control_message)
+
+        runner._profiler = MagicMock()
+        runner._on_control_message("control", " Profile 15 ")
+        runner._profiler.request.assert_called_once_with(15.0)
+
+        runner._profiler.request.reset_mock()
+        runner._on_control_message("control", "profile x")
+        runner._on_control_message("control", "unknown")
+        runner._profiler.request.assert_not_called()
+
+        runner._subscribe_control_topic("control2")
+        self.mqtt_client.unsubscribe.assert_called_once_with("control")
+        self.mqtt_client.subscribe.assert_called_with("control2", runner._on_control_message)
+
+    @mock.patch('src.utils.time_utils.TimeUtils.now')
+    def test_health(self, mocked_now):
+        time_start = datetime.datetime(2022, 1, 8, 10, 0, 0)
+        mocked_now.return_value = time_start
+
+        self.runner_config[RunnerConfKey.MQTT_HEALTH_TOPIC] = "health"
+        self.runner_config[RunnerConfKey.HEALTH_INTERVAL] = 60
+        self.mqtt_client.get_queue_depth.return_value = 3
+        self.fetcher_job.fetch_safe_async = AsyncMock(return_value={FetcherKey.STATUS: FetcherStatus.OK})
+
+        runner = MockedRunner(self.runner_config, self.fetcher_factory, self.mqtt_client)
+        runner.fetch_data(300)
+
+        runner._publish_health()  # not yet
+        self.mqtt_client.publish.assert_not_called()
+
+        mocked_now.return_value = time_start + datetime.timedelta(seconds=60)
+        runner._publish_health()
+        self.mqtt_client.publish.assert_called_once()
+        _, kwargs = self.mqtt_client.publish.call_args
+        self.assertEqual(kwargs["topic"], "health")
+        self.assertTrue(kwargs["retain"])
+
+        health = json.loads(kwargs["payload"])
+        self.assertEqual(health["mqttQueued"], 3)
+        self.assertEqual(health["fetches"]["count"], 1)
+        self.assertEqual(health["fetches"]["errorRate"], 0.0)
+        self.assertEqual(health["fetches"]["lastSuccess"], time_start.isoformat())
+        self.assertIsNotNone(health["fetches"]["latency"]["p95"])
+
+    def test_splitt_messages_without_timestamp(self):
+        fetcher_values = {FetcherKey.STATUS: FetcherStatus.OK, FetcherKey.TIMESTAMP: "2022-01-08T10:00:00", FetcherKey.TEMP_INSIDE: 21.5}
+
+        messages = Runner.splitt_messages(fetcher_values, inside_topic="inside", outside_topic=None, timestamp_in_payload=False)
+
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(messages[0].timestamp, "2022-01-08T10:00:00")
+        self.assertEqual(json.loads(messages[0].payload), {FetcherKey.SENSOR: "inside1", FetcherKey.STATUS: "ok", FetcherKey.TEMP: 21.5})
+
+    @mock.patch('src.utils.time_utils.TimeUtils.now')
+    def test_refresh_command(self, mocked_now):
+        time_start = datetime.datetime(2022, 1, 8, 10, 0, 0)
+        mocked_now.return_value = time_start
+
+        self.runner_config[RunnerConfKey.MQTT_CONTROL_TOPIC] = "control"
+        self.runner_config[RunnerConfKey.REFRESH_MIN_INTERVAL] = 10
+        self.fetcher_job.fetch_safe_async = AsyncMock(return_value={FetcherKey.STATUS: FetcherStatus.OK})
+
+        runner = MockedRunner(self.runner_config, self.fetcher_factory, self.mqtt_client)
+        runner._start_fetcher_task()
+        runner._on_control_message("control", "refresh")
+        runner._handle_refresh_request()  # coalesced with the running fetch
+        runner.fetch_data(300)
+        runner._fetcher_task = None
+        self.assertEqual(runner._next_fetch_trigger, time_start + datetime.timedelta(seconds=30))
+
+        mocked_now.return_value = time_start + datetime.timedelta(seconds=2)
+        runner._on_control_message("control", "refresh")
+        runner._on_control_message("control", "REFRESH")
+        runner._handle_refresh_request()  # rate limited
+        self.assertEqual(runner._next_fetch_trigger, time_start + datetime.timedelta(seconds=10))
+
+        mocked_now.return_value = time_start + datetime.timedelta(seconds=12)
+        runner._last_fetcher_started = None
+        runner._next_fetch_trigger = time_start + datetime.timedelta(seconds=30)
+        runner._on_control_message("control", "refresh")
+        runner._handle_refresh_request()
+        self.assertEqual(runner._next_fetch_trigger, time_start + datetime.timedelta(seconds=12))
+
+        runner._next_fetch_trigger = time_start + datetime.timedelta(seconds=30)
+        runner._handle_refresh_request()  # nothing requested
+        self.assertEqual(runner._next_fetch_trigger, time_start + datetime.timedelta(seconds=30))
+
+    def test_http_api_during_slow_fetch(self):
+        station_answered = threading.Event()
+
+        class SlowFetcherJob(FroggitWh2600Job):
+            def _load_page(self):
+                station_answered.wait(5)  # blocks the loop thread, if the fetch would run there
+                return SetupTest.load_froggit_mocked_html("froggit_livedata_firmware_4.6.2.html")
+
+        self.runner_config[RunnerConfKey.HTTP_PORT] = 0
+        fetcher_job = SlowFetcherJob({"url": "dummy"}, TimeSeriesManager())
+        runner = MockedRunner(self.runner_config, MockedFetcherFactory(fetcher_job), self.mqtt_client)
+        runner._http_api.update({FetcherKey.STATUS: FetcherStatus.OK, FetcherKey.TEMP_OUTSIDE: 4.5}, TimeUtils.now())
+
+        async def run():
+            await runner._http_api.start()
+            fetch_task = runner._loop.create_task(runner._fetch_data_timeout(10))
+            await asyncio.sleep(0.1)
+
+            reader, writer = await asyncio.open_connection("127.0.0.1", runner._http_api.port)
+            writer.write(b"GET /values/tempOutside HTTP/1.1\r\n\r\n")
+            response = await asyncio.wait_for(reader.read(), 2)
+            writer.close()
+            fetch_done = fetch_task.done()
+
+            station_answered.set()
+            await fetch_task
+            return response, fetch_done
+
+        try:
+            response, fetch_done = runner._loop.run_until_complete(run())
+        finally:
+            station_answered.set()
+            runner.close()
+
+        self.assertTrue(response.endswith(b"\r\n\r\n4.5"))
+        self.assertFalse(fetch_done)
+
+    def test_profiling_covers_fetch(self):
+
+        class MockedFetcherJob(FroggitWh2600Job):
+            def _load_page(self):
+                return SetupTest.load_froggit_mocked_html("froggit_livedata_firmware_4.6.2.html")
+
+        fetcher_job = MockedFetcherJob({"url": "dummy"}, TimeSeriesManager())
+        runner = MockedRunner(self.runner_config, MockedFetcherFactory(fetcher_job), self.mqtt_client)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            runner._profiler.set_options(temp_dir, 60)
+            runner._profiler.start(60)
+            try:
+                runner.fetch_data(10)
+            finally:
+                report_path = runner._profiler.stop()
+                runner.close()
+
+            self.assertEqual(os.path.dirname(report_path), temp_dir)
+            with open(report_path, encoding="utf-8") as file:
+                report = file.read()
+
+        self.assertIn("(fetch)", report)
+        self.assertIn("(extract_values)", report)
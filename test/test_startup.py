@@ -0,0 +1,9 @@
+import unittest
+
+from benchmark.startup_benchmark import get_loaded_deferred_modules
+
+
+class TestStartup(unittest.TestCase):
+
+    def test_deferred_imports(self):
+        self.assertEqual(get_loaded_deferred_modules(), [])
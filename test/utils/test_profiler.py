@@ -0,0 +1,36 @@
+import os
+import unittest
+
+from src.utils.profiler import Profiler
+from test.setup_test import SetupTest
+
+
+class TestProfiler(unittest.TestCase):
+
+    def test_profiling_session(self):
+        output_dir = SetupTest.ensure_clean_dir(SetupTest.get_test_path("profiler"))
+        profiler = Profiler(output_dir)
+
+        self.assertIsNone(profiler.poll())  # not requested
+        self.assertFalse(profiler.is_running())
+
+        profiler.request(0.01)
+        self.assertIsNone(profiler.poll())
+        self.assertTrue(profiler.is_running())
+
+        data = [str(i) * 10 for i in range(1000)]  # something to profile
+        self.assertEqual(len(data), 1000)
+
+        while profiler.is_running():
+            report_path = profiler.poll()
+
+        self.assertTrue(os.path.exists(report_path))
+        self.assertTrue(os.path.exists(report_path[:-len(".txt")] + ".pstats"))
+        with open(report_path, encoding="utf-8") as file:
+            report = file.read()
+        self.assertIn("CPU (cumulative)", report)
+        self.assertIn("Memory (allocation diff)", report)
+        self.assertIn("test_profiler.py", report)
+
+    def test_stop_without_session(self):
+        self.assertIsNone(Profiler().stop())